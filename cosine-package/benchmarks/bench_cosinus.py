@@ -0,0 +1,54 @@
+"""
+Scaling benchmark of `cosinus` for 1e3..1e9 elements and 1..N threads.
+
+Usage: python benchmarks/bench_cosinus.py [--max_exponent 9] [--dtype float64]
+
+Note that 1e9 float32 elements need 8 GB of memory (input and result).
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from my_utils.my_utils import BLOCK_SIZE, cosinus
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min_exponent", type=int, default=3)
+    parser.add_argument("--max_exponent", type=int, default=8)
+    parser.add_argument("--max_threads", type=int, default=os.cpu_count())
+    parser.add_argument("--dtype", choices=["float32", "float64"], default="float32")
+    parser.add_argument("--block_size", type=int, default=BLOCK_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    threads = sorted({1, *(2**i for i in range(8) if 2**i <= args.max_threads),
+                      args.max_threads})
+    print(f"{'elements':>12}" + "".join(f"{f'{t} thr [Melem/s]':>18}" for t in threads))
+    rng = np.random.default_rng(0)
+    for exponent in range(args.min_exponent, args.max_exponent + 1):
+        x = rng.random(10**exponent, dtype=args.dtype) * 100
+        out = np.empty_like(x)
+        row = f"{f'1e{exponent}':>12}"
+        for n_threads in threads:
+            seconds = best_time(
+                lambda: cosinus(x, out=out, dtype=args.dtype, threads=n_threads,
+                                block_size=args.block_size),
+                args.repeat,
+            )
+            row += f"{x.size / seconds / 1e6:>18.1f}"
+        print(row, flush=True)
+
+
+if __name__ == "__main__":
+    main()
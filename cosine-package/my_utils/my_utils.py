@@ -1,24 +1,189 @@
+import argparse
+import os
 import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
-def cosinus(args):
-    if not args:
+# number of bytes of text read from the input at once in streaming mode
+CHUNK_SIZE = 1 << 24
+# number of array elements processed at once in binary and threaded modes
+# (256 KiB of float32, so a block with its result stays in the L2 cache)
+BLOCK_SIZE = 1 << 16
+WHITESPACE = b" \t\n\r\x0b\x0c"
+RAW_DTYPES = {"f32": np.dtype("<f4"), "f64": np.dtype("<f8")}
+
+
+def cos_blocks(x, out, block_size=BLOCK_SIZE, threads=1):
+    # np.cos releases the GIL, so blocks evaluated in threads run in parallel
+    def evaluate(start):
+        np.cos(x[start:start + block_size], out=out[start:start + block_size])
+
+    starts = range(0, x.size, block_size)
+    if threads > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(evaluate, starts))
+    else:
+        for start in starts:
+            evaluate(start)
+    return out
+
+
+def cosinus(args, out=None, dtype=np.float32, threads=1, block_size=BLOCK_SIZE):
+    # `out` is an optional preallocated 1-D array of the input's size and
+    # `dtype` in which the result is stored, so buffers can be reused
+    # across calls; with threads > 1 blocks are evaluated in a thread pool
+    if len(args) == 0:
         raise ValueError("Invalid number of arguments")
     try:
-        x = np.array(args).astype(np.float32)
-        return np.cos(x).flatten()
+        x = np.asarray(args).astype(dtype, copy=False).reshape(-1)
     except ValueError as e:
         print("Invalid argument(s).")
         print(e)
         sys.exit(1)
+    if out is None:
+        out = np.empty_like(x)
+    elif not isinstance(out, np.ndarray) or out.shape != x.shape \
+            or out.dtype != x.dtype:
+        raise ValueError(
+            f"Invalid out argument. It has to be a {x.dtype} array of shape "
+            f"{x.shape}, instead got {type(out).__name__} of shape "
+            f"{getattr(out, 'shape', None)} and dtype {getattr(out, 'dtype', None)}."
+        )
+    if threads > 1:
+        return cos_blocks(x, out, block_size, threads)
+    return np.cos(x, out=out)
+
+
+def parse_numbers(text, dtype=np.float32):
+    # np.fromstring returns garbage for whitespace-only input
+    if not text or text.isspace():
+        return np.empty(0, dtype=dtype)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=dtype, sep=" ")
+        except (ValueError, DeprecationWarning) as e:
+            raise ValueError(f"Invalid argument(s).\n{e}") from None
+
+
+def format_numbers(values):
+    if not values.size:
+        return b""
+    fmt = "{:.8g}" if values.dtype == np.float32 else "{:.17g}"
+    return ("\n".join(map(fmt.format, values.tolist())) + "\n").encode()
+
+
+def cosinus_stream(in_file, out_file, chunk_size=CHUNK_SIZE, dtype=np.float32,
+                   threads=1):
+    # in_file and out_file are binary file objects; memory usage is bounded
+    # by chunk_size regardless of the input length
+    tail = b""
+    while chunk := in_file.read(chunk_size):
+        chunk = tail + chunk
+        cut = max(chunk.rfind(c) for c in WHITESPACE)
+        if cut < 0:
+            tail = chunk
+            continue
+        tail = chunk[cut + 1:]
+        x = parse_numbers(chunk[:cut + 1], dtype)
+        out_file.write(format_numbers(cos_blocks(x, x, threads=threads)))
+    x = parse_numbers(tail, dtype)
+    out_file.write(format_numbers(cos_blocks(x, x, threads=threads)))
+    out_file.flush()
+
+
+def open_binary_input(path, fmt):
+    if fmt == "npy":
+        return np.load(path, mmap_mode="r")
+    # empty files cannot be memory-mapped
+    if not os.path.getsize(path):
+        return np.empty(0, dtype=RAW_DTYPES[fmt])
+    return np.memmap(path, dtype=RAW_DTYPES[fmt], mode="r")
+
+
+def cosinus_file(input_path, output_path, fmt, block_size=BLOCK_SIZE, dtype=None,
+                 threads=1):
+    # binary files are memory-mapped and processed block by block
+    # straight into the memory-mapped output file
+    x = open_binary_input(input_path, fmt)
+    if dtype is None:
+        dtype = x.dtype if x.dtype.kind == "f" else np.dtype(np.float32)
+    if fmt == "npy":
+        fortran_order = x.flags.f_contiguous and not x.flags.c_contiguous
+        y = np.lib.format.open_memmap(
+            output_path, mode="w+", dtype=dtype, shape=x.shape,
+            fortran_order=fortran_order,
+        )
+    elif x.size:
+        y = np.memmap(output_path, dtype=dtype, mode="w+", shape=x.shape)
+    else:
+        open(output_path, "wb").close()
+        return
+    cos_blocks(x.ravel(order="K"), y.ravel(order="K"), block_size, threads)
+    y.flush()
+
+
+def stream_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="mycos",
+        description="Compute cosine of numbers read from a file or stdin. "
+                    "Text results are written one per line, binary results "
+                    "in the input format.",
+    )
+    parser.add_argument("--input", default="-", help="input file, `-` for stdin")
+    parser.add_argument("--output", default="-", help="output file, `-` for stdout")
+    parser.add_argument("--format", choices=["text", "npy", "f32", "f64"],
+                        help="input format: whitespace separated text, `.npy` "
+                             "array or raw little-endian float32/float64 "
+                             "(default: `npy` for `.npy` files, otherwise `text`)")
+    parser.add_argument("--dtype", choices=["float32", "float64"],
+                        help="precision of computations (default: float32 for "
+                             "text input, input precision for binary input)")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="number of threads evaluating blocks in parallel")
+    parser.add_argument("--chunk_size", type=int, default=CHUNK_SIZE,
+                        help="number of bytes read at once in text mode")
+    parser.add_argument("--block_size", type=int, default=BLOCK_SIZE,
+                        help="number of elements processed at once in binary modes")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("npy" if args.input.endswith(".npy") else "text")
+    if fmt != "text":
+        if "-" in (args.input, args.output):
+            parser.error("binary formats require --input and --output files")
+        cosinus_file(args.input, args.output, fmt, args.block_size, args.dtype,
+                     args.threads)
+        return
+
+    in_file = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    out_file = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        cosinus_stream(in_file, out_file, args.chunk_size,
+                       args.dtype or np.float32, args.threads)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    finally:
+        if in_file is not sys.stdin.buffer:
+            in_file.close()
+        if out_file is not sys.stdout.buffer:
+            out_file.close()
 
 
 def main():
+    argv = sys.argv[1:]
+    # streaming mode is chosen explicitly with a leading `-` or `--stream`,
+    # all other arguments are numbers
+    if argv[:1] in (["-"], ["--stream"]):
+        stream_main(argv[1:])
+        return
     try:
-        print(*cosinus(sys.argv[1:]))
+        print(*cosinus(argv))
     except ValueError as e:
         print(e)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,134 @@
+import io
+import sys
+
+import numpy as np
+import pytest
+from my_utils.my_utils import cosinus, cosinus_file, cosinus_stream, main
+
+
+class FakeStdin:
+    def __init__(self, data):
+        self.buffer = io.BytesIO(data)
+
+    def isatty(self):
+        return False
+
+
+def run_main(monkeypatch, argv, stdin=b""):
+    monkeypatch.setattr(sys, "argv", ["mycos", *argv])
+    monkeypatch.setattr(sys, "stdin", FakeStdin(stdin))
+    main()
+
+
+def test_main_arguments(monkeypatch, capsys):
+    run_main(monkeypatch, ["0", "-1.5"])
+
+    values = np.array(capsys.readouterr().out.split(), dtype=np.float32)
+    assert np.allclose(values, np.cos(np.float32([0, -1.5])))
+
+
+def test_main_without_arguments_does_not_stream(monkeypatch, capsys):
+    run_main(monkeypatch, [], stdin=b"1 2 3")
+
+    assert capsys.readouterr().out == "Invalid number of arguments\n"
+
+
+@pytest.mark.parametrize("flag", ["-", "--stream"])
+def test_main_stream_to_output_file(monkeypatch, tmp_path, flag):
+    output = tmp_path / "cosines.txt"
+
+    run_main(monkeypatch, [flag, "--output", str(output)], stdin=b"0 1\n2")
+
+    values = np.array(output.read_text().split(), dtype=np.float32)
+    assert np.allclose(values, np.cos(np.float32([0, 1, 2])))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 20])
+def test_cosinus_stream_chunk_boundaries(chunk_size):
+    values = np.linspace(-50, 50, 101, dtype=np.float32)
+    text = " ".join(map(str, values.tolist())).replace(" ", " \n\t ", 10).encode()
+    out_file = io.BytesIO()
+
+    cosinus_stream(io.BytesIO(text), out_file, chunk_size)
+
+    result = np.array(out_file.getvalue().split(), dtype=np.float32)
+    assert np.array_equal(result, np.cos(values))
+
+
+def test_cosinus_stream_invalid_number():
+    with pytest.raises(ValueError):
+        cosinus_stream(io.BytesIO(b"1 two 3"), io.BytesIO(), chunk_size=2)
+
+
+@pytest.mark.parametrize(
+    "x",
+    [
+        np.linspace(-10, 10, 1000, dtype=np.float32),
+        np.linspace(-10, 10, 1000).reshape(20, 50),
+        np.asfortranarray(np.linspace(-10, 10, 1000, dtype=np.float32).reshape(40, 25)),
+        np.arange(-500, 500, dtype=np.int32),
+    ],
+    ids=["f32", "f64_2d", "fortran", "int"],
+)
+def test_cosinus_file_npy(tmp_path, x):
+    np.save(tmp_path / "x.npy", x)
+
+    cosinus_file(tmp_path / "x.npy", tmp_path / "y.npy", "npy", block_size=64)
+
+    y = np.load(tmp_path / "y.npy")
+    expected_dtype = x.dtype if x.dtype.kind == "f" else np.float32
+    assert y.dtype == expected_dtype and y.shape == x.shape
+    assert y.flags.f_contiguous == x.flags.f_contiguous
+    assert np.array_equal(y, np.cos(x).astype(expected_dtype))
+
+
+@pytest.mark.parametrize("fmt, dtype", [("f32", "<f4"), ("f64", "<f8")])
+def test_cosinus_file_raw(tmp_path, fmt, dtype):
+    x = np.linspace(-10, 10, 1001).astype(dtype)
+    x.tofile(tmp_path / "x.bin")
+
+    cosinus_file(tmp_path / "x.bin", tmp_path / "y.bin", fmt, block_size=100)
+
+    assert np.array_equal(np.fromfile(tmp_path / "y.bin", dtype=dtype), np.cos(x))
+
+
+def test_cosinus_file_empty_raw(tmp_path):
+    (tmp_path / "x.bin").touch()
+
+    cosinus_file(tmp_path / "x.bin", tmp_path / "y.bin", "f32")
+
+    assert (tmp_path / "y.bin").read_bytes() == b""
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("threads, block_size", [(1, 7), (2, 7), (4, 1000), (3, 1 << 16)])
+def test_cosinus_threads_and_blocks(dtype, threads, block_size):
+    x = np.linspace(-100, 100, 10001)
+
+    result = cosinus(x, dtype=dtype, threads=threads, block_size=block_size)
+
+    assert result.dtype == dtype
+    assert np.array_equal(result, cosinus(x, dtype=dtype))
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_cosinus_out_is_filled_in_place(threads):
+    x = np.linspace(-10, 10, 1000).reshape(10, 100)
+    out = np.zeros(1000, dtype=np.float32)
+
+    result = cosinus(x, out=out, threads=threads, block_size=64)
+
+    assert result is out
+    assert np.array_equal(out, np.cos(x.astype(np.float32)).ravel())
+
+
+@pytest.mark.parametrize(
+    "out",
+    [np.empty(999, dtype=np.float32), np.empty(1001, dtype=np.float32),
+     np.empty(1000, dtype=np.float64), np.empty((10, 100), dtype=np.float32),
+     [0.0] * 1000],
+    ids=["short", "long", "dtype", "shape", "list"],
+)
+def test_cosinus_rejects_wrong_out(out):
+    with pytest.raises(ValueError, match="Invalid out argument"):
+        cosinus(np.zeros(1000), out=out, threads=2, block_size=64)
@@ -0,0 +1,76 @@
+"""
+Compare `pandas` and `numpy` compute backends of the analyses for datasets
+of different sizes. Datasets larger than the Krakow data are made by
+repeating its rows with consecutive dates.
+
+Usage: python benchmarks/bench_backends.py -p path/to/krakowbike-project -s 30 365 1826 20000
+"""
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+from krakowbike.analyze_data import (
+    calculate_basic_statistics,
+    calculate_seasonal_trends,
+    calculate_weather_correlations,
+    weather_summary,
+)
+from krakowbike.load_data import load_air_data, load_bike_data, load_weather_data
+from krakowbike.preprocess_data import preprocess_dataset
+
+
+def resize(df, n_days):
+    rows = np.arange(n_days) % len(df)
+    resized = df.iloc[rows]
+    resized.index = pd.date_range(df.index[0], periods=n_days, freq="D")
+    return resized
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--project_path", default="./krakowbike-project")
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=[30, 365, 1826, 20000, 200000])
+    parser.add_argument("-n", "--number", type=int, default=5)
+    args = parser.parse_args()
+
+    path_to_data = f"{args.project_path}/krakow_data"
+    df = preprocess_dataset(
+        load_air_data(path_to_data),
+        load_bike_data(path_to_data),
+        load_weather_data(path_to_data),
+    )
+    analyses = {
+        "basic_statistics": calculate_basic_statistics,
+        "weather_summary": weather_summary,
+        "seasonal_trends": calculate_seasonal_trends,
+        "weather_correlations": calculate_weather_correlations,
+        "weather_summary by_street": lambda df, backend: weather_summary(
+            df, by_street=True, backend=backend
+        ),
+        "seasonal_trends by_street": lambda df, backend: calculate_seasonal_trends(
+            df, by_street=True, backend=backend
+        ),
+    }
+    print(f"{'analysis':<28}{'days':>8}{'pandas [ms]':>14}{'numpy [ms]':>14}{'speedup':>10}")
+    faster = {}
+    for name, function in analyses.items():
+        for n_days in args.sizes:
+            data = resize(df, n_days)
+            seconds = {
+                backend: timeit.timeit(lambda: function(data, backend=backend), number=args.number)
+                / args.number
+                for backend in ["pandas", "numpy"]
+            }
+            faster.setdefault(name, []).append(min(seconds, key=seconds.get))
+            print(
+                f"{name:<28}{n_days:>8}{1000 * seconds['pandas']:>14.2f}"
+                f"{1000 * seconds['numpy']:>14.2f}{seconds['pandas'] / seconds['numpy']:>10.1f}x"
+            )
+    print("\nfaster backend (crossover points are where it changes):")
+    for name, backends in faster.items():
+        print(f"{name:<28}" + ", ".join(f"{n}: {b}" for n, b in zip(args.sizes, backends)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare `bootstrap_group_means` with a naive loop drawing every resample
+of every group separately.
+
+Usage: python benchmarks/bench_bootstrap.py -p path/to/krakowbike-project
+"""
+import argparse
+import time
+
+import numpy as np
+from krakowbike.analyze_data import bootstrap_group_means
+from krakowbike.load_data import load_air_data, load_bike_data, load_weather_data
+from krakowbike.preprocess_data import preprocess_dataset
+
+
+def naive_loop(codes, n_groups, values, n_resamples):
+    rng = np.random.default_rng(0)
+    intervals = []
+    for group in range(n_groups):
+        group_values = values[codes == group]
+        means = [
+            rng.choice(group_values, group_values.size).mean()
+            for _ in range(n_resamples)
+        ]
+        intervals.append(np.quantile(means, [0.025, 0.975]))
+    return intervals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--project_path", default="./krakowbike-project")
+    parser.add_argument("-n", "--n_resamples", type=int, default=10000)
+    args = parser.parse_args()
+
+    path_to_data = f"{args.project_path}/krakow_data"
+    df = preprocess_dataset(
+        load_air_data(path_to_data),
+        load_bike_data(path_to_data),
+        load_weather_data(path_to_data),
+    )
+    groupings = {
+        "year": df.index.year,
+        "month": df.index.month,
+        "day_of_week": df.index.dayofweek,
+    }
+    traffic = df[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+    print(f"{'grouping':<16}{'naive loop [ms]':>18}{'vectorised [ms]':>18}{'speedup':>10}")
+    for name, keys in groupings.items():
+        labels, codes = np.unique(keys.to_numpy(), return_inverse=True)
+        start = time.perf_counter()
+        naive_loop(codes, len(labels), traffic[:, 0], args.n_resamples)
+        naive = time.perf_counter() - start
+        start = time.perf_counter()
+        bootstrap_group_means(codes, len(labels), traffic, args.n_resamples)
+        vectorised = time.perf_counter() - start
+        print(
+            f"{name:<16}{1000 * naive:>18.2f}{1000 * vectorised:>18.2f}"
+            f"{naive / vectorised:>10.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
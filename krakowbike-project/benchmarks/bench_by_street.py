@@ -0,0 +1,58 @@
+"""
+Compare `by_street=True` analyses with a naive loop calling the existing
+single-column functions once per street.
+
+Usage: python benchmarks/bench_by_street.py -p path/to/krakowbike-project
+"""
+import argparse
+import timeit
+
+from krakowbike.analyze_data import (
+    calculate_seasonal_trends,
+    calculate_weather_correlations,
+    get_street_columns,
+    weather_summary,
+)
+from krakowbike.load_data import load_air_data, load_bike_data, load_weather_data
+from krakowbike.preprocess_data import preprocess_dataset
+
+
+def naive_loop(df, function):
+    results = {}
+    for street in get_street_columns(df):
+        df_street = df.copy()
+        df_street["total_daily_traffic"] = df_street[street]
+        results[street] = function(df_street)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--project_path", default="./krakowbike-project")
+    parser.add_argument("-n", "--number", type=int, default=5)
+    args = parser.parse_args()
+
+    path_to_data = f"{args.project_path}/krakow_data"
+    df = preprocess_dataset(
+        load_air_data(path_to_data),
+        load_bike_data(path_to_data),
+        load_weather_data(path_to_data),
+    )
+    print(f"{'analysis':<32}{'naive loop [ms]':>18}{'by_street [ms]':>18}{'speedup':>10}")
+    for function in [
+        weather_summary,
+        calculate_seasonal_trends,
+        calculate_weather_correlations,
+    ]:
+        naive = timeit.timeit(lambda: naive_loop(df, function), number=args.number)
+        vectorised = timeit.timeit(
+            lambda: function(df, by_street=True), number=args.number
+        )
+        print(
+            f"{function.__name__:<32}{1000 * naive / args.number:>18.2f}"
+            f"{1000 * vectorised / args.number:>18.2f}{naive / vectorised:>10.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare strategies of filling missing values of the street counters:
+speed and accuracy on values hidden from the Krakow data. Every street loses
+one outage of consecutive days and a share of random single days; the hidden
+values are compared with the imputed ones.
+
+Usage: python benchmarks/bench_imputation.py -p path/to/krakowbike-project -d 90 -f 0.05
+"""
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+from krakowbike.load_data import load_air_data, load_bike_data, load_weather_data
+from krakowbike.preprocess_data import (
+    IMPUTATION_STRATEGIES,
+    impute_missing_values,
+    merge_datasets,
+    remove_empty_columns,
+    set_proper_values_types,
+)
+from krakowbike.utils import STREET_NAMES
+
+
+def mask_values(df, streets, outage_days, fraction, seed):
+    rng = np.random.default_rng(seed)
+    block = df[streets].to_numpy(dtype=np.float64)
+    hidden = rng.random(block.shape) < fraction
+    starts = rng.integers(0, len(block) - outage_days, len(streets))
+    rows = np.arange(len(block))[:, np.newaxis]
+    hidden |= (rows >= starts) & (rows < starts + outage_days)
+    hidden &= ~np.isnan(block)
+    masked = df.copy()
+    masked[streets] = np.where(hidden, np.nan, block)
+    return masked, hidden
+
+
+def pandas_interpolate(df):
+    # per column reference of the `interpolate` strategy
+    dated = df.set_axis(pd.to_datetime(df.index))
+    return dated.interpolate(method="time", limit_direction="both").set_axis(df.index)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--project_path", default="./krakowbike-project")
+    parser.add_argument("-d", "--outage_days", type=int, default=90)
+    parser.add_argument("-f", "--fraction", type=float, default=0.05)
+    parser.add_argument("-n", "--number", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    path_to_data = f"{args.project_path}/krakow_data"
+    df = remove_empty_columns(
+        set_proper_values_types(
+            merge_datasets(
+                (
+                    load_air_data(path_to_data),
+                    load_bike_data(path_to_data),
+                    load_weather_data(path_to_data),
+                )
+            )
+        )
+    )
+    streets = [col for col in STREET_NAMES if col in df.columns]
+    masked, hidden = mask_values(df, streets, args.outage_days, args.fraction, args.seed)
+    truth = df[streets].to_numpy(dtype=np.float64)[hidden]
+    print(
+        f"{hidden.sum()} hidden street values ({args.outage_days} day outage per street "
+        f"and {args.fraction:.0%} random days)\n"
+    )
+
+    imputers = {
+        strategy: lambda strategy=strategy: impute_missing_values(masked, strategy)
+        for strategy in IMPUTATION_STRATEGIES
+    }
+    imputers["interpolate (pandas)"] = lambda: pandas_interpolate(masked)
+    print(f"{'strategy':<24}{'time [ms]':>12}{'MAE':>10}{'RMSE':>10}{'bias':>10}")
+    for name, impute in imputers.items():
+        seconds = timeit.timeit(impute, number=args.number) / args.number
+        errors = impute()[streets].to_numpy(dtype=np.float64)[hidden] - truth
+        print(
+            f"{name:<24}{1000 * seconds:>12.2f}{np.abs(errors).mean():>10.1f}"
+            f"{np.sqrt((errors**2).mean()):>10.1f}{errors.mean():>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,58 @@
 from krakowbike.analyze_data import *
+from krakowbike.chart_data import *
+from krakowbike.city_data import *
 from krakowbike.load_data import *
+from krakowbike.model_data import *
 from krakowbike.preprocess_data import *
+from krakowbike.query_data import *
+from krakowbike.store_data import *
 from krakowbike.visualize_data import *
 
 __all__ = [
     "load_bike_data",
     "load_weather_data",
     "load_air_data",
+    "load_hourly_data",
+    "load_hourly_bike_data",
+    "resample_to_daily",
     "preprocess_dataset",
+    "impute_missing_values",
+    "save_preprocessed_dataset",
+    "load_preprocessed_dataset",
+    "build_incremental_dataset",
+    "append_daily_readings",
+    "RebuildRequiredError",
+    "City",
+    "DataSource",
+    "register_city",
+    "get_city",
+    "load_city_registry",
+    "load_cities",
+    "city_frame",
+    "calculate_city_statistics",
+    "calculate_city_seasonal_trends",
+    "city_weather_summary",
+    "calculate_city_weather_correlations",
+    "TrafficRangeQuery",
+    "set_backend",
+    "get_backend",
     "calculate_basic_statistics",
     "weather_summary",
     "calculate_seasonal_trends",
     "calculate_weather_correlations",
+    "bootstrap_group_means",
+    "calculate_lagged_weather_correlations",
+    "LinearTrafficModel",
+    "cross_validate_model",
+    "calculate_model_summary",
     "plot_total_daily_traffic",
     "plot_correlation_matrix",
     "visualize_seasonal_traffic",
     "visualize_weather_impact",
+    "plot_lagged_correlations",
+    "daily_traffic_chart_data",
+    "correlation_matrix_chart_data",
+    "seasonal_traffic_chart_data",
+    "weather_impact_chart_data",
+    "lagged_correlations_chart_data",
 ]
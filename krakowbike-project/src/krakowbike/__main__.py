@@ -1,54 +1,320 @@
 import argparse
+import importlib
+import inspect
 import os
+import sys
 import webbrowser
+from datetime import date
+from functools import lru_cache, partial
+from typing import Any, Callable
 
-from jinja2 import Environment, FileSystemLoader
+import matplotlib.pyplot as plt
+import pandas as pd
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 from krakowbike.analyze_data import (
+    BACKENDS,
     calculate_basic_statistics,
+    calculate_lagged_weather_correlations,
     calculate_seasonal_trends,
     calculate_weather_correlations,
+    get_backend,
+    set_backend,
     weather_summary,
 )
-from krakowbike.load_data import load_air_data, load_bike_data, load_weather_data
-from krakowbike.preprocess_data import preprocess_dataset
+from krakowbike.chart_data import (
+    correlation_matrix_chart_data,
+    daily_traffic_chart_data,
+    lagged_correlations_chart_data,
+    seasonal_traffic_chart_data,
+    weather_impact_chart_data,
+)
+from krakowbike.city_data import get_city
+from krakowbike.model_data import calculate_model_summary
+from krakowbike.preprocess_data import (
+    IMPUTATION_STRATEGIES,
+    check_time_period,
+    get_proper_time_period,
+)
+from krakowbike.report_build import ReportBuild, Section
 from krakowbike.visualize_data import (
     plot_correlation_matrix,
+    plot_lagged_correlations,
     plot_total_daily_traffic,
     visualize_seasonal_traffic,
     visualize_weather_impact,
 )
 
+# `krakowbike` re-exports functions named like its modules, so modules are
+# looked up by their full names
+UTILS_MODULE = importlib.import_module("krakowbike.utils")
+DATA_MODULES = [
+    importlib.import_module("krakowbike.city_data"),
+    importlib.import_module("krakowbike.load_data"),
+    importlib.import_module("krakowbike.preprocess_data"),
+    UTILS_MODULE,
+]
+# templates of report modes; the first one is rendered, the others are
+# included in it
+REPORT_TEMPLATES = {
+    "static": ["report.html"],
+    "interactive": ["report_interactive.html", "report.html", "charts.js"],
+}
+
+
+def load_report_dataset(project_path: str,
+                        start_date: str = "2017-01-01",
+                        end_date: str = "2021-12-31",
+                        imputation: str = "mean",
+                        store_dir: str | None = None) -> pd.DataFrame:
+    return get_city("krakow").load(
+        project_path, start_date, end_date, imputation, store_dir
+    )
+
+
+def report_sections(
+    max_lag: int | None = None, mode: str = "static"
+) -> dict[str, tuple[Callable, str, dict]]:
+    """
+    Describe sections of the report: function calculating the section,
+    name of the value it is calculated from (`dataset` for the preprocessed
+    dataframe or name of another section) and keyword arguments of the function.
+
+    :param max_lag: int, default None. If given, heatmap of correlations
+                    between weather factors lagged by up to `max_lag` days
+                    and total daily traffic is added to the report.
+    :param mode: str, default `static`. In `static` mode charts are PNG
+                 images, in `interactive` mode they are data drawn
+                 by a script in the browser.
+    :return: dictionary mapping name of template variable
+             to (function, dependency, keyword arguments)
+    """
+    if mode not in REPORT_TEMPLATES:
+        raise ValueError(
+            f"Invalid mode argument. It has to be one of {', '.join(REPORT_TEMPLATES)}, instead got {mode}."
+        )
+    sections = {
+        "basic_statistics": (calculate_basic_statistics, "dataset", {"for_html": True}),
+        "weather_dict": (weather_summary, "dataset", {"for_html": True}),
+        "seasonal_dict": (calculate_seasonal_trends, "dataset", {"for_html": True}),
+        "weather_corrs": (calculate_weather_correlations, "dataset", {}),
+        "model_dict": (calculate_model_summary, "dataset", {"for_html": True}),
+    }
+    if mode == "interactive":
+        sections.update(
+            {
+                "daily_traffic_chart": (daily_traffic_chart_data, "dataset", {}),
+                "correlations_chart": (correlation_matrix_chart_data, "dataset", {}),
+                "seasonal_traffic_chart": (seasonal_traffic_chart_data, "dataset", {}),
+                "weather_chart": (weather_impact_chart_data, "dataset", {}),
+            }
+        )
+    else:
+        sections.update(
+            {
+                "daily_traffic_plot": (plot_total_daily_traffic, "dataset", {"save_plot": True}),
+                "correlations_matrix": (plot_correlation_matrix, "dataset", {"save_plot": True}),
+                "seasonal_traffic_plot": (
+                    visualize_seasonal_traffic,
+                    "dataset",
+                    {"save_plot": True},
+                ),
+                "weather_plot": (visualize_weather_impact, "dataset", {"save_plot": True}),
+            }
+        )
+    if max_lag is not None:
+        sections["lagged_correlations"] = (
+            calculate_lagged_weather_correlations,
+            "dataset",
+            {"max_lag": max_lag, "by_street": False},
+        )
+        if mode == "interactive":
+            sections["lagged_correlations_chart"] = (
+                lagged_correlations_chart_data,
+                "lagged_correlations",
+                {},
+            )
+        else:
+            sections["lagged_correlations_plot"] = (
+                plot_lagged_correlations,
+                "lagged_correlations",
+                {"save_plot": True},
+            )
+    return sections
+
+
+def call_on_copy(
+    function: Callable, df: pd.DataFrame, backend: str | None = None, **kwargs
+) -> Any:
+    """
+    Call function on a copy of the dataframe, as some plotting functions
+    add helper columns to the dataframe they get.
+
+    :param backend: str, default None. Compute backend of the analyses called
+                    by the function; None for the backend set with `set_backend`.
+                    As a section parameter it is part of the section fingerprint.
+    """
+    if backend is None:
+        return function(df.copy(), **kwargs)
+    previous = get_backend()
+    set_backend(backend)
+    try:
+        return function(df.copy(), **kwargs)
+    finally:
+        set_backend(previous)
+
+
+def calculate_report_data(
+    df: pd.DataFrame, max_lag: int | None = None, mode: str = "static"
+) -> dict:
+    """
+    Calculate statistics and plots shown in the report.
+
+    :param df: pd.Dataframe, preprocessed dataframe
+    :param max_lag: int, default None, see `report_sections`
+    :param mode: str, default `static`, see `report_sections`
+    :return: dict, data for the report template
+    """
+    values = {"dataset": df}
+    for name, (function, dependency, kwargs) in report_sections(max_lag, mode).items():
+        values[name] = call_on_copy(function, values[dependency], **kwargs)
+    del values["dataset"]
+    return values
+
 
 def generate_data_for_html_report(project_path: str,
                                   start_date: str = "2017-01-01",
-                                  end_date: str = "2021-12-31") -> dict:
-    path_to_data = f"{project_path}/krakow_data"
-    df = preprocess_dataset(
-        load_air_data(path_to_data),
-        load_bike_data(path_to_data),
-        load_weather_data(path_to_data),
-        start_date=start_date,
-        end_date=end_date,
-    )
-    basic_statistics = calculate_basic_statistics(df, for_html=True)
-    weather_dict = weather_summary(df, for_html=True)
-    seasonal_dict = calculate_seasonal_trends(df, for_html=True)
-    weather_corrs = calculate_weather_correlations(df)
-    daily_traffic_plot = plot_total_daily_traffic(df, save_plot=True)
-    correlations_matrix = plot_correlation_matrix(df, save_plot=True)
-    seasonal_traffic_plot = visualize_seasonal_traffic(df, save_plot=True)
-    weather_plot = visualize_weather_impact(df, save_plot=True)
-    data = {
-        "basic_statistics": basic_statistics,
-        "weather_dict": weather_dict,
-        "seasonal_dict": seasonal_dict,
-        "weather_corrs": weather_corrs,
-        "daily_traffic_plot": daily_traffic_plot,
-        "correlations_matrix": correlations_matrix,
-        "seasonal_traffic_plot": seasonal_traffic_plot,
-        "weather_plot": weather_plot,
-    }
-    return data
+                                  end_date: str = "2021-12-31",
+                                  max_lag: int | None = None,
+                                  imputation: str = "mean") -> dict:
+    df = load_report_dataset(project_path, start_date, end_date, imputation)
+    return calculate_report_data(df, max_lag)
+
+
+@lru_cache
+def get_template_environment(templates_path: str) -> Environment:
+    """
+    Create jinja2 environment of a templates directory once per process.
+    Compiled bytecode is additionally cached on disk, so other processes
+    skip compilation too.
+    """
+    return Environment(
+        loader=FileSystemLoader(templates_path),
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+
+
+def get_report_template(templates_path: str, template_name: str = "report.html") -> Template:
+    """
+    Load and compile report template. The template is compiled once per
+    process and compiled again only if its file was modified since
+    (the environment checks modification times of loaded templates).
+    """
+    return get_template_environment(templates_path).get_template(template_name)
+
+
+def write_report(template: Template, data: dict, report_path: str) -> None:
+    """
+    Render report straight to the file, chunk by chunk, without building
+    the whole document in memory.
+    """
+    with open(report_path, mode="w", encoding="utf-8") as report:
+        template.stream(data).dump(report)
+
+
+def render_report(
+    *values,
+    names: list[str],
+    templates_path: str,
+    report_path: str,
+    template_name: str = "report.html",
+) -> None:
+    """
+    Write report with given values of template variables.
+    """
+    write_report(
+        get_report_template(templates_path, template_name),
+        dict(zip(names, values)),
+        report_path,
+    )
+
+
+def parse_period(value: str) -> tuple[str, str]:
+    """
+    Parse `--batch` period of the form START:END.
+
+    :param value: str, period, e.g. 2018-01-01:2018-12-31
+    :return: tuple of start and end dates in format YYYY-MM-DD
+    """
+    dates = value.split(":")
+    try:
+        if len(dates) != 2 or any(len(day) != len("YYYY-MM-DD") for day in dates):
+            raise ValueError
+        start_date, end_date = (date.fromisoformat(day).isoformat() for day in dates)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid batch argument. It has to be a period START:END with dates in format YYYY-MM-DD, instead got {value}."
+        ) from None
+    try:
+        check_time_period(start_date, end_date)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return start_date, end_date
+
+
+def report_data_files(project_path: str) -> list[str]:
+    """
+    Return paths to the raw data files read by `load_report_dataset`.
+    """
+    return get_city("krakow").data_files(project_path)
+
+
+def add_report_sections(
+    graph: dict[str, Section],
+    dataset: str,
+    templates_path: str,
+    report_path: str,
+    max_lag: int | None = None,
+    prefix: str = "",
+    mode: str = "static",
+    backend: str | None = None,
+) -> str:
+    """
+    Add sections of one report to the report build graph.
+
+    :param graph: dictionary mapping section name to its definition
+    :param dataset: str, name of the section with the preprocessed dataframe
+    :param templates_path: str, path to the templates directory
+    :param report_path: str, path to the report file
+    :param max_lag: int, default None, see `report_sections`
+    :param prefix: str, prefix of names of added sections
+    :param mode: str, default `static`, see `report_sections`
+    :param backend: str, default None. Compute backend of the sections,
+                    see `call_on_copy`
+    :return: str, name of the section writing the report file
+    """
+    names = []
+    for name, (function, dependency, kwargs) in report_sections(max_lag, mode).items():
+        graph[prefix + name] = Section(
+            partial(call_on_copy, function),
+            [dataset if dependency == "dataset" else prefix + dependency],
+            {**kwargs, "backend": backend},
+            code=[inspect.getmodule(function), UTILS_MODULE],
+        )
+        names.append(name)
+    graph[prefix + "report"] = Section(
+        render_report,
+        [prefix + name for name in names],
+        {
+            "names": names,
+            "templates_path": templates_path,
+            "report_path": report_path,
+            "template_name": REPORT_TEMPLATES[mode][0],
+        },
+        code=[sys.modules[__name__]],
+        files=[f"{templates_path}/{template}" for template in REPORT_TEMPLATES[mode]],
+        outputs=[report_path],
+    )
+    return prefix + "report"
 
 
 def main():
@@ -82,22 +348,130 @@ def main():
         help="End date of analyzed period.",
         default="2021-12-31",
     )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        nargs="+",
+        type=parse_period,
+        metavar="START:END",
+        help="Create one report for each of given periods, e.g. 2018-01-01:2018-12-31.",
+    )
+    parser.add_argument(
+        "-l",
+        "--max_lag",
+        type=int,
+        help="Add heatmap of correlations between weather factors lagged by up to "
+        "`max_lag` days and traffic to the report.",
+    )
+    parser.add_argument(
+        "-c",
+        "--cache_dir",
+        help="Path to the directory in which computed report sections are cached "
+        "(default: `.report_cache` in the output directory).",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Show which report sections were rebuilt and why.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="pandas",
+        help="Compute backend of the statistics (both give the same results).",
+    )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=list(REPORT_TEMPLATES),
+        default="static",
+        help="Report mode: `static` with PNG charts or `interactive` with charts "
+        "drawn in the browser from embedded data (faster to create and smaller).",
+    )
+    parser.add_argument(
+        "-i",
+        "--imputation",
+        choices=IMPUTATION_STRATEGIES,
+        default="mean",
+        help="Strategy of filling missing values: column means, linear interpolation "
+        "in time, month and day of week climatology or seasonal profile of all "
+        "counters scaled to each street.",
+    )
     args = parser.parse_args()
+    set_backend(args.backend)
 
-    environment = Environment(loader=FileSystemLoader(f"{args.project_path}/templates"))
-    template = environment.get_template("report.html")
-    krakow_data = generate_data_for_html_report(
-        args.project_path, args.start_date, args.end_date
-    )
+    templates_path = f"{args.project_path}/templates"
+    data_files = report_data_files(args.project_path)
+    if args.batch:
+        graph = {
+            "dataset": Section(
+                load_report_dataset,
+                params={"project_path": args.project_path, "imputation": args.imputation},
+                code=DATA_MODULES,
+                files=data_files,
+            )
+        }
+        reports = []
+        for start_date, end_date in args.batch:
+            period = f"{start_date}:{end_date}"
+            graph[f"{period} dataset"] = Section(
+                get_proper_time_period,
+                ["dataset"],
+                {"start_date": start_date, "end_date": end_date},
+                code=DATA_MODULES,
+            )
+            report_name = f"{args.report_name}_{start_date}_{end_date}"
+            section = add_report_sections(
+                graph,
+                f"{period} dataset",
+                templates_path,
+                os.path.abspath(f"{args.output_dir}/{report_name}.html"),
+                args.max_lag,
+                prefix=f"{period} ",
+                mode=args.mode,
+                backend=args.backend,
+            )
+            reports.append((report_name, section))
+    else:
+        graph = {
+            "dataset": Section(
+                load_report_dataset,
+                params={
+                    "project_path": args.project_path,
+                    "start_date": args.start_date,
+                    "end_date": args.end_date,
+                    "imputation": args.imputation,
+                },
+                code=DATA_MODULES,
+                files=data_files,
+            )
+        }
+        section = add_report_sections(
+            graph,
+            "dataset",
+            templates_path,
+            os.path.abspath(f"{args.output_dir}/{args.report_name}.html"),
+            args.max_lag,
+            mode=args.mode,
+            backend=args.backend,
+        )
+        reports = [(args.report_name, section)]
 
-    content = template.render(krakow_data)
-    report_abs_path = os.path.abspath(f"{args.output_dir}/{args.report_name}.html")
-    with open(report_abs_path, mode="w", encoding="utf-8") as report:
-        report.write(content)
-        print(f"Created {args.report_name}.html report in {args.output_dir} directory.")
+    build = ReportBuild(graph, args.cache_dir or f"{args.output_dir}/.report_cache")
+    for report_name, section in reports:
+        build.build([section])
+        plt.close("all")
+        if section in build.rebuilt:
+            print(f"Created {report_name}.html report in {args.output_dir} directory.")
+        else:
+            print(f"Report {report_name}.html in {args.output_dir} directory is up to date.")
+    build.prune()
+    if args.explain:
+        print("\n".join(build.explanations))
 
-    # open created report in a web browser
-    webbrowser.open_new_tab(report_abs_path)
+    if not args.batch:
+        # open created report in a web browser
+        webbrowser.open_new_tab(graph[section].params["report_path"])
 
 
 if __name__ == "__main__":
@@ -1,8 +1,387 @@
+import calendar
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-from krakowbike.utils import AIR_COLUMN, MONTH_TO_SEASON, STREET_NAMES
+from krakowbike.utils import (
+    AIR_COLUMN,
+    MONTH_TO_SEASON,
+    PRECIPITATION_COLUMN,
+    STREET_NAMES,
+    TEMPERATURE_COLUMN,
+)
+
+# number of resampled values (rows x columns) drawn at once by one bootstrap chunk
+BOOTSTRAP_CHUNK_ELEMENTS = 1 << 17
+# compute engines of the analyses: "pandas" is the reference implementation,
+# "numpy" works on column arrays and integer calendar / category codes
+BACKENDS = ("pandas", "numpy")
+# category column name, bin edges and labels of every summary of `weather_summary`
+WEATHER_CATEGORIES = {
+    "temperature_impact": (
+        "temp_category",
+        [-float("inf"), 0, 10, 20, float("inf")],
+        ["Cold (<0°C)", "Cool (0-10°C)", "Mild (10-20°C)", "Warm (>20°C)"],
+    ),
+    "precipitation_impact": (
+        "rain_category",
+        [-float("inf"), 0, 1, 5, float("inf")],
+        ["No rain", "Light rain", "Moderate rain", "Heavy rain"],
+    ),
+    "air_quality_impact": (
+        "air_category",
+        [-float("inf"), 20, 50, 80, 110, 150, float("inf")],
+        ["Very good", "Good", "Moderate", "Sufficient", "Bad", "Vary bad"],
+    ),
+}
+_backend = "pandas"
+
+
+def set_backend(backend: str) -> None:
+    """
+    Set compute backend used by the analyses which are called without
+    the `backend` argument.
+
+    :param backend: str, `pandas` or `numpy`
+    """
+    global _backend
+    _backend = get_backend(backend)
+
+
+def get_backend(backend: str | None = None) -> str:
+    """
+    Return compute backend of an analysis call.
+
+    :param backend: str, `pandas` or `numpy`; None for the backend set
+                    with `set_backend`
+    :return: str, name of the backend
+    """
+    if backend is None:
+        return _backend
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Invalid backend argument. It has to be one of {', '.join(BACKENDS)}, instead got {backend}."
+        )
+    return backend
+
+
+def get_street_columns(df: pd.DataFrame, street_names: list[str] | None = None) -> list[str]:
+    """
+    Return names of street traffic columns present in a given dataframe.
+
+    :param df: pd.Dataframe, dataframe containing traffic data
+    :param street_names: list of street columns (default: STREET_NAMES)
+    :return: list of street column names
+    """
+    street_names = STREET_NAMES if street_names is None else street_names
+    return [col for col in street_names if col in df.columns]
+
+
+def sorted_codes(keys: np.ndarray, names: list[str]) -> tuple[np.ndarray, pd.Index]:
+    """
+    Translate integer keys of named groups into codes of the groups sorted
+    by name (the order of pandas groupby results).
+
+    :param keys: np.ndarray, position of the name of every row in `names`;
+                 negative keys mark rows which do not belong to any group
+    :param names: list of group names
+    :return: group code of each row and sorted group labels
+    """
+    order = np.argsort(np.asarray(names, dtype=object), kind="stable")
+    ranks = np.empty(len(names) + 1, dtype=np.intp)
+    ranks[order] = np.arange(len(names))
+    ranks[-1] = -1
+    return ranks[keys], pd.Index([names[i] for i in order])
+
+
+def calendar_codes(index: pd.Index) -> dict[str, tuple[np.ndarray, pd.Index]]:
+    """
+    Calculate year, month, season and day of week group codes of dates
+    with integer arithmetic on `datetime64` values.
+
+    :param index: pd.Index, dates
+    :return: dictionary mapping period name to group code of each date
+             and group labels ordered like pandas groupby results
+    """
+    dates = np.asarray(index, dtype="datetime64[D]")
+    missing = np.isnat(dates)
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    years = months // 12 + 1970
+    months = np.where(missing, -1, months % 12)
+    # 1970-01-01 was Thursday
+    days = np.where(missing, -1, (dates.astype(np.int64) + 3) % 7)
+
+    first_year, last_year = (
+        (years[~missing].min(), years[~missing].max()) if (~missing).any() else (0, -1)
+    )
+    month_names = list(calendar.month_name)[1:]
+    seasons = sorted(set(MONTH_TO_SEASON.values()))
+    month_seasons = np.array(
+        [seasons.index(MONTH_TO_SEASON[m]) if m in MONTH_TO_SEASON else -1 for m in month_names]
+        + [-1]
+    )
+    codes = {
+        "year": (
+            np.where(missing, -1, years - first_year),
+            pd.Index(np.arange(first_year, last_year + 1, dtype=np.int32)),
+        ),
+        "month": sorted_codes(months, month_names),
+        "season": (month_seasons[months], pd.Index(seasons)),
+        "day_of_week": sorted_codes(days, list(calendar.day_name)),
+    }
+    return {period: (c, labels.rename(period)) for period, (c, labels) in codes.items()}
 
 
-def calculate_basic_statistics(df: pd.DataFrame, for_html: bool = False) -> pd.DataFrame | str:
+def cut_codes(values: np.ndarray, bins: list[float]) -> np.ndarray:
+    """
+    Bin values into right-closed intervals (like `pd.cut`).
+
+    :param values: np.ndarray, 1-D array of values
+    :param bins: list of increasing bin edges
+    :return: np.ndarray, bin code of each value; -1 for NaN and values
+             outside the bins
+    """
+    codes = np.searchsorted(bins, values, side="left") - 1
+    return np.where((codes >= 0) & (codes < len(bins) - 1), codes, -1)
+
+
+def grouped_statistics(
+    codes: np.ndarray, n_groups: int, block: np.ndarray, stats: list[str]
+) -> dict[str, np.ndarray]:
+    """
+    Calculate statistics of every column of a 2-D block for every group
+    at once, ignoring NaN values (like pandas groupby aggregations).
+
+    Rows are sorted by group code and aggregated with `np.add.reduceat`,
+    so all columns are processed in a single pass without Python loops.
+
+    :param codes: np.ndarray, integer group code of each row; negative codes
+                  mark rows which do not belong to any group
+    :param n_groups: int, number of groups
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns)
+    :param stats: list of statistics to calculate, any of
+                  `mean`, `sum`, `std`, `count`
+    :return: dictionary mapping statistic name to array of shape
+             (n_groups, n_columns)
+    """
+    in_group = codes >= 0
+    codes, block = codes[in_group], block[in_group]
+    order = np.argsort(codes, kind="stable")
+    codes, block = codes[order], block[order]
+    valid = ~np.isnan(block)
+    values = np.where(valid, block, 0.0)
+
+    group_sizes = np.bincount(codes, minlength=n_groups)
+    present = group_sizes > 0
+    starts = (np.cumsum(group_sizes) - group_sizes)[present]
+
+    counts = np.zeros((n_groups, block.shape[1]))
+    sums = np.zeros((n_groups, block.shape[1]))
+    if starts.size:
+        counts[present] = np.add.reduceat(valid, starts, axis=0)
+        sums[present] = np.add.reduceat(values, starts, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+
+    result = {"mean": means, "sum": sums, "count": counts}
+    if "std" in stats:
+        squares = np.zeros((n_groups, block.shape[1]))
+        if starts.size:
+            deviations = np.where(valid, block - means[codes], 0.0)
+            squares[present] = np.add.reduceat(deviations**2, starts, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result["std"] = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+    return {stat: result[stat] for stat in stats}
+
+
+def bootstrap_group_means(
+    codes: np.ndarray,
+    n_groups: int,
+    block: np.ndarray,
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    workers: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate bootstrap percentile confidence intervals of the mean of every
+    column of a 2-D block for every group at once, ignoring NaN values.
+
+    Rows are resampled with replacement within their groups. Resamples are
+    drawn in chunks as 2-D arrays of row indices and aggregated with
+    `np.add.reduceat` over the rows sorted by group, so there is no Python
+    loop over resamples or groups. Chunks are processed in a thread pool;
+    every chunk has its own random generator spawned from `seed`, so results
+    do not depend on the number of workers.
+
+    :param codes: np.ndarray, integer group code of each row; negative codes
+                  mark rows which do not belong to any group
+    :param n_groups: int, number of groups
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns)
+    :param n_resamples: int, number of bootstrap resamples
+    :param confidence: float, confidence level of the intervals
+    :param seed: int, seed of the random generator
+    :param workers: int, number of threads, None for the number of CPUs
+    :return: lower and upper bounds of the intervals, arrays of shape
+             (n_groups, n_columns); NaN for groups without any values
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(
+            f"Invalid confidence argument. It has to fall in between 0 and 1, instead got {confidence}."
+        )
+    if n_resamples < 1:
+        raise ValueError(
+            f"Invalid n_resamples argument. It has to be positive, instead got {n_resamples}."
+        )
+    in_group = codes >= 0
+    codes, block = codes[in_group], block[in_group]
+    order = np.argsort(codes, kind="stable")
+    codes, block = codes[order], block[order]
+    n_rows, n_columns = block.shape
+    low = np.full((n_groups, n_columns), np.nan)
+    high = np.full((n_groups, n_columns), np.nan)
+    if not n_rows:
+        return low, high
+
+    group_sizes = np.bincount(codes, minlength=n_groups)
+    present = group_sizes > 0
+    group_starts = np.cumsum(group_sizes) - group_sizes
+    # every row is replaced by a random row of its own group; float32 draws
+    # are several times faster and, for fewer than 2**24 rows, draw * size
+    # is still rounded below size, so the indices stay within the group
+    float_type, index_type = (
+        (np.float32, np.int32) if n_rows < 1 << 24 else (np.float64, np.intp)
+    )
+    row_starts = group_starts[codes].astype(index_type)
+    row_sizes = group_sizes[codes].astype(float_type)
+    valid = ~np.isnan(block)
+    has_nan = not valid.all()
+    values = np.where(valid, block, 0.0)
+    starts = group_starts[present]
+
+    means = np.empty((n_resamples, starts.size, n_columns))
+    chunk_size = max(1, BOOTSTRAP_CHUNK_ELEMENTS // max(n_rows * n_columns, 1))
+    chunks = range(0, n_resamples, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    def resample(chunk_start: int, chunk_seed: np.random.SeedSequence) -> None:
+        rng = np.random.default_rng(chunk_seed)
+        size = min(chunk_size, n_resamples - chunk_start)
+        draws = rng.random((size, n_rows), dtype=float_type)
+        draws *= row_sizes
+        rows = draws.astype(index_type)
+        rows += row_starts
+        sums = np.add.reduceat(np.take(values, rows, axis=0), starts, axis=1)
+        if has_nan:
+            counts = np.add.reduceat(np.take(valid, rows, axis=0), starts, axis=1)
+        else:
+            counts = group_sizes[present][:, np.newaxis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(sums, counts, out=means[chunk_start : chunk_start + size])
+        if has_nan:
+            means[chunk_start : chunk_start + size][counts == 0] = np.nan
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for future in [
+            executor.submit(resample, chunk_start, chunk_seed)
+            for chunk_start, chunk_seed in zip(chunks, seeds)
+        ]:
+            future.result()
+
+    quantiles = [(1 - confidence) / 2, (1 + confidence) / 2]
+    quantile = np.nanquantile if has_nan else np.quantile
+    low[present], high[present] = quantile(means, quantiles, axis=0)
+    return low, high
+
+
+def grouped_statistics_frame(
+    codes: np.ndarray,
+    labels: pd.Index,
+    block: np.ndarray,
+    columns: list[str] | None,
+    stats: list[str],
+    n_resamples: int | None = None,
+) -> pd.DataFrame:
+    """
+    Wrap `grouped_statistics` result into a dataframe indexed by group labels
+    with (column, statistic) MultiIndex columns.
+
+    :param codes: np.ndarray, integer group code of each row
+    :param labels: pd.Index, labels of the groups
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns)
+    :param columns: list of names of the block columns; None for a block
+                    with a single column, the frame has then only
+                    the statistics as columns
+    :param stats: list of statistics to calculate
+    :param n_resamples: int, default None. If given, `ci_low` and `ci_high`
+                        statistics with bootstrap confidence intervals
+                        of group means are added.
+    :return: pd.Dataframe with grouped statistics; groups without any rows
+             are dropped
+    """
+    results = grouped_statistics(codes, len(labels), block, stats)
+    if n_resamples:
+        results["ci_low"], results["ci_high"] = bootstrap_group_means(
+            codes, len(labels), block, n_resamples
+        )
+        stats = stats + ["ci_low", "ci_high"]
+    observed = np.bincount(codes[codes >= 0], minlength=len(labels)) > 0
+    n_columns = 1 if columns is None else len(columns)
+    if "count" in stats and n_columns:
+        # integer counts need their own columns, so the frame is built
+        # from a dictionary (which is much cheaper than casting afterwards)
+        frame_data = {}
+        for i in range(n_columns):
+            for stat in stats:
+                values = results[stat][observed, i]
+                key = stat if columns is None else (columns[i], stat)
+                frame_data[key] = values.astype("int64") if stat == "count" else values
+        return pd.DataFrame(frame_data, index=labels[observed])
+    data = np.stack([results[stat] for stat in stats], axis=-1)[observed]
+    return pd.DataFrame(
+        data.reshape(len(data), -1),
+        index=labels[observed],
+        columns=(
+            pd.Index(stats) if columns is None else pd.MultiIndex.from_product([columns, stats])
+        ),
+    )
+
+
+def column_statistics(block: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Calculate mean, standard deviation, minimum and maximum of every column
+    of a 2-D block, ignoring NaN values (like pandas reductions).
+
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns)
+    :return: dictionary mapping statistic name to array of shape (n_columns,)
+    """
+    valid = ~np.isnan(block)
+    counts = valid.sum(axis=0)
+    has_nan = not valid.all()
+    values = np.where(valid, block, 0.0) if has_nan else block
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = values.sum(axis=0) / counts
+        deviations = values - means
+        if has_nan:
+            deviations[~valid] = 0.0
+        squares = np.einsum("ij,ij->j", deviations, deviations)
+        stds = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+    return {
+        "mean": means,
+        "std": stds,
+        "min": np.fmin.reduce(block, axis=0, initial=np.nan),
+        "max": np.fmax.reduce(block, axis=0, initial=np.nan),
+    }
+
+
+def calculate_basic_statistics(
+    df: pd.DataFrame,
+    for_html: bool = False,
+    by_street: bool = False,
+    backend: str | None = None,
+    street_names: list[str] | None = None,
+):
     """
     Return data frame with basic statistics (mean, std, min, max)
     for each column in a given dataframe.
@@ -10,21 +389,41 @@ def calculate_basic_statistics(df: pd.DataFrame, for_html: bool = False) -> pd.D
     :param df: pd.Dataframe, dataframe for which the statistics are calculated
     :param for_html: bool, default False. If True, returns DataFrames
                      converted to HTML strings.
+    :param by_street: bool, default False. If True, statistics are calculated
+                      only for the street traffic columns, in one NumPy pass
+                      over the street block.
+    :param backend: str, default None. Compute backend, `pandas` or `numpy`;
+                    None for the backend set with `set_backend`.
+    :param street_names: list of street columns (default: STREET_NAMES),
+                         e.g. `City.street_names` of another city
     :return: pd.Dataframe, dataframe with basic statistics
     """
-    means = df.mean().values
-    stds = df.std().values
-    mins = df.min().values
-    maxs = df.max().values
-    stats = {"mean": means, "std": stds, "min": mins, "max": maxs}
-    df = pd.DataFrame(stats, index=df.columns)
+    if by_street or get_backend(backend) == "numpy":
+        columns = get_street_columns(df, street_names) if by_street else df.columns
+        stats = column_statistics(df[columns].to_numpy(dtype=np.float64))
+        df = pd.DataFrame(stats, index=columns)
+    else:
+        means = df.mean().values
+        stds = df.std().values
+        mins = df.min().values
+        maxs = df.max().values
+        stats = {"mean": means, "std": stds, "min": mins, "max": maxs}
+        df = pd.DataFrame(stats, index=df.columns)
     df = round(df, 2)
     if for_html:
         return df.to_html()
     return df
 
 
-def weather_summary(df: pd.DataFrame, for_html: bool = False) -> dict:
+def weather_summary(
+    df: pd.DataFrame,
+    for_html: bool = False,
+    by_street: bool = False,
+    n_resamples: int | None = None,
+    backend: str | None = None,
+    street_names: list[str] | None = None,
+    category_columns: dict[str, str] | None = None,
+) -> dict:
     """
     Create summaries for weather factors:
     - average daily temperature
@@ -34,39 +433,80 @@ def weather_summary(df: pd.DataFrame, for_html: bool = False) -> dict:
     :param df: pd.Dataframe, dataframe containing weather data
     :param for_html: bool, default False. If True, returns dictionary with
                      DataFrames converted to HTML strings.
+    :param by_street: bool, default False. If True, summaries are calculated
+                      for every street at once and returned as DataFrames
+                      with (street, statistic) columns.
+    :param n_resamples: int, default None. If given, 95% bootstrap confidence
+                        intervals of the means (`ci_low`, `ci_high`) are
+                        calculated from `n_resamples` resamples.
+    :param backend: str, default None. Compute backend, `pandas` or `numpy`;
+                    None for the backend set with `set_backend`.
+    :param street_names: list of street columns (default: STREET_NAMES),
+                         e.g. `City.street_names` of another city
+    :param category_columns: dict mapping summary name (`temperature_impact`,
+                             `precipitation_impact`, `air_quality_impact`)
+                             to the column it is based on (default:
+                             Krakow columns), see `City.category_columns`
     :return: dictionary with summary for different weather factors
     """
-    df_copy = df.copy()
-    temp_col = "Średnia temperatura dobowa [°C]"
-    df_copy["temp_category"] = pd.cut(
-        df_copy[temp_col],
-        bins=[-float("inf"), 0, 10, 20, float("inf")],
-        labels=["Cold (<0°C)", "Cool (0-10°C)", "Mild (10-20°C)", "Warm (>20°C)"],
-    )
-
-    precip_col = "Suma dobowa opadów [mm]"
-    df_copy["rain_category"] = pd.cut(
-        df_copy[precip_col],
-        bins=[-float("inf"), 0, 1, 5, float("inf")],
-        labels=["No rain", "Light rain", "Moderate rain", "Heavy rain"],
-    )
-
-    df_copy["air_category"] = pd.cut(
-        df_copy[AIR_COLUMN],
-        bins=[-float("inf"), 20, 50, 80, 110, 150, float("inf")],
-        labels=["Very good", "Good", "Moderate", "Sufficient", "Bad", "Vary bad"],
-    )
-    summary = {
-        "temperature_impact": df_copy.groupby("temp_category", observed=True)[
-            "total_daily_traffic"
-        ].agg(["mean", "std", "count"]),
-        "precipitation_impact": df_copy.groupby("rain_category", observed=True)[
-            "total_daily_traffic"
-        ].agg(["mean", "std", "count"]),
-        "air_quality_impact": df_copy.groupby("air_category", observed=True)[
-            "total_daily_traffic"
-        ].agg(["mean", "std", "count"]),
+    backend = get_backend(backend)
+    category_columns = {
+        "temperature_impact": TEMPERATURE_COLUMN,
+        "precipitation_impact": PRECIPITATION_COLUMN,
+        "air_quality_impact": AIR_COLUMN,
+        **(category_columns or {}),
     }
+    df_copy = df.copy() if backend == "pandas" else df
+    codes, labels = {}, {}
+    for k, (name, bins, category_labels) in WEATHER_CATEGORIES.items():
+        col = category_columns[k]
+        if backend == "numpy":
+            codes[k] = cut_codes(df[col].to_numpy(dtype=np.float64), bins)
+        else:
+            df_copy[name] = pd.cut(df_copy[col], bins=bins, labels=category_labels)
+            codes[k] = df_copy[name].cat.codes.to_numpy()
+        labels[k] = pd.CategoricalIndex(
+            category_labels, categories=category_labels, ordered=True, name=name
+        )
+
+    if by_street:
+        streets = get_street_columns(df, street_names)
+        block = df[streets].to_numpy(dtype=np.float64)
+        summary = {
+            k: grouped_statistics_frame(
+                codes[k], labels[k], block, streets, ["mean", "std", "count"], n_resamples
+            )
+            for k in WEATHER_CATEGORIES
+        }
+    elif backend == "numpy":
+        traffic = df[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+        summary = {
+            k: grouped_statistics_frame(
+                codes[k],
+                labels[k],
+                traffic,
+                None,
+                ["mean", "std", "count"],
+                n_resamples,
+            )
+            for k in WEATHER_CATEGORIES
+        }
+    else:
+        summary = {
+            k: df_copy.groupby(name, observed=True)["total_daily_traffic"].agg(
+                ["mean", "std", "count"]
+            )
+            for k, (name, *_) in WEATHER_CATEGORIES.items()
+        }
+        if n_resamples:
+            traffic = df_copy[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+            for k in WEATHER_CATEGORIES:
+                low, high = bootstrap_group_means(
+                    codes[k], len(labels[k]), traffic, n_resamples
+                )
+                positions = labels[k].get_indexer(summary[k].index)
+                summary[k]["ci_low"] = low[positions, 0]
+                summary[k]["ci_high"] = high[positions, 0]
     for k, v in summary.items():
         summary[k] = round(v, 2)
     if for_html:
@@ -75,36 +515,113 @@ def weather_summary(df: pd.DataFrame, for_html: bool = False) -> dict:
     return summary
 
 
-def calculate_seasonal_trends(df: pd.DataFrame, for_html: bool = False) -> dict:
+def calculate_seasonal_trends(
+    df: pd.DataFrame,
+    for_html: bool = False,
+    by_street: bool = False,
+    n_resamples: int | None = None,
+    hourly_df: pd.DataFrame | None = None,
+    backend: str | None = None,
+    street_names: list[str] | None = None,
+) -> dict:
     """
     Analyze daily cycling traffic depending on the day of the week,
-    month, season and year.
+    month, season and year, and hourly traffic depending on the hour of day
+    (if hourly data are given).
 
     :param df: pd.Dataframe, dataframe containing traffic data
     :param for_html: bool, default False. If True, returns dictionary with
                      DataFrames converted to HTML strings.
+    :param by_street: bool, default False. If True, patterns are calculated
+                      for every street at once and returned as DataFrames
+                      with (street, statistic) columns.
+    :param n_resamples: int, default None. If given, 95% bootstrap confidence
+                        intervals of the means (`ci_low`, `ci_high`) are
+                        calculated from `n_resamples` resamples.
+    :param hourly_df: pd.Dataframe, default None. Hourly street traffic
+                      (e.g. from `load_hourly_bike_data`); if given, hour
+                      of day profiles are added as `hourly_patterns`.
+    :param backend: str, default None. Compute backend, `pandas` or `numpy`;
+                    None for the backend set with `set_backend`.
+    :param street_names: list of street columns (default: STREET_NAMES),
+                         e.g. `City.street_names` of another city
     :return: dictionary with seasonal summaries
     """
-    df_copy = df.copy()
-    df_copy["year"] = df_copy.index.year
-    df_copy["month"] = df_copy.index.month_name()
-    df_copy["day_of_week"] = df_copy.index.day_name()
-    df_copy["season"] = df_copy["month"].map(MONTH_TO_SEASON)
-
-    analysis_results = {
-        "yearly_trends": df_copy.groupby("year")["total_daily_traffic"].agg(
-            ["mean", "sum", "std"]
-        ),
-        "monthly_patterns": df_copy.groupby("month")["total_daily_traffic"].agg(
-            ["mean", "sum", "std"]
-        ),
-        "seasonal_patterns": df_copy.groupby("season")["total_daily_traffic"].agg(
-            ["mean", "sum", "std"]
-        ),
-        "weekly_patterns": df_copy.groupby("day_of_week")["total_daily_traffic"].agg(
-            ["mean", "sum", "std"]
-        ),
+    backend = get_backend(backend)
+    periods = {
+        "yearly_trends": "year",
+        "monthly_patterns": "month",
+        "seasonal_patterns": "season",
+        "weekly_patterns": "day_of_week",
     }
+    if backend == "numpy":
+        groups = calendar_codes(df.index)
+    else:
+        df_copy = df.copy()
+        df_copy["year"] = df_copy.index.year
+        df_copy["month"] = df_copy.index.month_name()
+        df_copy["day_of_week"] = df_copy.index.day_name()
+        df_copy["season"] = df_copy["month"].map(MONTH_TO_SEASON)
+        groups = {}
+        if by_street or n_resamples:
+            for period in periods.values():
+                # np.unique sorts labels like groupby does
+                labels, codes = np.unique(df_copy[period].to_numpy(), return_inverse=True)
+                groups[period] = (codes, pd.Index(labels, name=period))
+
+    if by_street:
+        streets = get_street_columns(df, street_names)
+        block = df[streets].to_numpy(dtype=np.float64)
+        analysis_results = {
+            k: grouped_statistics_frame(
+                *groups[period], block, streets, ["mean", "sum", "std"], n_resamples
+            )
+            for k, period in periods.items()
+        }
+    elif backend == "numpy":
+        traffic = df[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+        analysis_results = {
+            k: grouped_statistics_frame(
+                *groups[period],
+                traffic,
+                None,
+                ["mean", "sum", "std"],
+                n_resamples,
+            )
+            for k, period in periods.items()
+        }
+    else:
+        analysis_results = {
+            k: df_copy.groupby(period)["total_daily_traffic"].agg(["mean", "sum", "std"])
+            for k, period in periods.items()
+        }
+        if n_resamples:
+            traffic = df_copy[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+            for k, period in periods.items():
+                codes, labels = groups[period]
+                low, high = bootstrap_group_means(codes, len(labels), traffic, n_resamples)
+                analysis_results[k]["ci_low"] = low[:, 0]
+                analysis_results[k]["ci_high"] = high[:, 0]
+    if hourly_df is not None:
+        hourly_streets = get_street_columns(hourly_df, street_names)
+        block = hourly_df[hourly_streets].to_numpy(dtype=np.float64)
+        hours = hourly_df.index.hour.to_numpy()
+        labels = pd.Index(np.arange(24), name="hour")
+        if by_street:
+            analysis_results["hourly_patterns"] = grouped_statistics_frame(
+                hours, labels, block, hourly_streets, ["mean", "sum", "std"], n_resamples
+            )
+        else:
+            with np.errstate(invalid="ignore"):
+                total = np.where(np.isnan(block).all(axis=1), np.nan, np.nansum(block, axis=1))
+            analysis_results["hourly_patterns"] = grouped_statistics_frame(
+                hours,
+                labels,
+                total[:, np.newaxis],
+                None,
+                ["mean", "sum", "std"],
+                n_resamples,
+            )
     for k, v in analysis_results.items():
         analysis_results[k] = round(v, 2)
     if for_html:
@@ -113,25 +630,158 @@ def calculate_seasonal_trends(df: pd.DataFrame, for_html: bool = False) -> dict:
     return analysis_results
 
 
-def calculate_weather_correlations(df: pd.DataFrame) -> dict:
+def calculate_weather_correlations(
+    df: pd.DataFrame,
+    by_street: bool = False,
+    backend: str | None = None,
+    street_names: list[str] | None = None,
+) -> dict | pd.DataFrame:
     """
     Calculate correlations between different weather factors
     and total daily bicycle traffic.
 
     :param df: pd.Dataframe, dataframe for which the correlations are calculated
+    :param by_street: bool, default False. If True, returns DataFrame with
+                      correlations of every weather factor (rows) with every
+                      street (columns), calculated as one matrix product.
+    :param backend: str, default None. Compute backend, `pandas` or `numpy`;
+                    None for the backend set with `set_backend`.
+    :param street_names: list of street columns (default: STREET_NAMES),
+                         e.g. `City.street_names` of another city
     :return: dictionary containing correlations coefficients
     """
-    df_copy = df.copy()
+    street_names = STREET_NAMES if street_names is None else street_names
     weather_columns = [
         col
-        for col in df_copy.columns
-        if not (col in STREET_NAMES or col == "total_daily_traffic")
+        for col in df.columns
+        if not (col in street_names or col == "total_daily_traffic")
     ]
 
-    correlations = {}
-    for weather_col in weather_columns:
-        correlations[weather_col] = df_copy["total_daily_traffic"].corr(
-            df_copy[weather_col]
+    if by_street:
+        streets = get_street_columns(df, street_names)
+        weather = df[weather_columns].to_numpy(dtype=np.float64)
+        traffic = df[streets].to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weather = (weather - weather.mean(axis=0)) / weather.std(axis=0)
+            traffic = (traffic - traffic.mean(axis=0)) / traffic.std(axis=0)
+        return pd.DataFrame(
+            weather.T @ traffic / len(df), index=weather_columns, columns=streets
         )
 
+    if get_backend(backend) == "numpy":
+        weather = df[weather_columns].to_numpy(dtype=np.float64)
+        traffic = df[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+        # every pair uses the days on which both values are available
+        valid = ~(np.isnan(weather) | np.isnan(traffic))
+        counts = valid.sum(axis=0)
+        has_nan = not valid.all()
+        if has_nan:
+            weather = np.where(valid, weather, 0.0)
+            traffic = np.where(valid, traffic, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weather = weather - weather.sum(axis=0) / counts
+            traffic = traffic - traffic.sum(axis=0) / counts
+            if has_nan:
+                weather[~valid] = 0.0
+                traffic[~valid] = 0.0
+            values = np.einsum("ij,ij->j", weather, traffic) / np.sqrt(
+                np.einsum("ij,ij->j", weather, weather)
+                * np.einsum("ij,ij->j", traffic, traffic)
+            )
+        correlations = dict(zip(weather_columns, values.tolist()))
+    else:
+        df_copy = df.copy()
+        correlations = {}
+        for weather_col in weather_columns:
+            correlations[weather_col] = df_copy["total_daily_traffic"].corr(
+                df_copy[weather_col]
+            )
+
     return dict(sorted(correlations.items(), key=lambda x: abs(x[1]), reverse=True))
+
+
+def calculate_lagged_weather_correlations(
+    df: pd.DataFrame,
+    max_lag: int = 60,
+    by_street: bool = True,
+    street_names: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Calculate Pearson correlations between weather factors of previous days
+    and bicycle traffic for all lags from 0 to `max_lag` days.
+
+    Correlation for lag L is calculated between the weather factor on day t - L
+    and traffic on day t over all days for which both are available. Cross
+    products for all lags and all column pairs are calculated at once with
+    FFT (O(n log n) per pair), the remaining sums are read from cumulative
+    sums, so row offsets are day lags: rows of the dataframe have to be
+    consecutive days (e.g. not filtered by season), otherwise ValueError
+    is raised.
+
+    :param df: pd.Dataframe, preprocessed dataframe with daily data
+    :param max_lag: int, maximal lag in days
+    :param by_street: bool, default True. If True, correlations are calculated
+                      for every street and for total daily traffic,
+                      otherwise only for total daily traffic.
+    :param street_names: list of street columns (default: STREET_NAMES),
+                         e.g. `City.street_names` of another city
+    :return: pd.Dataframe, tidy table with columns `weather_factor`, `target`,
+             `lag` and `correlation`
+    """
+    n_rows = len(df)
+    if not 0 <= max_lag < n_rows - 1:
+        raise ValueError(
+            f"Invalid max_lag argument. It has to fall in between 0 and {n_rows - 2}, instead got {max_lag}."
+        )
+    steps = pd.DatetimeIndex(df.index).to_series().diff().iloc[1:]
+    gaps = steps[steps != pd.Timedelta(days=1)]
+    if len(gaps):
+        raise ValueError(
+            f"Invalid df argument. Its index has to be a range of consecutive days, instead got {len(gaps)} gaps or unordered dates (first at {gaps.index[0].date()})."
+        )
+    street_names = STREET_NAMES if street_names is None else street_names
+    weather_columns = [
+        col
+        for col in df.columns
+        if not (col in street_names or col == "total_daily_traffic")
+    ]
+    targets = (get_street_columns(df, street_names) if by_street else []) + [
+        "total_daily_traffic"
+    ]
+    weather = df[weather_columns].to_numpy(dtype=np.float64)
+    traffic = df[targets].to_numpy(dtype=np.float64)
+    # centring does not change correlations, but keeps the sums well conditioned
+    weather = weather - weather.mean(axis=0)
+    traffic = traffic - traffic.mean(axis=0)
+
+    # zero padding to n_rows + max_lag avoids circular wrap-around for all lags
+    n_fft = 1 << (n_rows + max_lag - 1).bit_length()
+    weather_fft = np.fft.rfft(weather, n_fft, axis=0)
+    traffic_fft = np.fft.rfft(traffic, n_fft, axis=0)
+    cross = np.fft.irfft(
+        np.conj(weather_fft)[:, :, np.newaxis] * traffic_fft[:, np.newaxis, :],
+        n_fft,
+        axis=0,
+    )[: max_lag + 1]
+
+    lags = np.arange(max_lag + 1)
+    counts = (n_rows - lags)[:, np.newaxis, np.newaxis]
+    # weather is taken from rows [0, n - L), traffic from rows [L, n)
+    weather_sums = np.cumsum(weather, axis=0)[n_rows - lags - 1][:, :, np.newaxis]
+    weather_squares = np.cumsum(weather**2, axis=0)[n_rows - lags - 1][:, :, np.newaxis]
+    traffic_sums = np.cumsum(traffic[::-1], axis=0)[n_rows - lags - 1][:, np.newaxis, :]
+    traffic_squares = np.cumsum(traffic[::-1] ** 2, axis=0)[n_rows - lags - 1][
+        :, np.newaxis, :
+    ]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = cross - weather_sums * traffic_sums / counts
+        weather_variance = weather_squares - weather_sums**2 / counts
+        traffic_variance = traffic_squares - traffic_sums**2 / counts
+        correlations = covariance / np.sqrt(weather_variance * traffic_variance)
+
+    index = pd.MultiIndex.from_product(
+        [weather_columns, targets, lags], names=["weather_factor", "target", "lag"]
+    )
+    return pd.DataFrame(
+        {"correlation": correlations.transpose(1, 2, 0).ravel()}, index=index
+    ).reset_index()
@@ -0,0 +1,196 @@
+import base64
+import calendar
+
+import numpy as np
+import pandas as pd
+from krakowbike.utils import (
+    AIR_COLUMN,
+    MONTH_TO_SEASON,
+    PRECIPITATION_COLUMN,
+    STREET_NAMES,
+    TEMPERATURE_COLUMN,
+)
+
+# quantiles of the seasonal box plots (whiskers at minimum and maximum)
+BOX_QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+WEATHER_FACTORS = [TEMPERATURE_COLUMN, PRECIPITATION_COLUMN]
+
+
+def encode_array(values: np.ndarray, dtype: str = "float32") -> dict:
+    """
+    Encode array as a compact JSON payload: base64 string of its little endian
+    bytes, which the report script reads into a JavaScript typed array.
+
+    :param values: array-like, values to encode
+    :param dtype: str, `float32` or `int32`
+    :return: dict with `dtype`, `shape` and `data`
+    """
+    if dtype not in ("float32", "int32"):
+        raise ValueError(
+            f"Invalid dtype argument. It has to be float32 or int32, instead got {dtype}."
+        )
+    array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {
+        "dtype": dtype,
+        "shape": list(array.shape),
+        "data": base64.b64encode(array.tobytes()).decode("ascii"),
+    }
+
+
+def decode_array(payload: dict) -> np.ndarray:
+    """
+    Decode payload created by `encode_array`.
+
+    :param payload: dict with `dtype`, `shape` and `data`
+    :return: np.ndarray
+    """
+    return np.frombuffer(
+        base64.b64decode(payload["data"]),
+        dtype=np.dtype(payload["dtype"]).newbyteorder("<"),
+    ).reshape(payload["shape"])
+
+
+def grouped_quantiles(
+    codes: np.ndarray, n_groups: int, values: np.ndarray, quantiles: list[float]
+) -> np.ndarray:
+    """
+    Calculate quantiles (with linear interpolation, like `np.quantile`)
+    of values of every group at once, ignoring NaN values.
+
+    Values are sorted by (group, value) once, so the quantiles of all groups
+    are read from the sorted array without a loop over groups.
+
+    :param codes: np.ndarray, integer group code of each value; negative codes
+                  mark values which do not belong to any group
+    :param n_groups: int, number of groups
+    :param values: np.ndarray, 1-D array of values
+    :param quantiles: list of quantiles from 0 to 1
+    :return: np.ndarray of shape (n_groups, n_quantiles); NaN for empty groups
+    """
+    keep = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[keep], values[keep]
+    sorted_values = values[np.lexsort((values, codes))]
+    if not sorted_values.size:
+        return np.full((n_groups, len(quantiles)), np.nan)
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = (np.cumsum(sizes) - sizes)[:, np.newaxis]
+    last = np.maximum(sizes - 1, 0)[:, np.newaxis]
+    positions = last * np.asarray(quantiles)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, last)
+    fraction = positions - lower
+    # empty groups at the end would index past the sorted values
+    lower_values = sorted_values[np.minimum(starts + lower, sorted_values.size - 1)]
+    upper_values = sorted_values[np.minimum(starts + upper, sorted_values.size - 1)]
+    result = lower_values * (1 - fraction) + upper_values * fraction
+    return np.where(sizes[:, np.newaxis] > 0, result, np.nan)
+
+
+def daily_traffic_chart_data(df: pd.DataFrame) -> dict:
+    """
+    Prepare data of the line chart of total daily bicycle traffic.
+
+    :param df: DataFrame with 'total_daily_traffic' column and datetime index
+    :return: dict with `days` (days since 1970-01-01) and `values` payloads
+    """
+    days = np.asarray(df.index, dtype="datetime64[D]").astype(np.int64)
+    return {
+        "days": encode_array(days, "int32"),
+        "values": encode_array(df["total_daily_traffic"].to_numpy(dtype=np.float64)),
+    }
+
+
+def correlation_matrix_chart_data(df: pd.DataFrame) -> dict:
+    """
+    Prepare data of the heatmap of correlations between weather variables
+    and traffic.
+
+    :param df: DataFrame with weather and traffic data (excludes street-specific columns)
+    :return: dict with `labels` and `values` payload of the correlation matrix
+    """
+    cols = [col for col in df.columns if col not in STREET_NAMES]
+    return {"labels": cols, "values": encode_array(df[cols].corr().to_numpy())}
+
+
+def seasonal_traffic_chart_data(df: pd.DataFrame) -> dict:
+    """
+    Prepare data of box plots of total daily traffic by month, day of week
+    and season: quantiles, mean and number of days of every group.
+
+    :param df: DataFrame with datetime index and 'total_daily_traffic' column
+    :return: dict mapping period name to its `labels`, `quantiles`, `mean`
+             and `count` payloads
+    """
+    traffic = df["total_daily_traffic"].to_numpy(dtype=np.float64)
+    months = df.index.month.to_numpy() - 1
+    seasons = list(dict.fromkeys(MONTH_TO_SEASON.values()))
+    month_seasons = np.array(
+        [
+            seasons.index(MONTH_TO_SEASON[month]) if month in MONTH_TO_SEASON else -1
+            for month in calendar.month_name[1:]
+        ]
+    )
+    periods = {
+        "month": (months, list(calendar.month_name)[1:]),
+        "day_of_week": (df.index.dayofweek.to_numpy(), list(calendar.day_name)),
+        "season": (month_seasons[months], seasons),
+    }
+    valid = ~np.isnan(traffic)
+    chart_data = {}
+    for period, (codes, labels) in periods.items():
+        codes = np.where(valid, codes, -1)
+        in_group = codes >= 0
+        counts = np.bincount(codes[in_group], minlength=len(labels))
+        sums = np.bincount(codes[in_group], weights=traffic[in_group], minlength=len(labels))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
+        chart_data[period] = {
+            "labels": labels,
+            "quantiles": encode_array(
+                grouped_quantiles(codes, len(labels), traffic, BOX_QUANTILES)
+            ),
+            "mean": encode_array(means),
+            "count": encode_array(counts, "int32"),
+        }
+    return chart_data
+
+
+def weather_impact_chart_data(df: pd.DataFrame) -> dict:
+    """
+    Prepare data of scatter plots of weather factors against total daily
+    traffic.
+
+    :param df: DataFrame with weather data and 'total_daily_traffic' column
+    :return: dict with `traffic` payload and list of `factors`, each with
+             its `name` and `values` payload
+    """
+    return {
+        "traffic": encode_array(df["total_daily_traffic"].to_numpy(dtype=np.float64)),
+        "factors": [
+            {"name": factor, "values": encode_array(df[factor].to_numpy(dtype=np.float64))}
+            for factor in WEATHER_FACTORS + [AIR_COLUMN]
+        ],
+    }
+
+
+def lagged_correlations_chart_data(
+    lagged_correlations: pd.DataFrame, target: str = "total_daily_traffic"
+) -> dict:
+    """
+    Prepare data of the heatmap of correlations between lagged weather
+    factors and traffic.
+
+    :param lagged_correlations: Tidy table returned by `calculate_lagged_weather_correlations`
+    :param target: Traffic column (street or 'total_daily_traffic') which should be plotted
+    :return: dict with `target`, `factors`, `lags` and `values` payload
+             of shape (n_factors, n_lags)
+    """
+    table = lagged_correlations[lagged_correlations["target"] == target].pivot(
+        index="weather_factor", columns="lag", values="correlation"
+    )
+    return {
+        "target": target,
+        "factors": list(table.index),
+        "lags": table.columns.tolist(),
+        "values": encode_array(table.to_numpy()),
+    }
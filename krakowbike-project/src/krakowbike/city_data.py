@@ -0,0 +1,553 @@
+import glob
+import inspect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from krakowbike.analyze_data import (
+    WEATHER_CATEGORIES,
+    calendar_codes,
+    cut_codes,
+    grouped_statistics,
+    grouped_statistics_frame,
+)
+from krakowbike.load_data import (
+    BIKE_COLUMN_AGGREGATIONS,
+    WEATHER_COLUMN_AGGREGATIONS,
+    load_data,
+)
+from krakowbike.preprocess_data import check_time_period, preprocess_dataset
+from krakowbike.report_build import file_digest, module_digest
+from krakowbike.store_data import (
+    load_preprocessed_dataset,
+    read_metadata,
+    save_preprocessed_dataset,
+)
+from krakowbike.utils import (
+    AIR_COLUMN,
+    PRECIPITATION_COLUMN,
+    STREET_NAMES,
+    TEMPERATURE_COLUMN,
+)
+
+# columns which every city has; in the stacked layout they are renamed
+# to their role, so the same column holds e.g. temperature of all cities
+SHARED_ROLES = ("temperature", "precipitation", "air_quality")
+STACKED_INDEX_NAMES = ["city", "date"]
+
+
+class DataSource:
+    """
+    Group of CSV files of a city holding one kind of data
+    (e.g. bicycle counters or weather).
+    """
+
+    def __init__(
+        self,
+        dataset: str,
+        daily_aggregation: str = "sum",
+        column_aggregations: dict[str, str] | None = None,
+    ):
+        """
+        :param dataset: str, pattern to match in filenames
+        :param daily_aggregation: str, `sum` or `mean`; aggregation of hourly
+                                  measurements to daily values
+        :param column_aggregations: dict mapping columns to `sum` or `mean`,
+                                    overriding `daily_aggregation`
+        """
+        column_aggregations = dict(column_aggregations or {})
+        for value in [daily_aggregation, *column_aggregations.values()]:
+            if value not in ("sum", "mean"):
+                raise ValueError(
+                    f"Invalid daily_aggregation argument. It has to be `sum` or `mean`, instead got {value}."
+                )
+        self.dataset = dataset
+        self.daily_aggregation = daily_aggregation
+        self.column_aggregations = column_aggregations
+
+    def load(self, dir_path: str) -> pd.DataFrame:
+        """
+        Load files of the source from a directory with `load_data`.
+        """
+        return load_data(
+            dir_path, self.dataset, self.daily_aggregation, self.column_aggregations
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "dataset": self.dataset,
+            "daily_aggregation": self.daily_aggregation,
+            "column_aggregations": self.column_aggregations,
+        }
+
+
+class City:
+    """
+    Description of the data of a city: where its files are and which roles
+    (street counter, air quality station, temperature, precipitation)
+    its columns play. Columns without a role are treated as weather factors.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        data_dir: str,
+        street_names: list[str],
+        air_columns: list[str],
+        temperature_column: str = TEMPERATURE_COLUMN,
+        precipitation_column: str = PRECIPITATION_COLUMN,
+        sources: dict[str, DataSource] | None = None,
+    ):
+        """
+        :param name: str, name of the city (its key in the registry)
+        :param data_dir: str, directory with the CSV files, relative
+                         to the project path
+        :param street_names: list of street traffic columns
+        :param air_columns: list of air quality station columns; the first one
+                            is the main station used by the air quality summary
+        :param temperature_column: str, average daily temperature column
+        :param precipitation_column: str, total daily rainfall column
+        :param sources: dict mapping source name to `DataSource`, in the order
+                        of merging (default: `powietrze`, `rowery` and
+                        `pogoda` files like the Krakow data; hourly
+                        temperatures of `rowery` files are averaged)
+        """
+        if not street_names or not air_columns:
+            raise ValueError(
+                f"Invalid street_names/air_columns argument. City {name} has to have at least one street and one air quality station."
+            )
+        self.name = name
+        self.data_dir = data_dir
+        self.street_names = list(street_names)
+        self.air_columns = list(air_columns)
+        self.temperature_column = temperature_column
+        self.precipitation_column = precipitation_column
+        self.sources = (
+            {
+                "air": DataSource("powietrze", "mean"),
+                "bike": DataSource(
+                    "rowery",
+                    "sum",
+                    {**BIKE_COLUMN_AGGREGATIONS, temperature_column: "mean"},
+                ),
+                "weather": DataSource("pogoda", "mean", WEATHER_COLUMN_AGGREGATIONS),
+            }
+            if sources is None
+            else dict(sources)
+        )
+
+    def shared_columns(self) -> dict[str, str]:
+        """
+        Return mapping of the city columns to the shared role columns
+        of the stacked layout.
+        """
+        return {
+            self.temperature_column: "temperature",
+            self.precipitation_column: "precipitation",
+            self.air_columns[0]: "air_quality",
+        }
+
+    def category_columns(self) -> dict[str, str]:
+        """
+        Return columns the weather summary categories of the city are based
+        on, to be passed as `category_columns` to `weather_summary`.
+        """
+        return {
+            "temperature_impact": self.temperature_column,
+            "precipitation_impact": self.precipitation_column,
+            "air_quality_impact": self.air_columns[0],
+        }
+
+    def load(
+        self,
+        project_path: str = ".",
+        start_date: str = "2017-01-01",
+        end_date: str = "2021-12-31",
+        imputation: str = "mean",
+        store_dir: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load and preprocess data of the city with `preprocess_dataset`.
+
+        With `store_dir`, the preprocessed data of the whole period is saved
+        once as a memory-mapped dataset (see `save_preprocessed_dataset`)
+        and later calls, also from other processes, open it zero-copy
+        instead of preprocessing again. The store is rebuilt when the data
+        files, the imputation strategy or the preprocessing code change.
+        Create the store once before starting worker processes.
+
+        :param project_path: str, path to the directory containing `data_dir`
+        :param start_date: str, start date for filtering
+        :param end_date: str, end date for filtering
+        :param imputation: str, strategy of filling missing values
+                           (see `impute_missing_values`)
+        :param store_dir: str, default None. Path to the dataset directory
+                          used as a cache of the preprocessed data.
+        :return: pd.Dataframe, preprocessed dataframe with the city columns
+                 (read-only and memory-mapped with `store_dir`)
+        """
+        if store_dir is not None:
+            check_time_period(start_date, end_date)
+            source = self.store_source(project_path, imputation)
+            try:
+                stored = read_metadata(store_dir).get("source")
+            except FileNotFoundError:
+                stored = None
+            if stored != source:
+                save_preprocessed_dataset(
+                    self.load(project_path, imputation=imputation), store_dir, source
+                )
+            return load_preprocessed_dataset(store_dir, start_date, end_date)
+
+        path_to_data = os.path.join(project_path, self.data_dir)
+        return preprocess_dataset(
+            *(source.load(path_to_data) for source in self.sources.values()),
+            start_date=start_date,
+            end_date=end_date,
+            street_names=self.street_names,
+            imputation=imputation,
+        )
+
+    def store_source(self, project_path: str = ".", imputation: str = "mean") -> dict:
+        """
+        Describe the inputs of the preprocessed data of the city: its
+        description, digests of the data files and of the loading and
+        preprocessing code, and the imputation strategy.
+        """
+        return {
+            "city": self.to_dict(),
+            "files": {
+                os.path.relpath(path, project_path): file_digest(path)
+                for path in self.data_files(project_path)
+            },
+            "code": [
+                module_digest(inspect.getmodule(function))
+                for function in (load_data, preprocess_dataset)
+            ],
+            "imputation": imputation,
+        }
+
+    def data_files(self, project_path: str = ".") -> list[str]:
+        """
+        Return sorted paths to the raw data files read by `load`.
+        """
+        path_to_data = os.path.join(project_path, self.data_dir)
+        return sorted(
+            {
+                path
+                for source in self.sources.values()
+                for path in glob.glob(f"{path_to_data}/*{source.dataset}*")
+            }
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "data_dir": self.data_dir,
+            "street_names": self.street_names,
+            "air_columns": self.air_columns,
+            "temperature_column": self.temperature_column,
+            "precipitation_column": self.precipitation_column,
+            "sources": {name: source.to_dict() for name, source in self.sources.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "City":
+        """
+        Create city from its description, e.g. an entry of a registry file
+        (see `load_city_registry`).
+        """
+        config = dict(config)
+        if "sources" in config:
+            config["sources"] = {
+                name: DataSource(**source) for name, source in config["sources"].items()
+            }
+        return cls(**config)
+
+
+CITIES: dict[str, City] = {}
+
+
+def register_city(city: City) -> None:
+    """
+    Add city to the registry, replacing a city with the same name.
+    """
+    CITIES[city.name] = city
+
+
+def get_city(name: str) -> City:
+    """
+    Return registered city of a given name.
+    """
+    if name not in CITIES:
+        raise ValueError(
+            f"Invalid name argument. It has to be one of {', '.join(CITIES)}, instead got {name}."
+        )
+    return CITIES[name]
+
+
+def load_city_registry(path: str) -> list[str]:
+    """
+    Register cities described in a JSON file: a list of objects with
+    the arguments of `City` (`sources` as objects with `dataset`,
+    `daily_aggregation` and optionally `column_aggregations`).
+
+    :param path: str, path to the JSON file
+    :return: list of names of the registered cities
+    """
+    with open(path, encoding="utf-8") as f:
+        cities = [City.from_dict(config) for config in json.load(f)]
+    for city in cities:
+        register_city(city)
+    return [city.name for city in cities]
+
+
+register_city(City("krakow", "krakow_data", STREET_NAMES, [AIR_COLUMN]))
+
+
+def stack_city_frames(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Stack preprocessed dataframes of registered cities into one dataframe
+    indexed by (city, date). Role columns of the cities are renamed
+    to `temperature`, `precipitation` and `air_quality`; other columns keep
+    their names and are NaN for cities which do not have them.
+
+    :param frames: dict mapping city name to its preprocessed dataframe
+    :return: pd.Dataframe, stacked dataframe
+    """
+    renamed = [
+        df.rename(columns=get_city(name).shared_columns()) for name, df in frames.items()
+    ]
+    stacked = pd.concat(renamed, axis=0, keys=list(frames), names=STACKED_INDEX_NAMES)
+    first = list(SHARED_ROLES) + ["total_daily_traffic"]
+    return stacked[first + [col for col in stacked.columns if col not in first]]
+
+
+def load_cities(
+    names: list[str] | None = None,
+    project_path: str = ".",
+    start_date: str = "2017-01-01",
+    end_date: str = "2021-12-31",
+    imputation: str = "mean",
+) -> pd.DataFrame:
+    """
+    Load and preprocess data of several cities into the stacked
+    (city, date) layout.
+
+    :param names: list of names of registered cities (default: all)
+    :param project_path: str, path to the directory containing data
+                         directories of the cities
+    :param start_date: str, start date for filtering
+    :param end_date: str, end date for filtering
+    :param imputation: str, strategy of filling missing values
+                       (see `impute_missing_values`)
+    :return: pd.Dataframe, stacked dataframe (see `stack_city_frames`)
+    """
+    names = list(CITIES) if names is None else names
+    return stack_city_frames(
+        {
+            name: get_city(name).load(project_path, start_date, end_date, imputation)
+            for name in names
+        }
+    )
+
+
+def city_frame(stacked: pd.DataFrame, name: str) -> pd.DataFrame:
+    """
+    Select data of one city from the stacked layout, with the original
+    names of its columns. Single city analyses default to Krakow columns,
+    so for other cities pass `street_names=city.street_names` (and
+    `category_columns=city.category_columns()` to `weather_summary`).
+
+    :param stacked: pd.Dataframe, stacked dataframe
+    :param name: str, name of the city
+    :return: pd.Dataframe indexed by date
+    """
+    df = stacked.xs(name, level="city")
+    roles = {role: col for col, role in get_city(name).shared_columns().items()}
+    return df.dropna(axis=1, how="all").rename(columns=roles)
+
+
+def stacked_street_columns(stacked: pd.DataFrame) -> list[str]:
+    """
+    Return names of street traffic columns of the registered cities present
+    in the stacked dataframe.
+    """
+    streets = dict.fromkeys(
+        street for city in CITIES.values() for street in city.street_names
+    )
+    return [col for col in streets if col in stacked.columns]
+
+
+def city_codes(stacked: pd.DataFrame) -> tuple[np.ndarray, pd.Index]:
+    """
+    Return city code of each row of the stacked dataframe and city labels.
+    """
+    return (
+        stacked.index.codes[0].astype(np.intp),
+        stacked.index.levels[0].rename("city"),
+    )
+
+
+def city_group_codes(
+    cities: np.ndarray, city_labels: pd.Index, codes: np.ndarray, labels: pd.Index
+) -> tuple[np.ndarray, pd.MultiIndex]:
+    """
+    Combine city codes with codes of other groups (e.g. months), so groups
+    of all cities are aggregated in one pass.
+
+    :return: (city, group) code of each row and (city, group) labels
+    """
+    combined = np.where(codes >= 0, cities * len(labels) + codes, -1)
+    return combined, pd.MultiIndex.from_product([city_labels, labels])
+
+
+def calculate_city_statistics(
+    stacked: pd.DataFrame, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Return basic statistics (mean, std, min, max) of columns of every city,
+    calculated in one pass over the stacked dataframe.
+
+    :param stacked: pd.Dataframe, stacked dataframe
+    :param columns: list of columns (default: all)
+    :return: pd.Dataframe indexed by (city, column); columns which a city
+             does not have are skipped
+    """
+    columns = list(stacked.columns) if columns is None else columns
+    codes, labels = city_codes(stacked)
+    block = stacked[columns].to_numpy(dtype=np.float64)
+    stats = grouped_statistics(codes, len(labels), block, ["mean", "std", "count"])
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes, minlength=len(labels))
+    present = sizes > 0
+    starts = (np.cumsum(sizes) - sizes)[present]
+    for stat, reduce in (("min", np.fmin), ("max", np.fmax)):
+        stats[stat] = np.full((len(labels), len(columns)), np.nan)
+        if starts.size:
+            stats[stat][present] = reduce.reduceat(block[order], starts, axis=0)
+    data = np.stack([stats[stat] for stat in ["mean", "std", "min", "max"]], axis=-1)
+    df = pd.DataFrame(
+        data.reshape(-1, 4),
+        index=pd.MultiIndex.from_product([labels, columns], names=["city", "column"]),
+        columns=["mean", "std", "min", "max"],
+    )
+    return round(df[stats["count"].ravel() > 0], 2)
+
+
+def calculate_city_seasonal_trends(
+    stacked: pd.DataFrame, n_resamples: int | None = None
+) -> dict:
+    """
+    Analyze total daily traffic of every city depending on the day of
+    the week, month, season and year (like `calculate_seasonal_trends`),
+    grouping rows by (city, period) in one pass per period.
+
+    :param stacked: pd.Dataframe, stacked dataframe
+    :param n_resamples: int, default None. If given, 95% bootstrap confidence
+                        intervals of the means (`ci_low`, `ci_high`) are
+                        calculated from `n_resamples` resamples.
+    :return: dictionary with DataFrames indexed by (city, period)
+    """
+    periods = {
+        "yearly_trends": "year",
+        "monthly_patterns": "month",
+        "seasonal_patterns": "season",
+        "weekly_patterns": "day_of_week",
+    }
+    cities, city_labels = city_codes(stacked)
+    groups = calendar_codes(stacked.index.get_level_values("date"))
+    traffic = stacked[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+    return {
+        k: round(
+            grouped_statistics_frame(
+                *city_group_codes(cities, city_labels, *groups[period]),
+                traffic,
+                None,
+                ["mean", "sum", "std"],
+                n_resamples,
+            ),
+            2,
+        )
+        for k, period in periods.items()
+    }
+
+
+def city_weather_summary(stacked: pd.DataFrame, n_resamples: int | None = None) -> dict:
+    """
+    Summarize total daily traffic of every city in temperature, rainfall
+    and air quality categories (like `weather_summary`), grouping rows
+    by (city, category) in one pass per weather factor.
+
+    :param stacked: pd.Dataframe, stacked dataframe
+    :param n_resamples: int, default None. If given, 95% bootstrap confidence
+                        intervals of the means (`ci_low`, `ci_high`) are
+                        calculated from `n_resamples` resamples.
+    :return: dictionary with DataFrames indexed by (city, category)
+    """
+    category_columns = {
+        "temperature_impact": "temperature",
+        "precipitation_impact": "precipitation",
+        "air_quality_impact": "air_quality",
+    }
+    cities, city_labels = city_codes(stacked)
+    traffic = stacked[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+    summary = {}
+    for k, (name, bins, category_labels) in WEATHER_CATEGORIES.items():
+        codes = cut_codes(stacked[category_columns[k]].to_numpy(dtype=np.float64), bins)
+        labels = pd.CategoricalIndex(
+            category_labels, categories=category_labels, ordered=True, name=name
+        )
+        summary[k] = round(
+            grouped_statistics_frame(
+                *city_group_codes(cities, city_labels, codes, labels),
+                traffic,
+                None,
+                ["mean", "std", "count"],
+                n_resamples,
+            ),
+            2,
+        )
+    return summary
+
+
+def calculate_city_weather_correlations(stacked: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate correlations between weather factors and total daily traffic
+    of every city. Sums of all cities and factors are grouped by city
+    in two passes (means, then centred cross products); every pair uses
+    the days on which both values are available.
+
+    :param stacked: pd.Dataframe, stacked dataframe
+    :return: pd.Dataframe with weather factors as rows and cities as columns;
+             NaN for factors which a city does not have
+    """
+    streets = set(stacked_street_columns(stacked))
+    weather_columns = [
+        col for col in stacked.columns if not (col in streets or col == "total_daily_traffic")
+    ]
+    cities, city_labels = city_codes(stacked)
+    weather = stacked[weather_columns].to_numpy(dtype=np.float64)
+    traffic = stacked[["total_daily_traffic"]].to_numpy(dtype=np.float64)
+    valid = ~(np.isnan(weather) | np.isnan(traffic))
+    weather = np.where(valid, weather, np.nan)
+    traffic = np.where(valid, traffic, np.nan)
+
+    n_columns = len(weather_columns)
+    means = grouped_statistics(
+        cities, len(city_labels), np.hstack([weather, traffic]), ["mean"]
+    )["mean"]
+    weather = weather - means[cities, :n_columns]
+    traffic = traffic - means[cities, n_columns:]
+    sums = grouped_statistics(
+        cities,
+        len(city_labels),
+        np.hstack([weather * traffic, weather**2, traffic**2]),
+        ["sum"],
+    )["sum"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlations = sums[:, :n_columns] / np.sqrt(
+            sums[:, n_columns : 2 * n_columns] * sums[:, 2 * n_columns :]
+        )
+    return pd.DataFrame(correlations.T, index=weather_columns, columns=city_labels)
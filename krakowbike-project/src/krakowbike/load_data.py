@@ -1,30 +1,205 @@
 import glob
 from functools import partial
 
+import numpy as np
 import pandas as pd
+from krakowbike.utils import PRECIPITATION_COLUMN, TEMPERATURE_COLUMN
 
+HOURS_PER_DAY = 24
+# temperature columns of the bicycle files, their hourly values are averaged
+# (traffic counts and precipitation are summed)
+BIKE_COLUMN_AGGREGATIONS = {
+    "Maksymalna temperatura dobowa [°C]": "mean",
+    "Minimalna temperatura dobowa [°C]": "mean",
+    TEMPERATURE_COLUMN: "mean",
+    "Temperatura minimalna przy gruncie [°C]": "mean",
+}
+# weather columns which are totals, so their hourly values are summed
+# (other weather measurements are averaged)
+WEATHER_COLUMN_AGGREGATIONS = {
+    PRECIPITATION_COLUMN: "sum",
+    "suma opadu dzień  [mm]": "sum",
+    "suma opadu noc   [mm]": "sum",
+}
 
-def load_data(dir_path: str, dataset: str) -> pd.DataFrame:
+
+def is_hourly_index(index: pd.Index) -> bool:
+    """
+    Check if index contains timestamps with time of day (hourly data)
+    instead of dates.
+
+    :param index: pd.Index, index of a loaded CSV file
+    :return: bool, True for hourly data
+    """
+    return len(index) > 0 and len(str(index[0]).strip()) > len("YYYY-MM-DD")
+
+
+def to_numeric_block(df: pd.DataFrame) -> np.ndarray:
+    """
+    Convert dataframe to 2-D float64 array; values which are not numbers
+    (e.g. `-` used for missing measurements) become NaN.
+
+    :param df: pd.Dataframe, dataframe with mixed data types
+    :return: np.ndarray of shape (n_rows, n_columns)
+    """
+    non_numeric = {
+        col: pd.to_numeric(df[col], errors="coerce")
+        for col in df.columns
+        if df[col].dtype.kind not in "biuf"
+    }
+    if non_numeric:
+        df = df.assign(**non_numeric)
+    return df.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def resample_to_daily(
+    df: pd.DataFrame,
+    aggregation: str = "sum",
+    column_aggregations: dict[str, str] | None = None,
+) -> pd.DataFrame:
+    """
+    Aggregate hourly measurements to daily values, ignoring missing values
+    (days without any measurement of a column get NaN).
+
+    Rows are assigned to days by the integer day offset of their timestamp.
+    Complete series of consecutive hours starting at midnight are aggregated
+    by reshaping to (days, 24, columns), other data (gaps, duplicates,
+    unsorted rows) with a single `np.bincount` over (day, column) pairs.
+
+    :param df: pd.Dataframe, hourly data indexed by timestamps
+               (strings or datetimes)
+    :param aggregation: str, `sum` (e.g. for traffic counts) or `mean`
+                        (e.g. for temperature or air quality)
+    :param column_aggregations: dict mapping columns to `sum` or `mean`,
+                                overriding `aggregation` (e.g. to sum
+                                precipitation among averaged weather columns)
+    :return: pd.Dataframe, daily data indexed by `YYYY-MM-DD` strings
+    """
+    column_aggregations = column_aggregations or {}
+    for name, value in [("aggregation", aggregation)] + [
+        ("column_aggregations", value) for value in column_aggregations.values()
+    ]:
+        if value not in ("sum", "mean"):
+            raise ValueError(
+                f"Invalid {name} argument. It has to be `sum` or `mean`, instead got {value}."
+            )
+    is_sum = np.array(
+        [column_aggregations.get(col, aggregation) == "sum" for col in df.columns], dtype=bool
+    )
+    hours = (
+        pd.to_datetime(df.index, format="ISO8601")
+        .to_numpy()
+        .astype("datetime64[h]")
+        .astype(np.int64)
+    )
+    values = to_numeric_block(df)
+    n_rows, n_columns = values.shape
+    valid = ~np.isnan(values)
+    values = np.where(valid, values, 0.0)
+    if n_rows == 0:
+        first_day, n_days = 0, 0
+        sums = counts = np.empty((0, n_columns))
+    elif (
+        n_rows % HOURS_PER_DAY == 0
+        and hours[0] % HOURS_PER_DAY == 0
+        and np.array_equal(np.diff(hours), np.ones(n_rows - 1, dtype=np.int64))
+    ):
+        first_day, n_days = hours[0] // HOURS_PER_DAY, n_rows // HOURS_PER_DAY
+        sums = values.reshape(n_days, HOURS_PER_DAY, n_columns).sum(axis=1)
+        counts = valid.reshape(n_days, HOURS_PER_DAY, n_columns).sum(axis=1)
+    else:
+        days = hours // HOURS_PER_DAY
+        first_day = days.min()
+        n_days = days.max() - first_day + 1
+        cells = ((days - first_day) * n_columns)[:, np.newaxis] + np.arange(n_columns)
+        sums = np.bincount(
+            cells.ravel(), weights=values.ravel(), minlength=n_days * n_columns
+        ).reshape(n_days, n_columns)
+        counts = np.bincount(
+            cells.ravel(), weights=valid.ravel(), minlength=n_days * n_columns
+        ).reshape(n_days, n_columns)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily = np.where(is_sum, sums, sums / counts)
+    daily = np.where(counts > 0, daily, np.nan)
+    dates = np.arange(first_day, first_day + n_days).astype("datetime64[D]")
+    return pd.DataFrame(
+        daily,
+        index=pd.Index(np.datetime_as_string(dates, unit="D"), name=df.index.name),
+        columns=df.columns,
+    )
+
+
+def load_data(
+    dir_path: str,
+    dataset: str,
+    daily_aggregation: str = "sum",
+    column_aggregations: dict[str, str] | None = None,
+) -> pd.DataFrame:
     """
     Load and concatenate CSV files matching a dataset pattern from a directory.
 
     Searches for CSV files containing the specified dataset name in the filename,
     loads them with 'Data' column as index, and concatenates them into a single
-    DataFrame.
+    DataFrame. Files with hourly measurements are aggregated to daily values
+    with `resample_to_daily`.
 
     :param dir_path: str, path to the directory containing CSV files to load.
     :param dataset: str, pattern to match in filenames.
+    :param daily_aggregation: str, `sum` or `mean`; aggregation of hourly
+                              measurements to daily values.
+    :param column_aggregations: dict mapping columns to `sum` or `mean`,
+                                overriding `daily_aggregation`.
     :return: pd.DataFrame, concatenated DataFrame from all matching CSV files,
              with 'Data' column as index.
     """
     fpaths = glob.glob(f"{dir_path}/*{dataset}*")
-    returned_df = pd.concat(
-        [pd.read_csv(file_path, sep=",", index_col="Data") for file_path in fpaths],
-        axis=0,
-    )
+    dataframes = []
+    for file_path in fpaths:
+        df = pd.read_csv(file_path, sep=",", index_col="Data")
+        if is_hourly_index(df.index):
+            df = resample_to_daily(df, daily_aggregation, column_aggregations)
+        dataframes.append(df)
+    returned_df = pd.concat(dataframes, axis=0)
     return returned_df
 
 
-load_bike_data = partial(load_data, dataset="rowery")
-load_weather_data = partial(load_data, dataset="pogoda")
-load_air_data = partial(load_data, dataset="powietrze")
+def load_hourly_data(dir_path: str, dataset: str) -> pd.DataFrame:
+    """
+    Load and concatenate hourly CSV files matching a dataset pattern,
+    keeping the hourly resolution (e.g. for hour of day profiles).
+
+    :param dir_path: str, path to the directory containing CSV files to load.
+    :param dataset: str, pattern to match in filenames.
+    :return: pd.DataFrame, float64 DataFrame sorted by its DatetimeIndex;
+             files with daily data are skipped.
+    """
+    dataframes = []
+    for file_path in glob.glob(f"{dir_path}/*{dataset}*"):
+        df = pd.read_csv(file_path, sep=",", index_col="Data")
+        if is_hourly_index(df.index):
+            dataframes.append(
+                pd.DataFrame(
+                    to_numeric_block(df),
+                    index=pd.DatetimeIndex(
+                        pd.to_datetime(df.index, format="ISO8601"), name=df.index.name
+                    ),
+                    columns=df.columns,
+                )
+            )
+    if not dataframes:
+        raise ValueError(f"No hourly `{dataset}` files found in {dir_path}.")
+    return pd.concat(dataframes, axis=0).sort_index()
+
+
+load_bike_data = partial(
+    load_data, dataset="rowery", column_aggregations=BIKE_COLUMN_AGGREGATIONS
+)
+load_weather_data = partial(
+    load_data,
+    dataset="pogoda",
+    daily_aggregation="mean",
+    column_aggregations=WEATHER_COLUMN_AGGREGATIONS,
+)
+load_air_data = partial(load_data, dataset="powietrze", daily_aggregation="mean")
+load_hourly_bike_data = partial(load_hourly_data, dataset="rowery")
@@ -0,0 +1,281 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+from krakowbike.utils import STREET_NAMES
+
+RIDGE_ALPHA = 10.0
+
+
+def get_model_columns(
+    df: pd.DataFrame, street_names: list[str] | None = None
+) -> tuple[list[str], list[str]]:
+    """
+    Split columns of a preprocessed dataframe into weather features
+    (weather and air quality columns) and traffic targets (every street
+    and total daily traffic).
+
+    :param df: pd.Dataframe, output of `preprocess_dataset`
+    :param street_names: list of street columns (default: STREET_NAMES),
+                         e.g. `City.street_names` of another city
+    :return: list of weather columns and list of target columns
+    """
+    street_names = STREET_NAMES if street_names is None else street_names
+    weather_columns = [
+        col
+        for col in df.columns
+        if not (col in street_names or col == "total_daily_traffic")
+    ]
+    targets = [col for col in street_names if col in df.columns] + [
+        "total_daily_traffic"
+    ]
+    return weather_columns, targets
+
+
+def build_design_matrix(
+    df: pd.DataFrame, weather_columns: list[str]
+) -> tuple[np.ndarray, list[str]]:
+    """
+    Build matrix of model features: weather columns followed by day of week
+    and month indicators (Monday and January are the reference levels).
+
+    :param df: pd.Dataframe, dataframe with datetime index
+    :param weather_columns: list of weather columns used as features
+    :return: 2-D array of shape (n_rows, n_features) and list of feature names
+    """
+    days = df.index.dayofweek.to_numpy()
+    months = df.index.month.to_numpy()
+    features = np.concatenate(
+        [
+            df[weather_columns].to_numpy(dtype=np.float64),
+            days[:, np.newaxis] == np.arange(1, 7),
+            months[:, np.newaxis] == np.arange(2, 13),
+        ],
+        axis=1,
+        dtype=np.float64,
+    )
+    names = (
+        weather_columns
+        + [f"day_of_week: {calendar.day_name[day]}" for day in range(1, 7)]
+        + [f"month: {calendar.month_name[month]}" for month in range(2, 13)]
+    )
+    return features, names
+
+
+def solve_normal_equations(
+    gram: np.ndarray, cross: np.ndarray, alphas: np.ndarray
+) -> np.ndarray:
+    """
+    Solve ridge normal equations (X^T X + alpha * P) B = X^T Y for a batch
+    of Gram matrices and penalties at once. P is the identity matrix without
+    the penalty on the intercept (first feature). Pseudo-inverse is used,
+    so singular systems (e.g. months missing from the data) get
+    the minimum-norm solution instead of an error.
+
+    :param gram: np.ndarray, Gram matrices of shape (..., n_features, n_features)
+    :param cross: np.ndarray, cross products of shape (..., n_features, n_targets)
+    :param alphas: np.ndarray, ridge penalties broadcastable to the batch shape
+    :return: coefficients of shape (..., n_features, n_targets)
+    """
+    penalty = np.eye(gram.shape[-1])
+    penalty[0, 0] = 0.0
+    alphas = np.asarray(alphas, dtype=np.float64)[..., np.newaxis, np.newaxis]
+    return np.linalg.pinv(gram + alphas * penalty, hermitian=True) @ cross
+
+
+class LinearTrafficModel:
+    """
+    Ordinary (alpha = 0) or ridge least squares model of the traffic of every
+    street and of total daily traffic, fitted on weather and calendar
+    features.
+
+    All targets share one standardised design matrix, so the model is fitted
+    with a single solve and predictions for all targets are one matrix
+    product. Rows with missing values are skipped when fitting.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        alpha: float = 0.0,
+        street_names: list[str] | None = None,
+    ):
+        """
+        :param df: pd.Dataframe, output of `preprocess_dataset`
+        :param alpha: float, ridge penalty on standardised coefficients
+        :param street_names: list of street columns (default: STREET_NAMES)
+        """
+        if alpha < 0:
+            raise ValueError(f"Invalid alpha argument. It has to be non-negative, instead got {alpha}.")
+        self.alpha = alpha
+        self.weather_columns, self.targets = get_model_columns(df, street_names)
+        features, self.features = build_design_matrix(df, self.weather_columns)
+        values = df[self.targets].to_numpy(dtype=np.float64)
+        complete = ~(np.isnan(features).any(axis=1) | np.isnan(values).any(axis=1))
+        features, values = features[complete], values[complete]
+        if not len(values):
+            raise ValueError("Dataframe does not contain any complete rows.")
+        self.n_rows = len(values)
+
+        self._mean = features.mean(axis=0)
+        std = features.std(axis=0)
+        self._scale = np.where(std > 0, std, 1.0)
+        design = self.design_matrix(features)
+        self._coefficients = solve_normal_equations(
+            design.T @ design, design.T @ values, alpha
+        )
+
+    def design_matrix(self, features: np.ndarray) -> np.ndarray:
+        """
+        Standardise features (with the statistics of the training data)
+        and prepend the intercept column.
+        """
+        design = np.empty((len(features), features.shape[1] + 1))
+        design[:, 0] = 1.0
+        np.divide(features - self._mean, self._scale, out=design[:, 1:])
+        return design
+
+    @property
+    def coefficients(self) -> pd.DataFrame:
+        """
+        Coefficients of standardised features (change of traffic per one
+        standard deviation of a feature) for every target.
+        """
+        return pd.DataFrame(
+            self._coefficients, index=["intercept"] + self.features, columns=self.targets
+        )
+
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict traffic of all targets for every row of a dataframe.
+
+        :param df: pd.Dataframe, dataframe with datetime index and weather columns
+        :return: pd.Dataframe with predictions, one column per target
+        """
+        features, _ = build_design_matrix(df, self.weather_columns)
+        return pd.DataFrame(
+            self.design_matrix(features) @ self._coefficients,
+            index=df.index,
+            columns=self.targets,
+        )
+
+
+def cross_validate_model(
+    df: pd.DataFrame,
+    alphas: list[float] = (0.0, RIDGE_ALPHA),
+    n_folds: int = 5,
+    street_names: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Estimate prediction errors of `LinearTrafficModel` with k-fold
+    cross-validation for several ridge penalties.
+
+    Folds are contiguous blocks of days. Gram matrices and cross products
+    of every fold are calculated once; training system of a fold is the total
+    minus the part of the held-out fold, and systems of all folds and
+    penalties are solved in one batched call. Features are standardised
+    with the mean and standard deviation of the training part of each fold
+    (read from its Gram matrix), so the held-out fold does not leak into
+    the training, and results equal refitting `LinearTrafficModel`.
+
+    :param df: pd.Dataframe, output of `preprocess_dataset`
+    :param alphas: list of ridge penalties (0 for ordinary least squares)
+    :param n_folds: int, number of folds
+    :param street_names: list of street columns (default: STREET_NAMES)
+    :return: pd.Dataframe, tidy table with columns `alpha`, `target`,
+             `rmse` and `r2` (out-of-fold errors)
+    """
+    model = LinearTrafficModel(df, street_names=street_names)
+    features, _ = build_design_matrix(df, model.weather_columns)
+    values = df[model.targets].to_numpy(dtype=np.float64)
+    complete = ~(np.isnan(features).any(axis=1) | np.isnan(values).any(axis=1))
+    design, values = model.design_matrix(features[complete]), values[complete]
+    n_rows = len(values)
+    if not 2 <= n_folds <= n_rows:
+        raise ValueError(
+            f"Invalid n_folds argument. It has to fall in between 2 and {n_rows}, instead got {n_folds}."
+        )
+
+    folds = np.array_split(np.arange(n_rows), n_folds)
+    fold_grams = np.stack([design[rows].T @ design[rows] for rows in folds])
+    fold_crosses = np.stack([design[rows].T @ values[rows] for rows in folds])
+    train_grams = fold_grams.sum(axis=0) - fold_grams
+    train_crosses = fold_crosses.sum(axis=0) - fold_crosses
+
+    # `design` is standardised with statistics of all rows; standardising it
+    # again with the statistics of a training part is an affine map of
+    # the features, applied to the training systems as T^T G T and T^T C
+    train_counts = train_grams[:, 0, :1]
+    means = train_grams[:, 0, 1:] / train_counts
+    variances = np.diagonal(train_grams, axis1=1, axis2=2)[:, 1:] / train_counts - means**2
+    std = np.sqrt(np.maximum(variances, 0.0))
+    scales = np.where(std > 1e-12, std, 1.0)
+    transforms = np.zeros_like(train_grams)
+    transforms[:, 0, 0] = 1.0
+    transforms[:, 0, 1:] = -means / scales
+    transforms[:, 1:, 1:] = np.eye(design.shape[1] - 1) / scales[:, np.newaxis, :]
+    transposed = transforms.transpose(0, 2, 1)
+
+    alphas = np.asarray(alphas, dtype=np.float64)
+    # coefficients of shape (n_folds, n_alphas, n_features, n_targets)
+    coefficients = transforms[:, np.newaxis] @ solve_normal_equations(
+        (transposed @ train_grams @ transforms)[:, np.newaxis],
+        (transposed @ train_crosses)[:, np.newaxis],
+        alphas[np.newaxis, :],
+    )
+    squared_errors = np.zeros((len(alphas), len(model.targets)))
+    for i, rows in enumerate(folds):
+        residuals = values[rows] - design[rows] @ coefficients[i]
+        squared_errors += (residuals**2).sum(axis=1)
+
+    total_squares = ((values - values.mean(axis=0)) ** 2).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = 1 - squared_errors / total_squares
+    return pd.DataFrame(
+        {
+            "alpha": np.repeat(alphas, len(model.targets)),
+            "target": np.tile(model.targets, len(alphas)),
+            "rmse": np.sqrt(squared_errors / n_rows).ravel(),
+            "r2": r2.ravel(),
+        }
+    )
+
+
+def calculate_model_summary(
+    df: pd.DataFrame,
+    alpha: float = RIDGE_ALPHA,
+    n_folds: int = 5,
+    for_html: bool = False,
+    street_names: list[str] | None = None,
+) -> dict:
+    """
+    Summarise regression models of traffic on weather and calendar features:
+    - coefficients of weather features of the ridge model for every target
+    - cross-validated errors of ordinary and ridge least squares (empty
+      for periods with less than 2 * n_folds complete days, which are too
+      short for cross-validation)
+
+    :param df: pd.Dataframe, output of `preprocess_dataset`
+    :param alpha: float, ridge penalty
+    :param n_folds: int, number of cross-validation folds
+    :param for_html: bool, default False. If True, returns dictionary with
+                     DataFrames converted to HTML strings.
+    :param street_names: list of street columns (default: STREET_NAMES)
+    :return: dictionary with `coefficients` and `errors` DataFrames
+    """
+    model = LinearTrafficModel(df, alpha, street_names)
+    summary = {"coefficients": model.coefficients.loc[model.weather_columns].T}
+    if model.n_rows >= 2 * n_folds:
+        errors = cross_validate_model(df, [0.0, alpha], n_folds, street_names)
+        errors["model"] = np.where(errors["alpha"] == 0, "OLS", f"ridge (alpha={alpha:g})")
+        summary["errors"] = errors.pivot(
+            index="target", columns="model", values=["rmse", "r2"]
+        ).loc[model.targets]
+    else:
+        summary["errors"] = pd.DataFrame(index=pd.Index(model.targets, name="target"))
+    for k, v in summary.items():
+        summary[k] = round(v, 2)
+    if for_html:
+        summary = dict([(k, v.to_html()) for k, v in summary.items()])
+
+    return summary
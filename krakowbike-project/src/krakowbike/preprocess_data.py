@@ -1,6 +1,14 @@
+import numpy as np
 import pandas as pd
 from krakowbike.utils import STREET_NAMES
 
+# strategies of filling missing values, see `impute_missing_values`
+IMPUTATION_STRATEGIES = ("mean", "interpolate", "climatology", "seasonal_profile")
+# number of (month, day of week) cells of the climatology
+N_CALENDAR_CELLS = 12 * 7
+# alternating least squares steps of `seasonal_profile_block`
+PROFILE_ITERATIONS = 20
+
 
 def merge_datasets(*dataframes: tuple[pd.DataFrame]) -> pd.DataFrame:
     """
@@ -40,6 +48,211 @@ def fill_nan_values_with_mean(df: pd.DataFrame) -> pd.DataFrame:
     return df.fillna(means, axis=0)
 
 
+def day_numbers(index: pd.Index) -> np.ndarray:
+    """
+    Convert dates (`YYYY-MM-DD` strings or datetimes) to integer days
+    since 1970-01-01.
+
+    :param index: pd.Index, dates
+    :return: np.ndarray of int64
+    """
+    return np.asarray(index, dtype="datetime64[D]").astype(np.int64)
+
+
+def calendar_cell_codes(days: np.ndarray) -> np.ndarray:
+    """
+    Return (month, day of week) cell code (0 to 83) of every day.
+
+    :param days: np.ndarray, integer days since 1970-01-01
+    :return: np.ndarray of codes
+    """
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+    # 1970-01-01 was Thursday
+    return months * 7 + (days + 3) % 7
+
+
+def grouped_block_means(codes: np.ndarray, n_groups: int, block: np.ndarray) -> np.ndarray:
+    """
+    Calculate means of every column of a 2-D block in every group at once,
+    ignoring NaN values, with `np.bincount` over (group, column) cells.
+
+    :param codes: np.ndarray, integer group code (0 to n_groups - 1) of each row
+    :param n_groups: int, number of groups
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns)
+    :return: np.ndarray of shape (n_groups, n_columns); NaN for groups
+             without any value
+    """
+    n_columns = block.shape[1]
+    valid = ~np.isnan(block)
+    cells = (codes[:, np.newaxis] * n_columns + np.arange(n_columns))[valid]
+    sums = np.bincount(cells, weights=block[valid], minlength=n_groups * n_columns)
+    counts = np.bincount(cells, minlength=n_groups * n_columns)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    return means.reshape(n_groups, n_columns)
+
+
+def interpolate_block(block: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Fill missing values linearly in time between the nearest previous
+    and next values of the same column; values before the first (after
+    the last) value of a column are filled with that value.
+
+    The nearest values of all columns are found at once with cumulative
+    maximum (minimum) of row numbers of valid values.
+
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns) with rows
+                  sorted by date
+    :param days: np.ndarray, integer day of every row
+    :return: np.ndarray, block with missing values filled; columns without
+             any value stay NaN
+    """
+    n_rows = len(block)
+    valid = ~np.isnan(block)
+    missing = np.nonzero(~valid)
+    filled = block.copy()
+    if not missing[0].size:
+        return filled
+    rows = np.arange(n_rows)[:, np.newaxis]
+    previous = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)[missing]
+    following = np.minimum.accumulate(np.where(valid, rows, n_rows)[::-1], axis=0)[::-1][missing]
+    # without a previous (next) value both ends are the next (previous) value;
+    # columns without any value point at a NaN
+    previous, following = (
+        np.where(previous >= 0, previous, np.minimum(following, n_rows - 1)),
+        np.where(following < n_rows, following, np.maximum(previous, 0)),
+    )
+    rows, columns = missing
+    previous_values = block[previous, columns]
+    following_values = block[following, columns]
+    span = days[following] - days[previous]
+    weights = np.divide(
+        days[rows] - days[previous], span, out=np.zeros(len(span)), where=span > 0
+    )
+    filled[missing] = previous_values + (following_values - previous_values) * weights
+    return filled
+
+
+def climatology_block(block: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Fill missing values with the mean of the column on days of the same
+    month and day of week; cells without any value fall back to the column
+    mean.
+
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns)
+    :param days: np.ndarray, integer day of every row
+    :return: np.ndarray, block with missing values filled
+    """
+    codes = calendar_cell_codes(days)
+    rows, columns = np.nonzero(np.isnan(block))
+    filled = block.copy()
+    values = grouped_block_means(codes, N_CALENDAR_CELLS, block)[codes[rows], columns]
+    column_means = grouped_block_means(np.zeros(len(block), dtype=np.intp), 1, block)[0]
+    filled[rows, columns] = np.where(np.isnan(values), column_means[columns], values)
+    return filled
+
+
+def seasonal_profile_block(block: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Fill missing values by scaling the daily profile shared by all columns
+    of the block to the level of the column.
+
+    The block is fitted with a rank one model: value of a column on a day is
+    the profile of the day (following seasons, weather and holidays seen by
+    all columns) times the scale of the column. Profile and scales are fitted
+    to the available values by alternating least squares, every step being
+    a matrix-vector product over the whole block. Days without any value
+    use the climatology of the profile.
+
+    :param block: np.ndarray, 2-D array of shape (n_rows, n_columns)
+                  of non-negative values (e.g. traffic counts)
+    :param days: np.ndarray, integer day of every row
+    :return: np.ndarray, block with missing values filled
+    """
+    valid = ~np.isnan(block)
+    weights = valid.astype(np.float64)
+    values = np.where(valid, block, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # column means are the starting scales
+        scales = values.sum(axis=0) / weights.sum(axis=0)
+        scales = np.where(scales > 0, scales, np.nan)
+        for _ in range(PROFILE_ITERATIONS):
+            known = np.isfinite(scales)
+            scales = np.where(known, scales, 0.0)
+            profile = (values @ scales) / (weights @ scales**2)
+            known = np.isfinite(profile)
+            profile = np.where(known, profile, 0.0)
+            scales = (profile @ values) / (profile**2 @ weights)
+    profile = np.where(known, profile, np.nan)
+    if not known.all():
+        profile = climatology_block(profile[:, np.newaxis], days)[:, 0]
+    rows, columns = np.nonzero(~valid)
+    filled = block.copy()
+    filled[rows, columns] = profile[rows] * scales[columns]
+    unscaled = ~np.isfinite(filled[rows, columns])
+    if unscaled.any():
+        filled[rows[unscaled], columns[unscaled]] = climatology_block(block, days)[
+            rows[unscaled], columns[unscaled]
+        ]
+    return filled
+
+
+def impute_missing_values(
+    df: pd.DataFrame, strategy: str = "mean", street_names: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Fill missing values with one of the strategies:
+    - `mean`: column means over the whole period (`fill_nan_values_with_mean`)
+    - `interpolate`: linear interpolation in time (`interpolate_block`)
+    - `climatology`: column means on days of the same month and day of week
+      (`climatology_block`)
+    - `seasonal_profile`: daily profile of all street counters scaled to
+      the level of the street (`seasonal_profile_block`); other columns
+      are filled with the climatology
+
+    Street columns and other columns are each filled as one block.
+
+    :param df: pd.Dataframe, float64 dataframe indexed by sorted dates
+    :param strategy: str, one of IMPUTATION_STRATEGIES
+    :param street_names: list of street columns (default: STREET_NAMES)
+    :return: pd.Dataframe, dataframe with NaN values filled
+    """
+    if strategy not in IMPUTATION_STRATEGIES:
+        raise ValueError(
+            f"Invalid strategy argument. It has to be one of {', '.join(IMPUTATION_STRATEGIES)}, instead got {strategy}."
+        )
+    if strategy == "mean":
+        return fill_nan_values_with_mean(df)
+    street_names = STREET_NAMES if street_names is None else street_names
+    is_street = df.columns.isin(street_names)
+    imputers = {
+        "interpolate": (interpolate_block, interpolate_block),
+        "climatology": (climatology_block, climatology_block),
+        "seasonal_profile": (seasonal_profile_block, climatology_block),
+    }
+    days = day_numbers(df.index)
+    block = df.to_numpy(dtype=np.float64, copy=True)
+    for columns, imputer in zip([is_street, ~is_street], imputers[strategy]):
+        if columns.any():
+            block[:, columns] = imputer(block[:, columns], days)
+    return pd.DataFrame(block, index=df.index, columns=df.columns)
+
+
+def check_time_period(start_date: str, end_date: str) -> None:
+    """
+    Check that date range falls in between 2017-01-01 and 2021-12-31
+    and the start date does not follow the end date.
+
+    :param start_date: str, start date in format YYYY-MM-DD
+    :param end_date: str, end date in format YYYY-MM-DD
+    :return: None (raises ValueError for invalid ranges)
+    """
+    if any((start_date < "2017-01-01", end_date > "2021-12-31", start_date > end_date)):
+        raise ValueError(
+            f"Invalid start_date/end_date argument. Dates have to fall in between 2017-01-01 and 2021-12-31. Instead got {start_date} and {end_date}."
+        )
+
+
 def get_proper_time_period(
     df: pd.DataFrame, start_date: str, end_date: str
 ) -> pd.DataFrame:
@@ -52,10 +265,7 @@ def get_proper_time_period(
     :param end_date: str, end date in format YYYY-MM-DD
     :return: Filtered dataframe for the specified period
     """
-    if any((start_date < "2017-01-01", end_date > "2021-12-31", start_date > end_date)):
-        raise ValueError(
-            f"Invalid start_date/end_date argument. Dates have to fall in between 2017-01-01 and 2021-12-31. Instead got {start_date} and {end_date}."
-        )
+    check_time_period(start_date, end_date)
     return df.loc[start_date:end_date, :]
 
 
@@ -80,20 +290,24 @@ def remove_empty_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df.dropna(axis=1, thresh=threshold)
 
 
-def calculate_daily_traffic(df: pd.DataFrame) -> None:
+def calculate_daily_traffic(df: pd.DataFrame, street_names: list[str] | None = None) -> None:
     """
     Add total daily traffic column by summing all street traffic columns.
 
     :param df: pd.Dataframe, dataframe containing individual street traffic data
+    :param street_names: list of street columns to sum (default: STREET_NAMES)
     :return: None (adds 'total_daily_traffic' column in-place)
     """
-    df["total_daily_traffic"] = df[STREET_NAMES].sum(axis=1)
+    street_names = STREET_NAMES if street_names is None else street_names
+    df["total_daily_traffic"] = df[street_names].sum(axis=1)
 
 
 def preprocess_dataset(
     *dataframes: tuple[pd.DataFrame],
     start_date: str = "2017-01-01",
     end_date: str = "2021-12-31",
+    street_names: list[str] | None = None,
+    imputation: str = "mean",
 ) -> pd.DataFrame:
     """
     Complete preprocessing pipeline for bike traffic datasets.
@@ -101,13 +315,18 @@ def preprocess_dataset(
     :param dataframes: Tuple of dataframes to merge and preprocess
     :param start_date: str, start date for filtering (default: 2017-01-01)
     :param end_date: str, end date for filtering (default: 2021-12-31)
+    :param street_names: list of street columns summed into total daily
+                         traffic (default: STREET_NAMES)
+    :param imputation: str, strategy of filling missing values, one of
+                       IMPUTATION_STRATEGIES (default: mean), see
+                       `impute_missing_values`
     :return: Fully preprocessed DataFrame ready for analysis
     """
     df = merge_datasets(dataframes)
     df = set_proper_values_types(df)
     df = remove_empty_columns(df)
-    df = fill_nan_values_with_mean(df)
+    df = impute_missing_values(df, imputation, street_names)
     df = get_proper_time_period(df, start_date, end_date)
     convert_index_to_datetime(df)
-    calculate_daily_traffic(df)
+    calculate_daily_traffic(df, street_names)
     return df
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+from krakowbike.utils import STREET_NAMES
+
+
+class TrafficRangeQuery:
+    """
+    Answer sum/mean/std/min/max queries of street traffic over arbitrary
+    date ranges in O(1) per range.
+
+    Cumulative sums and sums of squares are precomputed for every street
+    and for `total_daily_traffic`, minima and maxima are read from
+    a sparse table. Each query method accepts either single dates or arrays
+    of dates describing a batch of inclusive [start, end] ranges.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        :param df: pd.Dataframe, output of `preprocess_dataset`
+        """
+        self.columns = [col for col in STREET_NAMES if col in df.columns] + [
+            "total_daily_traffic"
+        ]
+        self.dates = df.index.values.astype("datetime64[D]")
+        if np.any(np.diff(self.dates.astype(np.int64)) <= 0):
+            raise ValueError("Dataframe index has to be sorted and unique.")
+        values = df[self.columns].to_numpy(dtype=np.float64)
+
+        # values are shifted by column means so that sums of squares stay
+        # well conditioned for the variance formula
+        self._shift = values.mean(axis=0)
+        centred = values - self._shift
+        n_rows, n_cols = values.shape
+        self._sums = np.zeros((n_rows + 1, n_cols))
+        self._squares = np.zeros((n_rows + 1, n_cols))
+        np.cumsum(centred, axis=0, out=self._sums[1:])
+        np.cumsum(centred**2, axis=0, out=self._squares[1:])
+
+        n_levels = max(int(n_rows).bit_length(), 1)
+        self._min_table = np.full((n_levels, n_rows, n_cols), np.inf)
+        self._max_table = np.full((n_levels, n_rows, n_cols), -np.inf)
+        self._min_table[0], self._max_table[0] = values, values
+        for level in range(1, n_levels):
+            half = 1 << (level - 1)
+            size = n_rows - (1 << level) + 1
+            np.minimum(
+                self._min_table[level - 1, :size],
+                self._min_table[level - 1, half : half + size],
+                out=self._min_table[level, :size],
+            )
+            np.maximum(
+                self._max_table[level - 1, :size],
+                self._max_table[level - 1, half : half + size],
+                out=self._max_table[level, :size],
+            )
+
+    def _positions(self, start, end) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Convert inclusive date ranges to half-open row positions.
+
+        :param start: start date(s) in format YYYY-MM-DD
+        :param end: end date(s) in format YYYY-MM-DD
+        :return: tuple of arrays with first row and one past the last row
+        """
+        start = np.asarray(start, dtype="datetime64[D]")
+        end = np.asarray(end, dtype="datetime64[D]")
+        if np.any(start > end):
+            raise ValueError(
+                "Invalid start_date/end_date argument. Start dates have to precede end dates."
+            )
+        first = np.searchsorted(self.dates, start)
+        last = np.searchsorted(self.dates, end, side="right")
+        if np.any(first == last):
+            raise ValueError("Given date range does not contain any data.")
+        return first, last
+
+    def sum(self, start, end) -> np.ndarray:
+        """
+        Calculate traffic sums over date range(s).
+
+        :param start: start date(s) in format YYYY-MM-DD
+        :param end: end date(s) in format YYYY-MM-DD
+        :return: np.ndarray of shape (n_columns,) for a single range or
+                 (n_ranges, n_columns) for a batch of ranges
+        """
+        first, last = self._positions(start, end)
+        counts = (last - first)[..., np.newaxis]
+        return self._sums[last] - self._sums[first] + counts * self._shift
+
+    def mean(self, start, end) -> np.ndarray:
+        """
+        Calculate mean daily traffic over date range(s).
+
+        :param start: start date(s) in format YYYY-MM-DD
+        :param end: end date(s) in format YYYY-MM-DD
+        :return: np.ndarray of shape (n_columns,) or (n_ranges, n_columns)
+        """
+        first, last = self._positions(start, end)
+        counts = (last - first)[..., np.newaxis]
+        return (self._sums[last] - self._sums[first]) / counts + self._shift
+
+    def std(self, start, end) -> np.ndarray:
+        """
+        Calculate standard deviation (ddof=1, as in pandas) of daily traffic
+        over date range(s). Ranges with a single day give NaN, constant
+        ranges (minimum equal to maximum) give exactly 0.
+
+        :param start: start date(s) in format YYYY-MM-DD
+        :param end: end date(s) in format YYYY-MM-DD
+        :return: np.ndarray of shape (n_columns,) or (n_ranges, n_columns)
+        """
+        first, last = self._positions(start, end)
+        counts = (last - first)[..., np.newaxis]
+        sums = self._sums[last] - self._sums[first]
+        squares = self._squares[last] - self._squares[first]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = (squares - sums**2 / counts) / (counts - 1)
+        # rounding errors of the prefix sums do not cancel out exactly
+        constant = self._sparse_table_query(
+            self._min_table, np.minimum, start, end
+        ) == self._sparse_table_query(self._max_table, np.maximum, start, end)
+        variance = np.where(constant, 0.0, np.maximum(variance, 0.0))
+        return np.where(counts > 1, np.sqrt(variance), np.nan)
+
+    def _sparse_table_query(self, table: np.ndarray, reduce, start, end) -> np.ndarray:
+        first, last = self._positions(start, end)
+        level = np.log2(last - first).astype(np.int64)
+        return reduce(table[level, first], table[level, last - (1 << level)])
+
+    def min(self, start, end) -> np.ndarray:
+        """
+        Find minimal daily traffic over date range(s).
+
+        :param start: start date(s) in format YYYY-MM-DD
+        :param end: end date(s) in format YYYY-MM-DD
+        :return: np.ndarray of shape (n_columns,) or (n_ranges, n_columns)
+        """
+        return self._sparse_table_query(self._min_table, np.minimum, start, end)
+
+    def max(self, start, end) -> np.ndarray:
+        """
+        Find maximal daily traffic over date range(s).
+
+        :param start: start date(s) in format YYYY-MM-DD
+        :param end: end date(s) in format YYYY-MM-DD
+        :return: np.ndarray of shape (n_columns,) or (n_ranges, n_columns)
+        """
+        return self._sparse_table_query(self._max_table, np.maximum, start, end)
+
+    def summary(self, start: str, end: str) -> pd.DataFrame:
+        """
+        Return basic statistics (mean, std, min, max) for a single date range
+        in the same layout as `calculate_basic_statistics`.
+
+        :param start: str, start date in format YYYY-MM-DD
+        :param end: str, end date in format YYYY-MM-DD
+        :return: pd.Dataframe, dataframe with basic statistics
+        """
+        stats = {
+            "mean": self.mean(start, end),
+            "std": self.std(start, end),
+            "min": self.min(start, end),
+            "max": self.max(start, end),
+        }
+        return pd.DataFrame(stats, index=self.columns)
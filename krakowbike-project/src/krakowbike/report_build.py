@@ -0,0 +1,246 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Callable
+
+MANIFEST_FILE = "manifest.json"
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Return short hexadecimal digest of given bytes.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    Return digest of the content of a file, read in chunks.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, mode="rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache
+def module_digest(module: ModuleType) -> str:
+    """
+    Return digest of the source code of a module (its code version).
+    """
+    return file_digest(inspect.getsourcefile(module))
+
+
+class Section:
+    """
+    Node of the report build graph: a value computed by a function from
+    values of other sections.
+    """
+
+    def __init__(
+        self,
+        function: Callable,
+        dependencies: list[str] = (),
+        params: dict | None = None,
+        code: list[ModuleType] = (),
+        files: list[str] = (),
+        outputs: list[str] = (),
+    ):
+        """
+        :param function: callable computing the section; values of
+                         dependencies are passed positionally, in order,
+                         followed by `params` as keyword arguments
+        :param dependencies: list of names of sections the function needs
+        :param params: dict, keyword arguments of the function
+        :param code: list of modules whose source code is the code version
+                     of the section
+        :param files: list of paths to input files read by the function
+        :param outputs: list of paths to files written by the function;
+                        the section is stale if any of them is missing
+        """
+        self.function = function
+        self.dependencies = list(dependencies)
+        self.params = params or {}
+        self.code = list(code)
+        self.files = list(files)
+        self.outputs = list(outputs)
+
+
+class ReportBuild:
+    """
+    Incremental build of a graph of report sections backed by an on-disk
+    artefact cache.
+
+    Every section is fingerprinted by its code version, parameters, content
+    of its input files and digests of the values of its dependencies.
+    Values are pickled into the cache directory under their fingerprints,
+    so a section is computed only when one of its inputs changed, and
+    a section whose recomputed value did not change does not invalidate
+    the sections depending on it. Values of fresh sections are loaded from
+    the cache only if a stale section needs them. `prune` keeps only
+    the artefacts of the last build.
+    """
+
+    def __init__(self, sections: dict[str, Section], cache_dir: str):
+        """
+        :param sections: dictionary mapping section name to its definition
+        :param cache_dir: str, path to the artefact cache directory
+        """
+        self.sections = sections
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(os.path.join(cache_dir, MANIFEST_FILE), encoding="utf-8") as f:
+                self._manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._manifest = {"digests": {}, "inputs": {}}
+        self._digests: dict[str, str] = {}
+        self._values: dict[str, Any] = {}
+        self._fingerprints: dict[str, str] = {}
+        self.rebuilt: list[str] = []
+        self.explanations: list[str] = []
+
+    def _artefact_path(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, f"{fingerprint}.pkl")
+
+    def _inputs(self, name: str) -> dict[str, str]:
+        """
+        Collect digests of everything a section depends on.
+        """
+        section = self.sections[name]
+        inputs = {}
+        for module in section.code:
+            inputs[f"code {module.__name__.split('.')[-1]}"] = module_digest(module)
+        for key, value in section.params.items():
+            inputs[f"parameter {key}"] = content_digest(repr(value).encode())
+        for path in section.files:
+            inputs[f"file {path}"] = file_digest(path)
+        for dependency in section.dependencies:
+            inputs[f"section {dependency}"] = self.digest(dependency)
+        return inputs
+
+    def _reason(self, name: str, inputs: dict[str, str], fingerprint: str) -> str:
+        """
+        Describe why a section has to be rebuilt.
+        """
+        previous = self._manifest["inputs"].get(name)
+        if previous is None:
+            return "not built before"
+        changed = sorted(
+            key for key in inputs.keys() | previous.keys() if inputs.get(key) != previous.get(key)
+        )
+        if changed:
+            return "changed " + ", ".join(changed)
+        if not os.path.exists(self._artefact_path(fingerprint)):
+            return "artefact missing from cache"
+        return "output missing: " + ", ".join(
+            path for path in self.sections[name].outputs if not os.path.exists(path)
+        )
+
+    def digest(self, name: str) -> str:
+        """
+        Return digest of the value of a section, rebuilding the section
+        first if it is stale.
+
+        :param name: str, name of the section
+        :return: str, digest of the pickled value
+        """
+        if name in self._digests:
+            return self._digests[name]
+        section = self.sections[name]
+        inputs = self._inputs(name)
+        fingerprint = content_digest(json.dumps([name, inputs], sort_keys=True).encode())
+        fresh = (
+            fingerprint in self._manifest["digests"]
+            and os.path.exists(self._artefact_path(fingerprint))
+            and all(os.path.exists(path) for path in section.outputs)
+        )
+        if fresh:
+            self.explanations.append(f"{name}: up to date")
+        else:
+            self.explanations.append(
+                f"{name}: rebuilt ({self._reason(name, inputs, fingerprint)})"
+            )
+            value = section.function(
+                *[self.value(dependency) for dependency in section.dependencies],
+                **section.params,
+            )
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            path = self._artefact_path(fingerprint)
+            with open(f"{path}.tmp", mode="wb") as f:
+                f.write(data)
+            os.replace(f"{path}.tmp", path)
+            self._manifest["digests"][fingerprint] = content_digest(data)
+            self._values[name] = value
+            self.rebuilt.append(name)
+        self._manifest["inputs"][name] = inputs
+        self._fingerprints[name] = fingerprint
+        self._digests[name] = self._manifest["digests"][fingerprint]
+        return self._digests[name]
+
+    def value(self, name: str) -> Any:
+        """
+        Return value of a section, rebuilding it if it is stale
+        or loading it from the cache otherwise.
+
+        :param name: str, name of the section
+        :return: value of the section
+        """
+        self.digest(name)
+        if name not in self._values:
+            with open(self._artefact_path(self._fingerprints[name]), mode="rb") as f:
+                self._values[name] = pickle.load(f)
+        return self._values[name]
+
+    def _save_manifest(self) -> None:
+        path = os.path.join(self.cache_dir, MANIFEST_FILE)
+        with open(f"{path}.tmp", mode="w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def build(self, names: list[str]) -> None:
+        """
+        Bring given sections (and everything they depend on) up to date
+        and save the cache manifest.
+
+        :param names: list of names of sections to build
+        """
+        try:
+            for name in names:
+                self.digest(name)
+        finally:
+            self._save_manifest()
+
+    def prune(self) -> list[str]:
+        """
+        Delete artefacts and manifest entries which the built sections do not
+        reference (previous fingerprints of changed sections, sections which
+        are no longer part of the graph), so the cache does not grow without
+        limit. Has to be called after all `build` calls.
+
+        :return: list of names of deleted artefact files
+        """
+        referenced = set(self._fingerprints.values())
+        self._manifest["digests"] = {
+            fingerprint: digest
+            for fingerprint, digest in self._manifest["digests"].items()
+            if fingerprint in referenced
+        }
+        self._manifest["inputs"] = {
+            name: inputs
+            for name, inputs in self._manifest["inputs"].items()
+            if name in self._fingerprints
+        }
+        removed = []
+        for file_name in sorted(os.listdir(self.cache_dir)):
+            fingerprint, extension = os.path.splitext(file_name)
+            if extension == ".pkl" and fingerprint not in referenced:
+                os.remove(os.path.join(self.cache_dir, file_name))
+                removed.append(file_name)
+        self._save_manifest()
+        return removed
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+from jinja2 import Template
+from krakowbike.__main__ import (
+    calculate_report_data,
+    get_report_template,
+    load_report_dataset,
+)
+from krakowbike.preprocess_data import check_time_period, get_proper_time_period
+
+
+def parse_date(value: str, name: str) -> str:
+    """
+    Validate date given in a request.
+
+    :param value: str, date in format YYYY-MM-DD
+    :param name: str, name of the query parameter (for the error message)
+    :return: str, the same date in format YYYY-MM-DD
+    """
+    try:
+        if len(value) != len("YYYY-MM-DD"):
+            raise ValueError
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(
+            f"Invalid {name} argument. It has to be a valid date in format YYYY-MM-DD, instead got {value}."
+        ) from None
+
+
+class ReportService:
+    """
+    Asynchronous report service keeping the preprocessed dataset resident.
+
+    Reports are rendered in an executor, identical concurrent requests for
+    the same period share one computation and rendered reports are kept
+    in a TTL/LRU cache.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        template: Template,
+        ttl: float = 600.0,
+        max_reports: int = 32,
+        max_workers: int = 1,
+    ):
+        """
+        :param df: pd.Dataframe, preprocessed dataset for the whole period
+        :param template: jinja2 Template used to render reports; templates
+                         loaded from files are compiled again when edited
+        :param ttl: float, number of seconds for which rendered report is cached
+        :param max_reports: int, maximal number of cached reports
+        :param max_workers: int, number of executor threads; pyplot keeps
+                            global state, so values above 1 are only safe
+                            for thread-safe plotting backends
+        """
+        self.df = df
+        self.template = template
+        self.ttl = ttl
+        self.max_reports = max_reports
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._cache: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self._pending: dict[tuple[str, str], asyncio.Future] = {}
+
+    @classmethod
+    def from_project(
+        cls, project_path: str, store_dir: str | None = None, **kwargs
+    ) -> "ReportService":
+        """
+        Create service for data and template of the `krakowbike` project.
+
+        :param project_path: str, path to the `krakowbike` project directory
+        :param store_dir: str, default None. Path to the memory-mapped dataset
+                          shared by service processes, see `City.load`
+        :return: ReportService
+        """
+        return cls(
+            load_report_dataset(project_path, store_dir=store_dir),
+            get_report_template(f"{project_path}/templates"),
+            **kwargs,
+        )
+
+    def current_template(self) -> Template:
+        """
+        Return the report template, compiled again if its file (or a file
+        it includes) was modified since it was loaded.
+        """
+        if self.template.name is None:
+            return self.template
+        return self.template.environment.get_template(self.template.name)
+
+    def render_report(self, start_date: str, end_date: str) -> str:
+        """
+        Compute statistics and plots for a given period and render report.
+        This is a blocking, CPU-bound call.
+
+        :param start_date: str, start date in format YYYY-MM-DD
+        :param end_date: str, end date in format YYYY-MM-DD
+        :return: str, rendered HTML report
+        """
+        df = get_proper_time_period(self.df, start_date, end_date).copy()
+        try:
+            return self.current_template().render(calculate_report_data(df))
+        finally:
+            plt.close("all")
+
+    def _get_cached(self, key: tuple[str, str]) -> str | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, report = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return report
+
+    def _store(self, key: tuple[str, str], future: asyncio.Future) -> None:
+        self._pending.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._cache[key] = (time.monotonic() + self.ttl, future.result())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_reports:
+            self._cache.popitem(last=False)
+
+    async def get_report(self, start_date: str, end_date: str) -> str:
+        """
+        Return HTML report for a given period, rendering it only if it is not
+        cached and no identical request is already being computed.
+
+        :param start_date: str, start date in format YYYY-MM-DD
+        :param end_date: str, end date in format YYYY-MM-DD
+        :return: str, rendered HTML report
+        """
+        key = (start_date, end_date)
+        report = self._get_cached(key)
+        if report is not None:
+            return report
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._executor, self.render_report, start_date, end_date
+            )
+            future.add_done_callback(lambda f: self._store(key, f))
+            self._pending[key] = future
+        return await asyncio.shield(future)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Minimal HTTP/1.0 handler serving `GET /report?start_date=...&end_date=...`.
+        """
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            if len(request_line) < 2 or request_line[0] != "GET":
+                status, body = "405 Method Not Allowed", "Only GET requests are supported."
+            else:
+                url = urlsplit(request_line[1])
+                query = parse_qs(url.query)
+                if url.path != "/report":
+                    status, body = "404 Not Found", "Unknown path."
+                else:
+                    try:
+                        start_date = parse_date(
+                            query.get("start_date", ["2017-01-01"])[0], "start_date"
+                        )
+                        end_date = parse_date(query.get("end_date", ["2021-12-31"])[0], "end_date")
+                        check_time_period(start_date, end_date)
+                    except ValueError as e:
+                        status, body = "400 Bad Request", str(e)
+                    else:
+                        # errors of valid requests are errors of the service
+                        try:
+                            body = await self.get_report(start_date, end_date)
+                            status = "200 OK"
+                        except Exception:
+                            traceback.print_exc()
+                            status, body = (
+                                "500 Internal Server Error",
+                                "Report could not be created.",
+                            )
+            content = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.0 {status}\r\n"
+                "Content-Type: text/html; charset=utf-8\r\n"
+                f"Content-Length: {len(content)}\r\n\r\n".encode("latin-1")
+            )
+            writer.write(content)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """
+        Serve reports over HTTP until cancelled.
+
+        :param host: str, interface to listen on
+        :param port: int, port to listen on
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            print(f"Serving reports on http://{host}:{port}/report")
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-p",
+        "--project_path",
+        help="Path to the `krakowbike` project directory.",
+        default="./krakowbike-project",
+    )
+    parser.add_argument("--host", help="Host to listen on.", default="127.0.0.1")
+    parser.add_argument("--port", help="Port to listen on.", type=int, default=8000)
+    parser.add_argument(
+        "--ttl", help="Time (in seconds) reports are cached.", type=float, default=600.0
+    )
+    parser.add_argument(
+        "--max_reports", help="Maximal number of cached reports.", type=int, default=32
+    )
+    parser.add_argument(
+        "--store_dir",
+        help="Path to the directory in which the preprocessed dataset is saved "
+        "as a memory map shared by all server processes.",
+    )
+    args = parser.parse_args()
+
+    matplotlib.use("Agg")
+    service = ReportService.from_project(
+        args.project_path,
+        store_dir=args.store_dir,
+        ttl=args.ttl,
+        max_reports=args.max_reports,
+    )
+    asyncio.run(service.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
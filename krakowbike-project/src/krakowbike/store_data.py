@@ -0,0 +1,287 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from krakowbike.preprocess_data import (
+    merge_datasets,
+    preprocess_dataset,
+    set_proper_values_types,
+)
+from krakowbike.utils import STREET_NAMES
+
+METADATA_FILE = "metadata.json"
+VALUES_FILE = "values.bin"
+DATES_FILE = "dates.bin"
+
+
+def save_preprocessed_dataset(
+    df: pd.DataFrame, dir_path: str, source: dict | None = None
+) -> None:
+    """
+    Save preprocessed dataframe as a memory-mappable dataset directory.
+
+    The directory contains raw row-major float64 values, the dates as
+    datetime64[D] values and a small JSON metadata header with column names,
+    shape and covered period.
+
+    :param df: pd.Dataframe, output of `preprocess_dataset`
+               (float64 columns, datetime index)
+    :param dir_path: str, path to the directory in which dataset is saved
+    :param source: dict, optional JSON-serialisable description of the inputs
+                   the dataset was built from, stored in the metadata
+                   (see `City.load`)
+    :return: None (writes files to `dir_path`)
+    """
+    if not (df.dtypes == "float64").all():
+        raise ValueError("Only dataframes with float64 columns can be saved.")
+    os.makedirs(dir_path, exist_ok=True)
+    values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+    dates = df.index.values.astype("datetime64[D]")
+    values.tofile(os.path.join(dir_path, VALUES_FILE))
+    dates.astype(np.int64).tofile(os.path.join(dir_path, DATES_FILE))
+    metadata = {
+        "columns": list(df.columns),
+        "index_name": df.index.name,
+        "n_rows": int(values.shape[0]),
+        "start_date": str(dates[0]) if len(dates) else None,
+        "end_date": str(dates[-1]) if len(dates) else None,
+    }
+    if source is not None:
+        metadata["source"] = source
+    write_metadata(dir_path, metadata)
+
+
+def write_metadata(dir_path: str, metadata: dict) -> None:
+    """
+    Atomically replace metadata header of a saved dataset.
+
+    Readers take the number of rows from the metadata, so data appended to
+    the raw files becomes visible only once the new metadata is in place.
+
+    :param dir_path: str, path to the dataset directory
+    :param metadata: dictionary with column names, number of rows and covered period
+    :return: None (writes metadata file to `dir_path`)
+    """
+    path = os.path.join(dir_path, METADATA_FILE)
+    with open(f"{path}.tmp", mode="w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def read_metadata(dir_path: str) -> dict:
+    """
+    Read metadata header of a saved dataset.
+
+    :param dir_path: str, path to the dataset directory
+    :return: dictionary with column names, number of rows and covered period
+    """
+    with open(os.path.join(dir_path, METADATA_FILE), mode="r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_preprocessed_dataset(
+    dir_path: str, start_date: str | None = None, end_date: str | None = None
+) -> pd.DataFrame:
+    """
+    Open saved dataset as a dataframe backed by a read-only memory map.
+
+    No data is copied: the returned dataframe is a view over the mapped file,
+    so several processes opening the same dataset share one physical copy
+    of it in the page cache.
+
+    :param dir_path: str, path to the dataset directory
+    :param start_date: str, optional start date in format YYYY-MM-DD
+    :param end_date: str, optional end date in format YYYY-MM-DD
+    :return: pd.Dataframe, preprocessed dataframe with datetime index
+    """
+    metadata = read_metadata(dir_path)
+    n_rows, columns = metadata["n_rows"], metadata["columns"]
+    if n_rows == 0:
+        return pd.DataFrame(
+            columns=columns,
+            index=pd.DatetimeIndex([], name=metadata["index_name"]),
+            dtype="float64",
+        )
+    values = np.memmap(
+        os.path.join(dir_path, VALUES_FILE),
+        dtype=np.float64,
+        mode="r",
+        shape=(n_rows, len(columns)),
+    )
+    dates = np.memmap(
+        os.path.join(dir_path, DATES_FILE), dtype=np.int64, mode="r", shape=(n_rows,)
+    ).view("datetime64[D]")
+
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise ValueError(
+            f"Invalid start_date/end_date argument. Instead got {start_date} and {end_date}."
+        )
+    start = 0 if start_date is None else np.searchsorted(dates, np.datetime64(start_date))
+    end = (
+        n_rows
+        if end_date is None
+        else np.searchsorted(dates, np.datetime64(end_date), side="right")
+    )
+    index = pd.DatetimeIndex(dates[start:end], name=metadata["index_name"])
+    return pd.DataFrame(values[start:end], index=index, columns=columns, copy=False)
+
+
+class RebuildRequiredError(ValueError):
+    """
+    Raised when appended readings change which columns are kept by
+    `remove_empty_columns`, so the dataset has to be preprocessed again.
+    """
+
+    def __init__(self, columns: list[str]):
+        self.columns = columns
+        super().__init__(
+            "Keep/drop status of columns "
+            f"{columns} changed, the dataset has to be rebuilt with `build_incremental_dataset`."
+        )
+
+
+def _raw_statistics(df: pd.DataFrame) -> dict:
+    """
+    Calculate non-null counts and sums of raw (merged and typed) columns.
+    """
+    return {
+        col: {"count": int(count), "sum": float(total)}
+        for col, count, total in zip(df.columns, df.notna().sum(), df.sum())
+    }
+
+
+def _kept_columns(statistics: dict, n_rows: int) -> list[str]:
+    """
+    Select raw columns kept by `remove_empty_columns` for a given number of rows.
+    """
+    threshold = int(n_rows * 0.5)
+    return [col for col, stats in statistics.items() if stats["count"] >= threshold]
+
+
+def build_incremental_dataset(
+    dir_path: str,
+    *dataframes: tuple[pd.DataFrame],
+    start_date: str = "2017-01-01",
+    end_date: str = "2021-12-31",
+) -> pd.DataFrame:
+    """
+    Preprocess raw datasets and save the result as a dataset directory which
+    new daily readings can be appended to with `append_daily_readings`.
+
+    Besides the cleaned data, the metadata keeps the number of raw rows,
+    the last raw date and non-null counts and sums of all raw columns
+    (including dropped ones), i.e. the state of `remove_empty_columns`
+    and `fill_nan_values_with_mean`. Statistics cover the whole raw history,
+    also after `end_date`.
+
+    :param dir_path: str, path to the directory in which dataset is saved
+    :param dataframes: Tuple of raw dataframes to merge and preprocess
+    :param start_date: str, start date for filtering (default: 2017-01-01)
+    :param end_date: str, end date for filtering (default: 2021-12-31)
+    :return: pd.Dataframe, preprocessed dataframe
+    """
+    raw = set_proper_values_types(merge_datasets(dataframes))
+    street_names = [col for col in STREET_NAMES if col in raw.columns]
+    df = preprocess_dataset(
+        raw, start_date=start_date, end_date=end_date, street_names=street_names
+    )
+    save_preprocessed_dataset(df, dir_path)
+    metadata = read_metadata(dir_path)
+    metadata["ingest"] = {
+        "n_raw_rows": len(raw),
+        "last_raw_date": str(pd.to_datetime(raw.index).max().date()) if len(raw) else None,
+        "street_names": street_names,
+        "statistics": _raw_statistics(raw),
+    }
+    write_metadata(dir_path, metadata)
+    return df
+
+
+def append_daily_readings(dir_path: str, *dataframes: tuple[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Append new daily readings to a dataset saved with `build_incremental_dataset`
+    at a cost proportional to the number of new rows.
+
+    Running non-null counts and sums of raw columns are updated, missing
+    values of the new rows are filled with the updated column means and
+    `total_daily_traffic` is calculated only for the new rows. Values filled
+    in earlier rows keep the means valid at the time they were appended.
+    If the new readings change which columns are kept by
+    `remove_empty_columns`, nothing is written and `RebuildRequiredError`
+    is raised.
+
+    :param dir_path: str, path to the dataset directory
+    :param dataframes: Tuple of raw dataframes with new readings
+                       (dates following the last saved date and the last
+                       raw date included in the running statistics)
+    :return: pd.Dataframe, preprocessed new rows
+    """
+    metadata = read_metadata(dir_path)
+    if "ingest" not in metadata:
+        raise ValueError(
+            "Dataset was not built with `build_incremental_dataset`, readings cannot be appended."
+        )
+    ingest = metadata["ingest"]
+    new = set_proper_values_types(merge_datasets(dataframes))
+    new.index = pd.to_datetime(new.index)
+    dates = new.index.values.astype("datetime64[D]")
+    if np.any(np.diff(dates.astype(np.int64)) <= 0):
+        raise ValueError("New readings have to contain unique dates.")
+    # readings up to the last raw date are already counted in the statistics,
+    # even if they are after the saved period
+    last_dates = [
+        date for date in (metadata["end_date"], ingest.get("last_raw_date")) if date is not None
+    ]
+    if last_dates and len(dates) and dates[0] <= np.datetime64(max(last_dates)):
+        raise ValueError(
+            f"New readings have to follow the last saved or ingested date {max(last_dates)}."
+        )
+
+    n_raw_rows = ingest["n_raw_rows"] + len(new)
+    statistics = {col: dict(stats) for col, stats in ingest["statistics"].items()}
+    for col, stats in _raw_statistics(new).items():
+        total = statistics.setdefault(col, {"count": 0, "sum": 0.0})
+        total["count"] += stats["count"]
+        total["sum"] += stats["sum"]
+    kept = set(_kept_columns(statistics, n_raw_rows))
+    columns = [col for col in metadata["columns"] if col != "total_daily_traffic"]
+    flipped = sorted(kept.symmetric_difference(columns))
+    if flipped:
+        raise RebuildRequiredError(flipped)
+
+    means = {
+        col: statistics[col]["sum"] / statistics[col]["count"]
+        if statistics[col]["count"]
+        else np.nan
+        for col in columns
+    }
+    rows = new.reindex(columns=columns).fillna(means)
+    rows["total_daily_traffic"] = rows[ingest["street_names"]].sum(axis=1)
+    rows = rows[metadata["columns"]]
+
+    # rows written by an interrupted append are not covered by the metadata
+    # and are overwritten
+    n_rows = metadata["n_rows"]
+    for file_name, array, row_size in (
+        (
+            VALUES_FILE,
+            np.ascontiguousarray(rows.to_numpy(dtype=np.float64)),
+            8 * len(metadata["columns"]),
+        ),
+        (DATES_FILE, dates.astype(np.int64), 8),
+    ):
+        with open(os.path.join(dir_path, file_name), mode="r+b") as f:
+            f.truncate(n_rows * row_size)
+            f.seek(0, os.SEEK_END)
+            array.tofile(f)
+    if len(dates):
+        metadata["start_date"] = metadata["start_date"] or str(dates[0])
+        metadata["end_date"] = str(dates[-1])
+    metadata["n_rows"] += len(rows)
+    ingest["n_raw_rows"] = n_raw_rows
+    if len(dates):
+        ingest["last_raw_date"] = str(dates[-1])
+    ingest["statistics"] = statistics
+    write_metadata(dir_path, metadata)
+    return rows
@@ -4,6 +4,8 @@ import io
 import matplotlib.pyplot as plt
 
 AIR_COLUMN = "Kraków - ul. Złoty Róg (pył zawieszony PM10 [jednostka ug/m3])"
+TEMPERATURE_COLUMN = "Średnia temperatura dobowa [°C]"
+PRECIPITATION_COLUMN = "Suma dobowa opadów [mm]"
 
 STREET_NAMES = [
     "Armii Krajowej",
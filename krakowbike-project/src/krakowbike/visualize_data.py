@@ -102,3 +102,29 @@ def visualize_weather_impact(df: pd.DataFrame, save_plot: bool = False) -> list[
             plt.show()
 
     return plots
+
+
+def plot_lagged_correlations(
+    lagged_correlations: pd.DataFrame,
+    target: str = "total_daily_traffic",
+    save_plot: bool = False,
+) -> str | None:
+    """
+    Create heatmap of correlations between lagged weather factors and traffic.
+
+    :param lagged_correlations: Tidy table returned by `calculate_lagged_weather_correlations`
+    :param target: Traffic column (street or 'total_daily_traffic') which should be plotted
+    :param save_plot: If True, return base64 string; if False, display plot
+    :return: Base64 encoded plot string if save_plot=True
+    """
+    table = lagged_correlations[lagged_correlations["target"] == target].pivot(
+        index="weather_factor", columns="lag", values="correlation"
+    )
+    plt.figure(figsize=(15, 6))
+    sns.heatmap(table, cmap="Blues", vmin=-1, vmax=1)
+    plt.title(f"Correlations of lagged weather factors with {target}")
+    plt.xlabel("lag [days]")
+    plt.ylabel("")
+    if save_plot:
+        return save_plot_as_base64()
+    plt.show()
@@ -0,0 +1,360 @@
+// Small charting script of the interactive report: draws line, heatmap,
+// box and scatter charts on canvases from compact typed-array payloads
+// (base64 strings of little endian float32 / int32 values).
+(function () {
+  "use strict";
+
+  const WIDTH = 960;
+  const MARGIN = { top: 36, right: 24, bottom: 56, left: 72 };
+  const COLORS = {
+    text: "#0d1b2a",
+    line: "#415a77",
+    fill: "#778da9",
+    grid: "rgba(13, 27, 42, 0.15)",
+  };
+  // seaborn "Blues" colour map end points
+  const LOW_COLOR = [247, 251, 255];
+  const HIGH_COLOR = [8, 48, 107];
+  const DAY_MS = 86400000;
+
+  const tooltip = document.createElement("div");
+  tooltip.style.cssText =
+    "position: fixed; display: none; pointer-events: none; white-space: pre;" +
+    "padding: 4px 8px; border-radius: 4px; font: 12px sans-serif;" +
+    "background: #0d1b2a; color: #e0e1dd;";
+  document.body.appendChild(tooltip);
+
+  function decode(payload) {
+    const bytes = Uint8Array.from(atob(payload.data), (c) => c.charCodeAt(0));
+    return payload.dtype === "int32" ? new Int32Array(bytes.buffer) : new Float32Array(bytes.buffer);
+  }
+
+  function formatNumber(value) {
+    if (Number.isNaN(value)) {
+      return "NaN";
+    }
+    return Math.abs(value) >= 100 ? value.toFixed(0) : String(Number(value.toFixed(2)));
+  }
+
+  function formatDate(day) {
+    return new Date(day * DAY_MS).toISOString().slice(0, 10);
+  }
+
+  function extent(values) {
+    let min = Infinity;
+    let max = -Infinity;
+    for (const value of values) {
+      if (!Number.isNaN(value)) {
+        min = Math.min(min, value);
+        max = Math.max(max, value);
+      }
+    }
+    return min <= max ? [min, max] : [0, 1];
+  }
+
+  function linearScale(domainMin, domainMax, rangeMin, rangeMax) {
+    const span = domainMax - domainMin || 1;
+    const scale = (value) => rangeMin + ((value - domainMin) / span) * (rangeMax - rangeMin);
+    scale.invert = (position) => domainMin + ((position - rangeMin) / (rangeMax - rangeMin)) * span;
+    scale.domain = [domainMin, domainMax];
+    return scale;
+  }
+
+  function niceTicks(min, max, count) {
+    const rough = (max - min) / count || 1;
+    const power = Math.pow(10, Math.floor(Math.log10(rough)));
+    const step = [1, 2, 5, 10].map((m) => m * power).find((s) => s >= rough);
+    const ticks = [];
+    for (let tick = Math.ceil(min / step) * step; tick <= max + step * 1e-9; tick += step) {
+      ticks.push(Number(tick.toPrecision(12)));
+    }
+    return ticks;
+  }
+
+  function blues(value) {
+    const t = Math.min(Math.max((value + 1) / 2, 0), 1);
+    const rgb = LOW_COLOR.map((low, i) => Math.round(low + (HIGH_COLOR[i] - low) * t));
+    return Number.isNaN(value) ? "#ffffff" : `rgb(${rgb.join(",")})`;
+  }
+
+  function shorten(ctx, text, width) {
+    if (ctx.measureText(text).width <= width) {
+      return text;
+    }
+    while (text.length > 1 && ctx.measureText(text + "…").width > width) {
+      text = text.slice(0, -1);
+    }
+    return text + "…";
+  }
+
+  // create canvas for high density screens; `hitTest(x, y)` returns tooltip
+  // text for a mouse position (or null)
+  function createCanvas(container, width, height, hitTest) {
+    const canvas = document.createElement("canvas");
+    const ratio = window.devicePixelRatio || 1;
+    canvas.width = width * ratio;
+    canvas.height = height * ratio;
+    canvas.style.width = `${width}px`;
+    canvas.style.height = `${height}px`;
+    container.appendChild(canvas);
+    canvas.addEventListener("mousemove", (event) => {
+      const rect = canvas.getBoundingClientRect();
+      const text = hitTest(event.clientX - rect.left, event.clientY - rect.top);
+      tooltip.style.display = text ? "block" : "none";
+      if (text) {
+        tooltip.textContent = text;
+        tooltip.style.left = `${event.clientX + 12}px`;
+        tooltip.style.top = `${event.clientY + 12}px`;
+      }
+    });
+    canvas.addEventListener("mouseleave", () => {
+      tooltip.style.display = "none";
+    });
+    const ctx = canvas.getContext("2d");
+    ctx.scale(ratio, ratio);
+    ctx.font = "12px sans-serif";
+    ctx.fillStyle = COLORS.text;
+    return ctx;
+  }
+
+  function drawTitle(ctx, width, title) {
+    ctx.save();
+    ctx.font = "bold 15px sans-serif";
+    ctx.textAlign = "center";
+    ctx.fillText(title, width / 2, 20);
+    ctx.restore();
+  }
+
+  function drawValueAxis(ctx, y, left, right) {
+    ctx.save();
+    ctx.textAlign = "right";
+    ctx.textBaseline = "middle";
+    ctx.strokeStyle = COLORS.grid;
+    for (const tick of niceTicks(y.domain[0], y.domain[1], 6)) {
+      ctx.beginPath();
+      ctx.moveTo(left, y(tick));
+      ctx.lineTo(right, y(tick));
+      ctx.stroke();
+      ctx.fillText(formatNumber(tick), left - 6, y(tick));
+    }
+    ctx.restore();
+  }
+
+  function inside(x, y, width, height) {
+    return x >= MARGIN.left && x <= width - MARGIN.right && y >= MARGIN.top && y <= height - MARGIN.bottom;
+  }
+
+  function lineChart(container, data, title) {
+    const days = decode(data.days);
+    const values = decode(data.values);
+    const height = 420;
+    const x = linearScale(days[0], days[days.length - 1], MARGIN.left, WIDTH - MARGIN.right);
+    const y = linearScale(0, extent(values)[1], height - MARGIN.bottom, MARGIN.top);
+    const ctx = createCanvas(container, WIDTH, height, (px, py) => {
+      if (!inside(px, py, WIDTH, height) || !days.length) {
+        return null;
+      }
+      // binary search of the nearest day
+      const day = x.invert(px);
+      let lo = 0;
+      let hi = days.length - 1;
+      while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (days[mid] < day) {
+          lo = mid + 1;
+        } else {
+          hi = mid;
+        }
+      }
+      if (lo > 0 && day - days[lo - 1] < days[lo] - day) {
+        lo -= 1;
+      }
+      return `${formatDate(days[lo])}\n${formatNumber(values[lo])}`;
+    });
+    drawTitle(ctx, WIDTH, title);
+    drawValueAxis(ctx, y, MARGIN.left, WIDTH - MARGIN.right);
+
+    ctx.textAlign = "center";
+    for (let i = 0; i <= 6; i++) {
+      const day = Math.round(x.domain[0] + ((x.domain[1] - x.domain[0]) * i) / 6);
+      ctx.fillText(formatDate(day), x(day), height - MARGIN.bottom + 18);
+    }
+    ctx.strokeStyle = COLORS.line;
+    ctx.beginPath();
+    let drawing = false;
+    for (let i = 0; i < days.length; i++) {
+      if (Number.isNaN(values[i])) {
+        drawing = false;
+      } else if (drawing) {
+        ctx.lineTo(x(days[i]), y(values[i]));
+      } else {
+        ctx.moveTo(x(days[i]), y(values[i]));
+        drawing = true;
+      }
+    }
+    ctx.stroke();
+  }
+
+  function heatmap(container, rows, columns, values, title, options) {
+    const annotate = options && options.annotate;
+    const columnStep = (options && options.columnStep) || 1;
+    const probe = document.createElement("canvas").getContext("2d");
+    probe.font = "12px sans-serif";
+    const left = Math.min(Math.max(...rows.map((r) => probe.measureText(r).width)) + 12, 280);
+    const cell = Math.min((WIDTH - left - MARGIN.right) / columns.length, 48);
+    const cellHeight = annotate ? cell : 24;
+    const height = MARGIN.top + rows.length * cellHeight + MARGIN.bottom + 40;
+    const ctx = createCanvas(container, WIDTH, height, (px, py) => {
+      const column = Math.floor((px - left) / cell);
+      const row = Math.floor((py - MARGIN.top) / cellHeight);
+      if (px < left || py < MARGIN.top || column >= columns.length || row >= rows.length) {
+        return null;
+      }
+      return `${rows[row]}\n${columns[column]}\n${formatNumber(values[row * columns.length + column])}`;
+    });
+    drawTitle(ctx, WIDTH, title);
+    ctx.textBaseline = "middle";
+    rows.forEach((row, i) => {
+      for (let j = 0; j < columns.length; j++) {
+        const value = values[i * columns.length + j];
+        ctx.fillStyle = blues(value);
+        ctx.fillRect(left + j * cell, MARGIN.top + i * cellHeight, cell, cellHeight);
+        if (annotate) {
+          ctx.fillStyle = Math.abs(value) > 0.5 ? "#ffffff" : COLORS.text;
+          ctx.textAlign = "center";
+          ctx.fillText(formatNumber(value), left + (j + 0.5) * cell, MARGIN.top + (i + 0.5) * cellHeight);
+        }
+      }
+      ctx.fillStyle = COLORS.text;
+      ctx.textAlign = "right";
+      ctx.fillText(shorten(ctx, row, left - 12), left - 6, MARGIN.top + (i + 0.5) * cellHeight);
+    });
+    const bottom = MARGIN.top + rows.length * cellHeight;
+    columns.forEach((column, j) => {
+      if (j % columnStep === 0) {
+        ctx.save();
+        ctx.translate(left + (j + 0.5) * cell, bottom + 6);
+        ctx.rotate(columnStep === 1 && annotate ? Math.PI / 4 : 0);
+        ctx.textAlign = columnStep === 1 && annotate ? "left" : "center";
+        ctx.textBaseline = "top";
+        ctx.fillText(shorten(ctx, String(column), 120), 0, 0);
+        ctx.restore();
+      }
+    });
+  }
+
+  function boxPlot(container, data, title) {
+    const quantiles = decode(data.quantiles);
+    const means = decode(data.mean);
+    const counts = decode(data.count);
+    const labels = data.labels;
+    const height = 320;
+    const band = (WIDTH - MARGIN.left - MARGIN.right) / labels.length;
+    const y = linearScale(0, extent(quantiles)[1], height - MARGIN.bottom, MARGIN.top);
+    const ctx = createCanvas(container, WIDTH, height, (px, py) => {
+      const group = Math.floor((px - MARGIN.left) / band);
+      if (!inside(px, py, WIDTH, height) || group >= labels.length) {
+        return null;
+      }
+      const [min, q1, median, q3, max] = quantiles.subarray(group * 5, group * 5 + 5);
+      return (
+        `${labels[group]} (${counts[group]} days)\nmean: ${formatNumber(means[group])}\n` +
+        `median: ${formatNumber(median)}\nquartiles: ${formatNumber(q1)} - ${formatNumber(q3)}\n` +
+        `range: ${formatNumber(min)} - ${formatNumber(max)}`
+      );
+    });
+    drawTitle(ctx, WIDTH, title);
+    drawValueAxis(ctx, y, MARGIN.left, WIDTH - MARGIN.right);
+    labels.forEach((label, i) => {
+      const [min, q1, median, q3, max] = quantiles.subarray(i * 5, i * 5 + 5);
+      const center = MARGIN.left + (i + 0.5) * band;
+      const half = band * 0.3;
+      ctx.textAlign = "center";
+      ctx.fillStyle = COLORS.text;
+      ctx.fillText(shorten(ctx, label, band - 4), center, height - MARGIN.bottom + 18);
+      if (!counts[i]) {
+        return;
+      }
+      ctx.strokeStyle = COLORS.text;
+      ctx.beginPath();
+      ctx.moveTo(center, y(min));
+      ctx.lineTo(center, y(q1));
+      ctx.moveTo(center, y(q3));
+      ctx.lineTo(center, y(max));
+      ctx.moveTo(center - half / 2, y(min));
+      ctx.lineTo(center + half / 2, y(min));
+      ctx.moveTo(center - half / 2, y(max));
+      ctx.lineTo(center + half / 2, y(max));
+      ctx.stroke();
+      ctx.fillStyle = COLORS.fill;
+      ctx.fillRect(center - half, y(q3), 2 * half, y(q1) - y(q3));
+      ctx.strokeRect(center - half, y(q3), 2 * half, y(q1) - y(q3));
+      ctx.beginPath();
+      ctx.moveTo(center - half, y(median));
+      ctx.lineTo(center + half, y(median));
+      ctx.stroke();
+      ctx.fillStyle = "#ffffff";
+      ctx.beginPath();
+      ctx.arc(center, y(means[i]), 3, 0, 2 * Math.PI);
+      ctx.fill();
+      ctx.stroke();
+    });
+  }
+
+  function scatterPlot(container, xValues, yValues, xLabel, yLabel) {
+    const size = WIDTH / 2 - 8;
+    const x = linearScale(...extent(xValues), MARGIN.left, size - MARGIN.right);
+    const y = linearScale(...extent(yValues), size - MARGIN.bottom, MARGIN.top);
+    const ctx = createCanvas(container, size, size, (px, py) => {
+      let nearest = -1;
+      let distance = 64;
+      for (let i = 0; i < xValues.length; i++) {
+        const d = (x(xValues[i]) - px) ** 2 + (y(yValues[i]) - py) ** 2;
+        if (d < distance) {
+          nearest = i;
+          distance = d;
+        }
+      }
+      return nearest < 0 ? null : `traffic: ${formatNumber(xValues[nearest])}\n${yLabel}: ${formatNumber(yValues[nearest])}`;
+    });
+    drawTitle(ctx, size, shorten(ctx, yLabel, size - 16));
+    drawValueAxis(ctx, y, MARGIN.left, size - MARGIN.right);
+    ctx.textAlign = "center";
+    for (const tick of niceTicks(x.domain[0], x.domain[1], 4)) {
+      ctx.fillText(formatNumber(tick), x(tick), size - MARGIN.bottom + 18);
+    }
+    ctx.fillText(xLabel, size / 2, size - 12);
+    ctx.fillStyle = "rgba(65, 90, 119, 0.5)";
+    for (let i = 0; i < xValues.length; i++) {
+      if (!Number.isNaN(xValues[i]) && !Number.isNaN(yValues[i])) {
+        ctx.beginPath();
+        ctx.arc(x(xValues[i]), y(yValues[i]), 2, 0, 2 * Math.PI);
+        ctx.fill();
+      }
+    }
+  }
+
+  // draw all charts of the report; `charts` maps chart name to its payload
+  function drawReport(charts) {
+    const element = (id) => document.getElementById(id);
+    lineChart(element("daily-traffic-chart"), charts.daily_traffic, "Total daily traffic");
+    const matrix = charts.correlations;
+    heatmap(element("correlations-chart"), matrix.labels, matrix.labels, decode(matrix.values),
+      "Correlation matrix", { annotate: true });
+    for (const [period, data] of Object.entries(charts.seasonal_traffic)) {
+      boxPlot(element("seasonal-traffic-chart"), data, period);
+    }
+    const weather = charts.weather;
+    const traffic = decode(weather.traffic);
+    for (const factor of weather.factors) {
+      scatterPlot(element("weather-chart"), traffic, decode(factor.values), "total_daily_traffic", factor.name);
+    }
+    const lagged = charts.lagged_correlations;
+    if (lagged) {
+      heatmap(element("lagged-correlations-chart"), lagged.factors, lagged.lags, decode(lagged.values),
+        `Correlations of lagged weather factors with ${lagged.target}`, { columnStep: 5 });
+    }
+  }
+
+  window.KrakowCharts = { decode, lineChart, heatmap, boxPlot, scatterPlot, drawReport };
+})();
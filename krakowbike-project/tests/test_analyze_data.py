@@ -5,7 +5,9 @@ import pandas as pd
 import pytest
 import src
 from src.krakowbike.analyze_data import (
+    bootstrap_group_means,
     calculate_basic_statistics,
+    calculate_lagged_weather_correlations,
     calculate_seasonal_trends,
     calculate_weather_correlations,
     weather_summary,
@@ -197,3 +199,213 @@ def test_sorting_calculate_weather_correlations(monkeypatch, sample_dataframe):
     abs_correlations = [abs(val) for val in correlations_values]
 
     assert abs_correlations == sorted(abs_correlations, reverse=True)
+
+
+#########################################
+
+
+# tests for by_street mode
+def _street_as_total(df, street):
+    df = df.copy()
+    df["total_daily_traffic"] = df[street]
+    return df
+
+
+def test_calculate_basic_statistics_by_street(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    result = calculate_basic_statistics(sample_dataframe, by_street=True)
+
+    assert list(result.index) == MOCK_STREET_NAMES
+    assert list(result.columns) == ["mean", "std", "min", "max"]
+    expected = sample_dataframe[MOCK_STREET_NAMES]
+    assert np.allclose(result["mean"], expected.mean(), atol=0.01)
+    assert np.allclose(result["std"], expected.std(), atol=0.01)
+
+
+def test_weather_summary_by_street(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "AIR_COLUMN", MOCK_AIR_COLUMN)
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    result = weather_summary(sample_dataframe, by_street=True)
+
+    for street in MOCK_STREET_NAMES:
+        expected = weather_summary(_street_as_total(sample_dataframe, street))
+        for key, val in expected.items():
+            pd.testing.assert_frame_equal(
+                result[key][street], val, check_dtype=False, check_names=False
+            )
+
+
+def test_calculate_seasonal_trends_by_street(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(
+        src.krakowbike.analyze_data, "MONTH_TO_SEASON", MOCK_MONTH_TO_SEASON
+    )
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    result = calculate_seasonal_trends(sample_dataframe, by_street=True)
+
+    for street in MOCK_STREET_NAMES:
+        expected = calculate_seasonal_trends(_street_as_total(sample_dataframe, street))
+        for key, val in expected.items():
+            pd.testing.assert_frame_equal(
+                result[key][street], val, check_dtype=False, check_names=False,
+                check_index_type=False,
+            )
+
+
+def test_calculate_weather_correlations_by_street(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    result = calculate_weather_correlations(sample_dataframe, by_street=True)
+
+    assert isinstance(result, pd.DataFrame)
+    assert list(result.columns) == MOCK_STREET_NAMES
+    for street in ["street_a", "street_b"]:
+        expected = calculate_weather_correlations(
+            _street_as_total(sample_dataframe, street)
+        )
+        for weather_col, val in expected.items():
+            assert np.isclose(result.loc[weather_col, street], val)
+
+
+# tests for calculate_lagged_weather_correlations function
+def test_calculate_lagged_weather_correlations(monkeypatch):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01", periods=100, freq="D")
+    df = pd.DataFrame(
+        {
+            "street_a": rng.random(100) * 100,
+            "street_b": np.arange(100) + rng.random(100) * 10,
+            "Suma dobowa opadów [mm]": rng.random(100),
+            "Air_quality_column": 1000 + rng.random(100),
+        },
+        index=index,
+    )
+    df["total_daily_traffic"] = df["street_a"] + df["street_b"]
+
+    result = calculate_lagged_weather_correlations(df, max_lag=10)
+
+    assert list(result.columns) == ["weather_factor", "target", "lag", "correlation"]
+    assert len(result) == 2 * 3 * 11
+    for row in result.itertuples():
+        expected = df[row.target].corr(df[row.weather_factor].shift(row.lag))
+        assert np.isclose(row.correlation, expected)
+
+
+def test_calculate_lagged_weather_correlations_total_only(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    result = calculate_lagged_weather_correlations(sample_dataframe, max_lag=0, by_street=False)
+    expected = calculate_weather_correlations(sample_dataframe)
+
+    assert set(result["target"]) == {"total_daily_traffic"}
+    for row in result.itertuples():
+        assert np.isclose(row.correlation, expected[row.weather_factor])
+
+
+def test_calculate_lagged_weather_correlations_invalid_lag(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    with pytest.raises(ValueError):
+        calculate_lagged_weather_correlations(sample_dataframe, max_lag=4)
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        pd.DatetimeIndex(["2023-01-01", "2023-01-02", "2023-01-04", "2023-01-05", "2023-01-06"]),
+        pd.DatetimeIndex(["2023-01-02", "2023-01-01", "2023-01-03", "2023-01-04", "2023-01-05"]),
+        pd.DatetimeIndex(["2023-01-01", "2023-01-02", "2023-01-02", "2023-01-03", "2023-01-04"]),
+    ],
+    ids=["gap", "unordered", "duplicate"],
+)
+def test_calculate_lagged_weather_correlations_requires_consecutive_days(
+    monkeypatch, sample_dataframe, index
+):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    sample_dataframe.index = index
+    with pytest.raises(ValueError, match="consecutive days"):
+        calculate_lagged_weather_correlations(sample_dataframe, max_lag=2)
+
+
+# tests for bootstrap_group_means function
+def test_bootstrap_group_means():
+    rng = np.random.default_rng(0)
+    codes = np.repeat([0, 2, -1], [400, 100, 50])
+    block = rng.normal(10, 2, (550, 2))
+    block[::5, 1] = np.nan
+
+    low, high = bootstrap_group_means(codes, 3, block, n_resamples=2000)
+
+    assert low.shape == high.shape == (3, 2)
+    assert np.isnan(low[1]).all() and np.isnan(high[1]).all()
+    for group, rows in [(0, slice(0, 400)), (2, slice(400, 500))]:
+        means = np.nanmean(block[rows], axis=0)
+        stds = np.nanstd(block[rows], axis=0, ddof=1)
+        counts = (~np.isnan(block[rows])).sum(axis=0)
+        assert np.all(low[group] < means) and np.all(means < high[group])
+        # percentile intervals of a normal sample are close to the normal ones
+        assert np.allclose(high[group] - low[group], 2 * 1.96 * stds / np.sqrt(counts), rtol=0.15)
+
+
+def test_bootstrap_group_means_is_reproducible():
+    rng = np.random.default_rng(1)
+    codes = rng.integers(0, 7, 1000)
+    block = rng.random((1000, 3))
+
+    first = bootstrap_group_means(codes, 7, block, n_resamples=500, seed=3, workers=1)
+    second = bootstrap_group_means(codes, 7, block, n_resamples=500, seed=3, workers=4)
+    other = bootstrap_group_means(codes, 7, block, n_resamples=500, seed=4)
+
+    assert np.array_equal(first[0], second[0]) and np.array_equal(first[1], second[1])
+    assert not np.array_equal(first[0], other[0])
+
+
+def test_bootstrap_group_means_invalid_arguments():
+    with pytest.raises(ValueError):
+        bootstrap_group_means(np.zeros(3, dtype=int), 1, np.ones((3, 1)), confidence=1.5)
+    with pytest.raises(ValueError):
+        bootstrap_group_means(np.zeros(3, dtype=int), 1, np.ones((3, 1)), n_resamples=0)
+
+
+def test_seasonal_trends_confidence_intervals(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    result = calculate_seasonal_trends(sample_dataframe, n_resamples=200)
+    by_street = calculate_seasonal_trends(sample_dataframe, by_street=True, n_resamples=200)
+
+    for key, table in result.items():
+        assert list(table.columns) == ["mean", "sum", "std", "ci_low", "ci_high"]
+        assert (table["ci_low"] <= table["mean"]).all()
+        assert (table["mean"] <= table["ci_high"]).all()
+        assert list(by_street[key]["street_a"].columns) == list(table.columns)
+
+
+def test_weather_summary_confidence_intervals(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "AIR_COLUMN", MOCK_AIR_COLUMN)
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    result = weather_summary(sample_dataframe, n_resamples=200)
+
+    for table in result.values():
+        assert list(table.columns) == ["mean", "std", "count", "ci_low", "ci_high"]
+        assert (table["ci_low"] <= table["mean"]).all()
+        assert (table["mean"] <= table["ci_high"]).all()
+    # single-day groups have a degenerate interval
+    single = result["temperature_impact"]["count"] == 1
+    assert (result["temperature_impact"]["ci_low"][single] == result["temperature_impact"]["mean"][single]).all()
+
+
+def test_seasonal_trends_hourly_patterns(monkeypatch, sample_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    index = pd.date_range("2023-01-01", periods=48, freq="h")
+    hourly_df = pd.DataFrame(
+        {"street_a": np.arange(48.0), "street_b": np.where(index.hour == 3, np.nan, 1.0)},
+        index=index,
+    )
+
+    result = calculate_seasonal_trends(sample_dataframe, hourly_df=hourly_df)
+    by_street = calculate_seasonal_trends(sample_dataframe, by_street=True, hourly_df=hourly_df)
+
+    total = hourly_df.sum(axis=1).groupby(index.hour).agg(["mean", "sum", "std"])
+    assert list(result["hourly_patterns"].index) == list(range(24))
+    assert np.allclose(result["hourly_patterns"], round(total, 2))
+    assert np.allclose(
+        by_street["hourly_patterns"]["street_a"],
+        round(hourly_df["street_a"].groupby(index.hour).agg(["mean", "sum", "std"]), 2),
+    )
+    assert np.isnan(by_street["hourly_patterns"].loc[3, ("street_b", "mean")])
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+import src
+from src.krakowbike.analyze_data import (
+    calculate_basic_statistics,
+    calculate_seasonal_trends,
+    calculate_weather_correlations,
+    calendar_codes,
+    cut_codes,
+    get_backend,
+    set_backend,
+    weather_summary,
+)
+
+MOCK_STREET_NAMES = ["street_a", "street_b", "street_c"]
+MOCK_AIR_COLUMN = "Air_quality_column"
+
+
+@pytest.fixture
+def random_dataframe(monkeypatch):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    monkeypatch.setattr(src.krakowbike.analyze_data, "AIR_COLUMN", MOCK_AIR_COLUMN)
+    rng = np.random.default_rng(0)
+    n_days = 800
+    df = pd.DataFrame(
+        {
+            "street_a": rng.poisson(100, n_days).astype(float),
+            "street_b": rng.poisson(500, n_days).astype(float),
+            "street_c": rng.poisson(50, n_days).astype(float),
+            "Średnia temperatura dobowa [°C]": rng.normal(10, 10, n_days).round(),
+            "Suma dobowa opadów [mm]": rng.exponential(2, n_days).round(1),
+            "Air_quality_column": rng.uniform(0, 200, n_days).round(),
+        },
+        index=pd.date_range("2019-11-15", periods=n_days, freq="D"),
+    )
+    # missing values and values lying on the edges of the weather categories
+    for col, rate in [("street_b", 0.1), ("Air_quality_column", 0.05)]:
+        df.loc[rng.random(n_days) < rate, col] = np.nan
+    df.iloc[::7, 3] = 0.0
+    df.iloc[::5, 4] = 1.0
+    df["total_daily_traffic"] = df[MOCK_STREET_NAMES].sum(axis=1)
+    return df
+
+
+def assert_same_results(expected, result):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(expected, result)
+    else:
+        assert list(expected) == list(result)
+        for key, value in expected.items():
+            assert_same_results(value, result[key])
+
+
+@pytest.mark.parametrize("by_street", [False, True])
+@pytest.mark.parametrize(
+    "analysis, kwargs",
+    [
+        (calculate_basic_statistics, {}),
+        (weather_summary, {}),
+        (weather_summary, {"n_resamples": 100}),
+        (calculate_seasonal_trends, {}),
+        (calculate_seasonal_trends, {"n_resamples": 100}),
+        (calculate_seasonal_trends, {"for_html": True}),
+    ],
+)
+def test_backends_give_same_results(random_dataframe, analysis, kwargs, by_street):
+    expected = analysis(random_dataframe, by_street=by_street, backend="pandas", **kwargs)
+    result = analysis(random_dataframe, by_street=by_street, backend="numpy", **kwargs)
+
+    if kwargs.get("for_html"):
+        assert result == expected
+    else:
+        assert_same_results(expected, result)
+
+
+@pytest.mark.parametrize("by_street", [False, True])
+def test_backends_give_same_correlations(random_dataframe, by_street):
+    expected = calculate_weather_correlations(
+        random_dataframe, by_street=by_street, backend="pandas"
+    )
+    result = calculate_weather_correlations(random_dataframe, by_street=by_street, backend="numpy")
+
+    if by_street:
+        pd.testing.assert_frame_equal(expected, result)
+    else:
+        assert list(result) == list(expected)
+        assert np.allclose(list(result.values()), list(expected.values()))
+
+
+def test_numpy_correlations_use_complete_pairs(random_dataframe):
+    random_dataframe["constant"] = 1.0
+    expected = {
+        col: random_dataframe["total_daily_traffic"].corr(random_dataframe[col])
+        for col in ["Air_quality_column", "constant"]
+    }
+    result = calculate_weather_correlations(random_dataframe, backend="numpy")
+
+    assert np.isclose(result["Air_quality_column"], expected["Air_quality_column"])
+    assert np.isnan(result["constant"]) and np.isnan(expected["constant"])
+
+
+def test_set_backend(monkeypatch, random_dataframe):
+    monkeypatch.setattr(src.krakowbike.analyze_data, "_backend", "pandas")
+    set_backend("numpy")
+
+    assert get_backend() == "numpy"
+    assert get_backend("pandas") == "pandas"
+    pd.testing.assert_frame_equal(
+        calculate_basic_statistics(random_dataframe),
+        calculate_basic_statistics(random_dataframe, backend="pandas"),
+    )
+
+
+def test_invalid_backend(random_dataframe):
+    with pytest.raises(ValueError):
+        set_backend("polars")
+    with pytest.raises(ValueError):
+        weather_summary(random_dataframe, backend="polars")
+
+
+def test_cut_codes():
+    values = np.array([-np.inf, -5.0, 0.0, 0.5, 10.0, 25.0, np.inf, np.nan])
+    bins = [-float("inf"), 0, 10, 20, float("inf")]
+
+    expected = pd.cut(values, bins=bins).codes
+
+    assert np.array_equal(cut_codes(values, bins), expected)
+
+
+def test_calendar_codes(monkeypatch):
+    monkeypatch.setattr(
+        src.krakowbike.analyze_data, "MONTH_TO_SEASON", {"January": "Winter", "June": "Summer"}
+    )
+    index = pd.DatetimeIndex(["2020-01-31", "2021-06-01", None, "2023-12-24", "2020-01-01"])
+
+    codes = calendar_codes(index)
+
+    keys = {
+        "year": index.year,
+        "month": index.month_name(),
+        "season": index.month_name().map({"January": "Winter", "June": "Summer"}),
+        "day_of_week": index.day_name(),
+    }
+    for period, values in keys.items():
+        period_codes, labels = codes[period]
+        present = np.asarray(pd.notna(values))
+        assert labels.name == period
+        assert labels.is_monotonic_increasing
+        assert np.array_equal(period_codes >= 0, present)
+        assert list(labels[period_codes[present]]) == list(np.asarray(values)[present])
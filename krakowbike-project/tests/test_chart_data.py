@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import src
+from jinja2 import Environment, FileSystemLoader
+from src.krakowbike.chart_data import (
+    daily_traffic_chart_data,
+    decode_array,
+    encode_array,
+    grouped_quantiles,
+    lagged_correlations_chart_data,
+    seasonal_traffic_chart_data,
+    weather_impact_chart_data,
+)
+
+MOCK_AIR_COLUMN = "Air_quality_column"
+TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "templates")
+
+
+@pytest.fixture
+def chart_dataframe(monkeypatch):
+    monkeypatch.setattr(src.krakowbike.chart_data, "AIR_COLUMN", MOCK_AIR_COLUMN)
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01", periods=400, freq="D")
+    df = pd.DataFrame(
+        {
+            "Średnia temperatura dobowa [°C]": rng.normal(10, 8, 400),
+            "Suma dobowa opadów [mm]": rng.exponential(2, 400),
+            "Air_quality_column": rng.uniform(0, 200, 400),
+            "total_daily_traffic": rng.poisson(1000, 400).astype(float),
+        },
+        index=index,
+    )
+    df.iloc[::9, 3] = np.nan
+    return df
+
+
+def test_encode_array():
+    values = np.array([[1.5, np.nan], [-2.0, 3.25]])
+
+    payload = encode_array(values)
+
+    assert payload["dtype"] == "float32" and payload["shape"] == [2, 2]
+    np.testing.assert_array_equal(decode_array(payload), values)
+    np.testing.assert_array_equal(decode_array(encode_array([1, -2], "int32")), [1, -2])
+    with pytest.raises(ValueError):
+        encode_array(values, "float64")
+
+
+def test_grouped_quantiles():
+    rng = np.random.default_rng(1)
+    codes = rng.integers(-1, 4, 200)
+    values = rng.normal(size=200)
+    values[::7] = np.nan
+    quantiles = [0.0, 0.1, 0.5, 0.75, 1.0]
+
+    result = grouped_quantiles(codes, 6, values, quantiles)
+
+    for group in range(4):
+        group_values = values[(codes == group) & ~np.isnan(values)]
+        assert np.allclose(result[group], np.quantile(group_values, quantiles))
+    assert np.isnan(result[4:]).all()
+
+
+def test_daily_traffic_chart_data(chart_dataframe):
+    chart = daily_traffic_chart_data(chart_dataframe)
+
+    days = decode_array(chart["days"])
+    assert days[0] == (pd.Timestamp("2023-01-01") - pd.Timestamp("1970-01-01")).days
+    assert np.array_equal(np.diff(days), np.ones(399))
+    np.testing.assert_array_equal(
+        decode_array(chart["values"]), chart_dataframe["total_daily_traffic"].astype("float32")
+    )
+
+
+def test_seasonal_traffic_chart_data(chart_dataframe):
+    chart = seasonal_traffic_chart_data(chart_dataframe)
+
+    traffic = chart_dataframe["total_daily_traffic"]
+    expected = traffic.groupby(chart_dataframe.index.day_name()).agg(
+        ["min", "median", "max", "mean", "count"]
+    )
+    weekly = chart["day_of_week"]
+    assert weekly["labels"][0] == "Monday"
+    quantiles = pd.DataFrame(decode_array(weekly["quantiles"]), index=weekly["labels"])
+    assert np.allclose(quantiles[[0, 2, 4]], expected.loc[weekly["labels"], ["min", "median", "max"]])
+    assert np.allclose(decode_array(weekly["mean"]), expected.loc[weekly["labels"], "mean"])
+    assert list(decode_array(weekly["count"])) == list(expected.loc[weekly["labels"], "count"])
+    assert chart["season"]["labels"] == ["Winter", "Spring", "Summer", "Autumn"]
+
+
+def test_lagged_correlations_chart_data():
+    lagged = pd.DataFrame(
+        {
+            "weather_factor": ["a", "a", "b", "b", "a", "a", "b", "b"],
+            "target": ["total_daily_traffic"] * 4 + ["street"] * 4,
+            "lag": [0, 1] * 4,
+            "correlation": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8],
+        }
+    )
+
+    chart = lagged_correlations_chart_data(lagged)
+
+    assert chart["factors"] == ["a", "b"] and chart["lags"] == [0, 1]
+    assert np.allclose(decode_array(chart["values"]), [[0.1, 0.2], [0.3, 0.4]])
+
+
+def test_interactive_template_embeds_chart_data(chart_dataframe):
+    template = Environment(loader=FileSystemLoader(TEMPLATES_PATH)).get_template(
+        "report_interactive.html"
+    )
+    charts = {
+        "daily_traffic_chart": daily_traffic_chart_data(chart_dataframe),
+        "correlations_chart": {"labels": [], "values": encode_array([])},
+        "seasonal_traffic_chart": seasonal_traffic_chart_data(chart_dataframe),
+        "weather_chart": weather_impact_chart_data(chart_dataframe),
+    }
+
+    html = template.render(
+        weather_dict={}, seasonal_dict={}, weather_corrs={}, model_dict={}, **charts
+    )
+
+    assert "data:image" not in html
+    assert "window.KrakowCharts" in html
+    assert charts["daily_traffic_chart"]["values"]["data"] in html
+    assert "lagged_correlations: null" in html
@@ -0,0 +1,251 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import src
+from src.krakowbike.analyze_data import calculate_seasonal_trends, weather_summary
+from src.krakowbike.city_data import (
+    City,
+    DataSource,
+    calculate_city_seasonal_trends,
+    calculate_city_statistics,
+    calculate_city_weather_correlations,
+    city_frame,
+    city_weather_summary,
+    get_city,
+    load_cities,
+    load_city_registry,
+    register_city,
+)
+
+CITY_COLUMNS = {
+    "alpha": {
+        "streets": ["North", "South"],
+        "air": ["Alpha station PM10", "Alpha station PM2.5"],
+        "temperature": "temp",
+        "precipitation": "rain",
+    },
+    "beta": {
+        "streets": ["Bridge"],
+        "air": ["Beta station PM10"],
+        "temperature": "Średnia temperatura dobowa [°C]",
+        "precipitation": "Suma dobowa opadów [mm]",
+    },
+}
+
+
+def write_city_data(path, seed, columns):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2018-01-01", "2019-12-31", freq="D").strftime("%Y-%m-%d")
+    n_days = len(dates)
+    temperature = rng.normal(10, 8, n_days)
+    bikes = pd.DataFrame(
+        {street: rng.poisson(500 + 30 * temperature.clip(0)) for street in columns["streets"]},
+        index=pd.Index(dates, name="Data"),
+    )
+    bikes.iloc[::11, 0] = np.nan
+    weather = pd.DataFrame(
+        {
+            columns["temperature"]: temperature,
+            columns["precipitation"]: rng.exponential(2, n_days),
+            "wind": rng.uniform(0, 10, n_days),
+        },
+        index=bikes.index,
+    )
+    air = pd.DataFrame(
+        {station: rng.uniform(5, 200, n_days) for station in columns["air"]},
+        index=bikes.index,
+    )
+    path.mkdir()
+    bikes.to_csv(path / "rowery.csv")
+    weather.to_csv(path / "pogoda.csv")
+    air.to_csv(path / "powietrze.csv")
+
+
+@pytest.fixture
+def cities(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.krakowbike.city_data, "CITIES", {})
+    for seed, (name, columns) in enumerate(CITY_COLUMNS.items()):
+        write_city_data(tmp_path / f"{name}_data", seed, columns)
+        register_city(
+            City(
+                name,
+                f"{name}_data",
+                columns["streets"],
+                columns["air"],
+                columns["temperature"],
+                columns["precipitation"],
+            )
+        )
+    return tmp_path
+
+
+def test_city_validation():
+    with pytest.raises(ValueError):
+        City("empty", "data", [], ["station"])
+    with pytest.raises(ValueError):
+        DataSource("rowery", "median")
+    with pytest.raises(ValueError):
+        get_city("atlantis")
+
+
+def test_city_bike_source_averages_hourly_temperature(tmp_path):
+    index = pd.date_range("2023-01-01", periods=24, freq="h")
+    pd.DataFrame(
+        {"Main": np.full(24, 5.0), "t": np.full(24, 10.0)},
+        index=pd.Index(index.strftime("%Y-%m-%d %H:%M"), name="Data"),
+    ).to_csv(tmp_path / "rowery.csv")
+    city = City("gamma", "gamma_data", ["Main"], ["Gamma PM10"], "t", "p")
+
+    result = city.sources["bike"].load(tmp_path)
+
+    assert result.loc["2023-01-01"].to_dict() == {"Main": 120.0, "t": 10.0}
+
+
+def test_load_city_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.krakowbike.city_data, "CITIES", {})
+    city = City("gamma", "gamma_data", ["Main"], ["Gamma PM10"], "t", "p")
+    city.sources["bike"] = DataSource("liczniki")
+    registry_path = tmp_path / "cities.json"
+    registry_path.write_text(json.dumps([city.to_dict()]), encoding="utf-8")
+
+    assert load_city_registry(registry_path) == ["gamma"]
+    assert get_city("gamma").to_dict() == city.to_dict()
+
+
+def test_load_cities(cities):
+    stacked = load_cities(project_path=cities)
+
+    assert stacked.index.names == ["city", "date"]
+    assert stacked.index.levels[0].tolist() == ["alpha", "beta"]
+    assert stacked.columns[:4].tolist() == [
+        "temperature",
+        "precipitation",
+        "air_quality",
+        "total_daily_traffic",
+    ]
+    assert stacked.loc["beta", "South"].isna().all()
+    alpha = city_frame(stacked, "alpha")
+    pd.testing.assert_frame_equal(
+        alpha[sorted(alpha.columns)],
+        get_city("alpha").load(cities)[sorted(alpha.columns)],
+        check_freq=False,
+        check_names=False,
+    )
+
+
+def test_city_load_from_store(cities, monkeypatch):
+    city = get_city("alpha")
+    store_dir = cities / "store"
+    saves = []
+    save = src.krakowbike.city_data.save_preprocessed_dataset
+    monkeypatch.setattr(
+        src.krakowbike.city_data,
+        "save_preprocessed_dataset",
+        lambda *args: saves.append(args[1]) or save(*args),
+    )
+
+    stored = city.load(cities, "2018-02-01", "2019-06-30", store_dir=store_dir)
+    city.load(cities, store_dir=store_dir)
+
+    expected = city.load(cities, "2018-02-01", "2019-06-30")
+    pd.testing.assert_frame_equal(
+        stored, expected, check_freq=False, check_index_type=False
+    )
+    base = stored["North"].to_numpy()
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+    assert saves == [store_dir]
+
+    weather = cities / "alpha_data" / "pogoda.csv"
+    weather.write_text(weather.read_text().replace("\n2018-01-01,", "\n2018-01-01,1", 1))
+    city.load(cities, store_dir=store_dir)
+    city.load(cities, imputation="interpolate", store_dir=store_dir)
+    assert saves == [store_dir] * 3
+
+
+def test_calculate_city_seasonal_trends(cities):
+    stacked = load_cities(project_path=cities)
+
+    trends = calculate_city_seasonal_trends(stacked)
+
+    for name in CITY_COLUMNS:
+        expected = calculate_seasonal_trends(city_frame(stacked, name), backend="pandas")
+        for k, v in expected.items():
+            pd.testing.assert_frame_equal(trends[k].loc[name], v, check_names=False)
+
+
+def test_city_frame_street_analyses(cities):
+    stacked = load_cities(project_path=cities)
+    city = get_city("alpha")
+    df = city_frame(stacked, "alpha")
+
+    trends = calculate_seasonal_trends(
+        df, by_street=True, street_names=city.street_names
+    )
+    summary = weather_summary(
+        df,
+        by_street=True,
+        street_names=city.street_names,
+        category_columns=city.category_columns(),
+    )
+
+    months = pd.DatetimeIndex(df.index).month_name()
+    for street in city.street_names:
+        expected = df[street].groupby(months).mean().round(2)
+        result = trends["monthly_patterns"][street]["mean"]
+        assert np.allclose(result.to_numpy(), expected.loc[result.index].to_numpy())
+    assert set(summary["temperature_impact"].columns.get_level_values(0)) == {
+        "North",
+        "South",
+    }
+    assert summary["air_quality_impact"].notna().to_numpy().any()
+
+
+def test_city_weather_summary(cities):
+    stacked = load_cities(project_path=cities)
+
+    summary = city_weather_summary(stacked)
+
+    categories = pd.cut(stacked["temperature"], [-np.inf, 0, 10, 20, np.inf])
+    expected = stacked.groupby(
+        [stacked.index.get_level_values("city"), categories.cat.codes], observed=True
+    )["total_daily_traffic"].agg(["mean", "std", "count"])
+    result = summary["temperature_impact"]
+    assert result.index.names == ["city", "temp_category"]
+    assert np.allclose(result.to_numpy(), round(expected, 2).to_numpy())
+
+
+def test_calculate_city_weather_correlations(cities):
+    stacked = load_cities(project_path=cities)
+
+    correlations = calculate_city_weather_correlations(stacked)
+
+    assert "North" not in correlations.index and "Bridge" not in correlations.index
+    assert np.isnan(correlations.loc["Alpha station PM2.5", "beta"])
+    for name in CITY_COLUMNS:
+        df = stacked.loc[name]
+        for factor in ["temperature", "wind", "air_quality"]:
+            assert np.isclose(
+                correlations.loc[factor, name], df["total_daily_traffic"].corr(df[factor])
+            )
+
+
+def test_calculate_city_statistics(cities):
+    stacked = load_cities(project_path=cities)
+
+    statistics = calculate_city_statistics(stacked)
+
+    expected = (
+        stacked.groupby(level="city")
+        .agg(["mean", "std", "min", "max"])
+        .stack(level=0, future_stack=True)
+        .dropna(how="all")
+    )
+    assert ("beta", "South") not in statistics.index
+    pd.testing.assert_frame_equal(
+        statistics, round(expected.loc[statistics.index], 2), check_names=False
+    )
+    assert len(statistics) == len(expected)
@@ -1,8 +1,15 @@
 import glob
 
+import numpy as np
 import pandas as pd
 import pytest
-from src.krakowbike.load_data import load_data
+from src.krakowbike.load_data import (
+    load_bike_data,
+    load_data,
+    load_hourly_data,
+    load_weather_data,
+    resample_to_daily,
+)
 
 
 @pytest.fixture
@@ -24,3 +31,122 @@ def test_load_data(monkeypatch, sample_dataframe):
     assert isinstance(df, pd.DataFrame)
     assert list(df.columns) == ["street_a"]
     assert list(df.index) == ["2023-01-01", "2023-01-02", "2023-01-01", "2023-01-02"]
+
+
+@pytest.fixture
+def hourly_dataframe():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01", periods=72, freq="h")
+    df = pd.DataFrame(
+        {
+            "street_a": rng.integers(0, 100, 72).astype(float),
+            "street_b": rng.integers(0, 100, 72).astype(float),
+        },
+        index=pd.Index(index.strftime("%Y-%m-%d %H:%M"), name="Data"),
+    )
+    df.iloc[5, 0] = np.nan
+    df.iloc[24:48, 1] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("aggregation", ["sum", "mean"])
+def test_resample_to_daily(hourly_dataframe, aggregation):
+    resampler = hourly_dataframe.set_axis(pd.to_datetime(hourly_dataframe.index)).resample("D")
+    expected = resampler.sum(min_count=1) if aggregation == "sum" else resampler.mean()
+
+    result = resample_to_daily(hourly_dataframe, aggregation)
+
+    assert list(result.index) == ["2023-01-01", "2023-01-02", "2023-01-03"]
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    assert np.isnan(result.loc["2023-01-02", "street_b"])
+
+
+def test_resample_to_daily_irregular_rows(hourly_dataframe):
+    # shuffled rows with a gap and text missing value markers use the bincount path
+    regular = hourly_dataframe.drop(hourly_dataframe.index[30:40])
+    irregular = regular.sample(frac=1, random_state=0).astype(object)
+    irregular.iloc[0, 0] = "-"
+    regular.loc[irregular.index[0], "street_a"] = np.nan
+    expected = (
+        regular.set_axis(pd.to_datetime(regular.index)).resample("D").sum(min_count=1)
+    )
+
+    result = resample_to_daily(irregular)
+
+    assert list(result.index) == ["2023-01-01", "2023-01-02", "2023-01-03"]
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+
+
+def test_resample_to_daily_invalid_aggregation(hourly_dataframe):
+    with pytest.raises(ValueError):
+        resample_to_daily(hourly_dataframe, "max")
+
+
+def test_load_data_resamples_hourly_files(tmp_path, hourly_dataframe):
+    hourly_dataframe.to_csv(tmp_path / "rowery_hourly.csv")
+    hourly_dataframe.iloc[:0].to_csv(tmp_path / "pogoda.csv")
+
+    df = load_data(str(tmp_path), "rowery")
+    hourly = load_hourly_data(str(tmp_path), "rowery")
+
+    assert list(df.index) == ["2023-01-01", "2023-01-02", "2023-01-03"]
+    assert np.allclose(df.to_numpy(), resample_to_daily(hourly_dataframe).to_numpy(), equal_nan=True)
+    assert isinstance(hourly.index, pd.DatetimeIndex)
+    assert hourly.shape == (72, 2)
+
+
+def test_resample_to_daily_column_aggregations():
+    index = pd.date_range("2023-01-01", periods=48, freq="h")
+    df = pd.DataFrame(
+        {
+            "Suma dobowa opadów [mm]": np.r_[np.full(24, 0.5), np.zeros(24)],
+            "Średnia temperatura dobowa [°C]": np.arange(48.0),
+        },
+        index=pd.Index(index.strftime("%Y-%m-%d %H:%M"), name="Data"),
+    )
+
+    result = resample_to_daily(df, "mean", {"Suma dobowa opadów [mm]": "sum"})
+
+    assert list(result["Suma dobowa opadów [mm]"]) == [12.0, 0.0]
+    assert list(result["Średnia temperatura dobowa [°C]"]) == [11.5, 35.5]
+    with pytest.raises(ValueError):
+        resample_to_daily(df, "mean", {"Suma dobowa opadów [mm]": "max"})
+
+
+def test_load_weather_data_sums_hourly_precipitation(tmp_path):
+    index = pd.date_range("2023-01-01", periods=24, freq="h")
+    pd.DataFrame(
+        {"Suma dobowa opadów [mm]": np.full(24, 0.25), "temperatura [°C]": np.full(24, 3.0)},
+        index=pd.Index(index.strftime("%Y-%m-%d %H:%M"), name="Data"),
+    ).to_csv(tmp_path / "pogoda_hourly.csv")
+
+    result = load_weather_data(tmp_path)
+
+    assert result.loc["2023-01-01", "Suma dobowa opadów [mm]"] == 6.0
+    assert result.loc["2023-01-01", "temperatura [°C]"] == 3.0
+
+
+def test_load_bike_data_averages_hourly_temperature(tmp_path):
+    index = pd.date_range("2023-01-01", periods=48, freq="h")
+    pd.DataFrame(
+        {
+            "Bulwary": np.full(48, 5.0),
+            "Maksymalna temperatura dobowa [°C]": np.full(48, 12.0),
+            "Minimalna temperatura dobowa [°C]": np.full(48, 8.0),
+            "Średnia temperatura dobowa [°C]": np.full(48, 10.0),
+            "Temperatura minimalna przy gruncie [°C]": np.full(48, 6.0),
+            "Suma dobowa opadów [mm]": np.full(48, 0.5),
+        },
+        index=pd.Index(index.strftime("%Y-%m-%d %H:%M"), name="Data"),
+    ).to_csv(tmp_path / "rowery_hourly.csv")
+
+    result = load_bike_data(tmp_path)
+
+    assert result.loc["2023-01-02"].to_dict() == {
+        "Bulwary": 120.0,
+        "Maksymalna temperatura dobowa [°C]": 12.0,
+        "Minimalna temperatura dobowa [°C]": 8.0,
+        "Średnia temperatura dobowa [°C]": 10.0,
+        "Temperatura minimalna przy gruncie [°C]": 6.0,
+        "Suma dobowa opadów [mm]": 12.0,
+    }
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+from src.krakowbike.__main__ import (
+    add_report_sections,
+    calculate_report_data,
+    load_report_dataset,
+    main,
+    render_report,
+)
+from src.krakowbike.report_build import ReportBuild, Section
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+def test_report_of_short_period(tmp_path):
+    df = load_report_dataset(PROJECT_PATH, "2018-01-01", "2018-01-03")
+    data = calculate_report_data(df, mode="interactive")
+    report_path = tmp_path / "report.html"
+
+    render_report(
+        *data.values(),
+        names=list(data),
+        templates_path=os.path.join(PROJECT_PATH, "templates"),
+        report_path=str(report_path),
+        template_name="report_interactive.html",
+    )
+
+    assert data["model_dict"]["errors"]
+    assert "Regression model" in report_path.read_text(encoding="utf-8")
+
+
+def test_backend_is_part_of_section_fingerprints(tmp_path):
+    df = load_report_dataset(PROJECT_PATH, "2018-01-01", "2018-03-31")
+    explanations = {}
+    for backend in ["pandas", "numpy"]:
+        graph = {"dataset": Section(lambda: df)}
+        section = add_report_sections(
+            graph,
+            "dataset",
+            os.path.join(PROJECT_PATH, "templates"),
+            str(tmp_path / "report.html"),
+            mode="interactive",
+            backend=backend,
+        )
+        build = ReportBuild(graph, str(tmp_path / "cache"))
+        build.build([section])
+        explanations[backend] = build.explanations
+
+    assert (
+        "basic_statistics: rebuilt (changed parameter backend)" in explanations["numpy"]
+    )
+
+
+@pytest.mark.parametrize(
+    "period",
+    ["2018-01-01", "a:b:c", "2018-01-01:2018-13-01", "2019-01-01:2018-01-01", "2016-01-01:2018-01-01"],
+)
+def test_invalid_batch_period(monkeypatch, capsys, tmp_path, period):
+    monkeypatch.setattr(
+        sys, "argv", ["genreport", "-p", PROJECT_PATH, "-o", str(tmp_path), "-b", period]
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
+    assert "Invalid" in capsys.readouterr().err
+    assert not any(tmp_path.iterdir())
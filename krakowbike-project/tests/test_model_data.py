@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+import src
+from src.krakowbike.model_data import (
+    LinearTrafficModel,
+    build_design_matrix,
+    calculate_model_summary,
+    cross_validate_model,
+)
+
+MOCK_STREET_NAMES = ["street_a", "street_b"]
+
+
+@pytest.fixture
+def model_dataframe(monkeypatch):
+    monkeypatch.setattr(src.krakowbike.model_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    rng = np.random.default_rng(0)
+    # three years, so that every cross-validation training set contains all months
+    index = pd.date_range("2023-01-01", periods=1095, freq="D")
+    temperature = rng.normal(10, 8, 1095)
+    rain = rng.exponential(2, 1095)
+    df = pd.DataFrame(
+        {
+            "street_a": 100 + 5 * temperature - 10 * rain + 30 * (index.dayofweek >= 5),
+            "street_b": 50 + 2 * temperature + rng.normal(0, 1, 1095),
+            "Średnia temperatura dobowa [°C]": temperature,
+            "Suma dobowa opadów [mm]": rain,
+        },
+        index=index,
+    )
+    df["total_daily_traffic"] = df["street_a"] + df["street_b"]
+    return df
+
+
+def test_build_design_matrix(model_dataframe):
+    features, names = build_design_matrix(model_dataframe, ["Suma dobowa opadów [mm]"])
+
+    assert features.shape == (1095, 1 + 6 + 11)
+    assert len(names) == features.shape[1]
+    # 2023-01-01 is a Sunday in January
+    assert features[0, names.index("day_of_week: Sunday")] == 1
+    assert features[0, 1:].sum() == 1
+
+
+def test_linear_model_matches_lstsq(model_dataframe):
+    model = LinearTrafficModel(model_dataframe)
+    features, _ = build_design_matrix(model_dataframe, model.weather_columns)
+    design = np.column_stack([np.ones(1095), features])
+    expected = np.linalg.lstsq(
+        design, model_dataframe[model.targets].to_numpy(), rcond=None
+    )[0]
+
+    predictions = model.predict(model_dataframe)
+
+    assert list(predictions.columns) == ["street_a", "street_b", "total_daily_traffic"]
+    assert np.allclose(predictions.to_numpy(), design @ expected)
+    assert np.allclose(predictions["street_a"], model_dataframe["street_a"])
+
+
+def test_ridge_shrinks_coefficients(model_dataframe):
+    ols = LinearTrafficModel(model_dataframe).coefficients
+    ridge = LinearTrafficModel(model_dataframe, alpha=1000.0).coefficients
+
+    assert np.allclose(ridge.loc["intercept"], ols.loc["intercept"])
+    assert (np.abs(ridge.iloc[1:]).sum() < np.abs(ols.iloc[1:]).sum()).all()
+
+
+def test_linear_model_invalid_alpha(model_dataframe):
+    with pytest.raises(ValueError):
+        LinearTrafficModel(model_dataframe, alpha=-1.0)
+
+
+def test_cross_validate_model_matches_refitting(model_dataframe):
+    result = cross_validate_model(model_dataframe, alphas=[0.0, 5.0], n_folds=4)
+
+    assert list(result.columns) == ["alpha", "target", "rmse", "r2"]
+    assert len(result) == 2 * 3
+    errors = np.zeros(3)
+    for rows in np.array_split(np.arange(1095), 4):
+        train = model_dataframe.drop(model_dataframe.index[rows])
+        test = model_dataframe.iloc[rows]
+        predictions = LinearTrafficModel(train).predict(test)
+        errors += ((predictions - test[predictions.columns]) ** 2).sum().to_numpy()
+    assert np.allclose(result[result["alpha"] == 0]["rmse"], np.sqrt(errors / 1095))
+
+
+def test_cross_validate_model_standardises_on_training_folds(model_dataframe):
+    # unequal fold sizes and unbalanced features make the statistics of
+    # training parts differ from the statistics of the whole dataframe
+    df = model_dataframe.iloc[:1000].copy()
+    df.iloc[:200, df.columns.get_loc("Suma dobowa opadów [mm]")] *= 10
+    result = cross_validate_model(df, alphas=[5.0], n_folds=3)
+
+    errors = np.zeros(3)
+    for rows in np.array_split(np.arange(len(df)), 3):
+        train = df.drop(df.index[rows])
+        test = df.iloc[rows]
+        predictions = LinearTrafficModel(train, alpha=5.0).predict(test)
+        errors += ((predictions - test[predictions.columns]) ** 2).sum().to_numpy()
+    assert np.allclose(result["rmse"], np.sqrt(errors / len(df)))
+
+
+def test_model_street_names(model_dataframe):
+    streets = {"street_a": "North", "street_b": "South"}
+    df = model_dataframe.rename(columns=streets)
+
+    result = calculate_model_summary(df, street_names=["North", "South"])
+
+    expected = calculate_model_summary(model_dataframe).copy()
+    expected["coefficients"] = expected["coefficients"].rename(index=streets)
+    assert list(result["coefficients"].index) == ["North", "South", "total_daily_traffic"]
+    pd.testing.assert_frame_equal(result["coefficients"], expected["coefficients"])
+    assert np.allclose(result["errors"].to_numpy(), expected["errors"].to_numpy())
+
+
+def test_cross_validate_model_invalid_folds(model_dataframe):
+    with pytest.raises(ValueError):
+        cross_validate_model(model_dataframe, n_folds=1)
+
+
+def test_calculate_model_summary(model_dataframe):
+    result = calculate_model_summary(model_dataframe)
+
+    assert list(result["coefficients"].index) == ["street_a", "street_b", "total_daily_traffic"]
+    assert list(result["coefficients"].columns) == [
+        "Średnia temperatura dobowa [°C]",
+        "Suma dobowa opadów [mm]",
+    ]
+    assert result["errors"].shape == (3, 4)
+    assert all(isinstance(v, str) for v in calculate_model_summary(model_dataframe, for_html=True).values())
+
+
+def test_calculate_model_summary_short_period(model_dataframe):
+    result = calculate_model_summary(model_dataframe.iloc[:4], n_folds=5)
+
+    assert result["errors"].empty
+    assert list(result["errors"].index) == ["street_a", "street_b", "total_daily_traffic"]
+    assert result["coefficients"].shape == (3, 2)
@@ -4,11 +4,16 @@ import pytest
 import src.krakowbike.preprocess_data
 from src.krakowbike.preprocess_data import (
     calculate_daily_traffic,
+    climatology_block,
+    day_numbers,
     fill_nan_values_with_mean,
     get_proper_time_period,
+    impute_missing_values,
+    interpolate_block,
     merge_datasets,
     preprocess_dataset,
     remove_empty_columns,
+    seasonal_profile_block,
     set_proper_values_types,
 )
 
@@ -137,6 +142,99 @@ def test_fill_nan_with_mean():
 #########################################
 
 
+# tests for imputation strategies
+def seasonal_traffic(n_days=730, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2018-01-01", periods=n_days, freq="D")
+    seasons = 1 + 0.5 * np.sin(2 * np.pi * dates.dayofyear.to_numpy() / 365)
+    weekdays = np.where(dates.dayofweek.to_numpy() < 5, 1.2, 0.6)
+    profile = seasons * weekdays * rng.lognormal(0, 0.1, n_days)
+    levels = np.array([300.0, 1000.0, 2500.0, 50.0])
+    traffic = profile[:, np.newaxis] * levels * rng.lognormal(0, 0.05, (n_days, 4))
+    return pd.DataFrame(
+        traffic, index=dates.strftime("%Y-%m-%d"), columns=["a", "b", "c", "d"]
+    )
+
+
+def test_interpolate_block():
+    rng = np.random.default_rng(1)
+    dates = pd.DatetimeIndex(
+        np.sort(rng.choice(pd.date_range("2018-01-01", periods=400), 200, replace=False))
+    )
+    block = rng.normal(size=(200, 3))
+    block[rng.random(block.shape) < 0.3] = np.nan
+    block[:5, 0] = np.nan
+    block[-5:, 1] = np.nan
+
+    result = interpolate_block(block, day_numbers(dates))
+
+    expected = pd.DataFrame(block, index=dates).interpolate(
+        method="time", limit_direction="both"
+    )
+    assert np.allclose(result, expected.to_numpy())
+    assert np.isnan(interpolate_block(np.full((3, 1), np.nan), np.arange(3))).all()
+
+
+def test_climatology_block():
+    dates = pd.date_range("2018-01-01", periods=21, freq="D")
+    block = np.arange(21.0)[:, np.newaxis]
+    block[[7, 14], 0] = np.nan
+    block[15:, 0] = np.nan
+
+    result = climatology_block(block, day_numbers(dates))
+
+    # Mondays 2018-01-08 and 2018-01-15 get the value of 2018-01-01, Tuesday
+    # 2018-01-16 the mean of 2018-01-02 and 2018-01-09
+    assert result[7, 0] == result[14, 0] == 0.0
+    assert result[15, 0] == (1.0 + 8.0) / 2
+    assert not np.isnan(result).any()
+
+
+def test_seasonal_profile_block():
+    df = seasonal_traffic()
+    block = df.to_numpy()
+    proportional = block[:, :1] * np.array([1.0, 2.0, 0.5])
+    masked = proportional.copy()
+    masked[100:200, 1] = np.nan
+    masked[::3, 2] = np.nan
+
+    result = seasonal_profile_block(masked, day_numbers(df.index))
+
+    assert np.allclose(result, proportional)
+
+
+def test_impute_missing_values_accuracy(monkeypatch):
+    monkeypatch.setattr(src.krakowbike.preprocess_data, "STREET_NAMES", ["a", "b", "c", "d"])
+    df = seasonal_traffic()
+    rng = np.random.default_rng(2)
+    hidden = rng.random(df.shape) < 0.05
+    hidden[300:390, 1] = True
+    masked = df.mask(hidden)
+
+    errors = {
+        strategy: np.abs(
+            impute_missing_values(masked, strategy).to_numpy()[hidden] - df.to_numpy()[hidden]
+        ).mean()
+        for strategy in ["mean", "interpolate", "climatology", "seasonal_profile"]
+    }
+
+    assert not impute_missing_values(masked, "seasonal_profile").isna().any().any()
+    assert errors["seasonal_profile"] < errors["climatology"] < errors["mean"]
+    assert errors["interpolate"] < errors["mean"]
+
+
+def test_impute_missing_values_invalid_strategy():
+    df = pd.DataFrame({"a": [1.0, np.nan]}, index=["2018-01-01", "2018-01-02"])
+
+    with pytest.raises(ValueError) as err:
+        impute_missing_values(df, "median")
+
+    assert "Invalid strategy argument." in str(err.value)
+
+
+#########################################
+
+
 # tests for get_proper_time_period function
 def test_get_proper_time_period():
     start_date = "2020-01-02"
@@ -295,3 +393,27 @@ def test_preprocessing_with_invalid_dates(monkeypatch):
     )
     with pytest.raises(ValueError):
         preprocess_dataset(df1, df2, start_date="2020-01-01", end_date="2018-01-01")
+
+
+def test_preprocess_dataset_imputation():
+    df = pd.DataFrame(
+        {
+            "street_a": [10.0, np.nan, 30.0, 40.0],
+            "street_b": [1.0, 2.0, np.nan, 4.0],
+            "other": [5.0, 6.0, 7.0, np.nan],
+        },
+        index=["2018-01-01", "2018-01-02", "2018-01-04", "2018-01-05"],
+    )
+
+    result = preprocess_dataset(
+        df,
+        start_date="2018-01-01",
+        end_date="2018-01-05",
+        street_names=["street_a", "street_b"],
+        imputation="interpolate",
+    )
+
+    # 2018-01-03 is missing, so values are interpolated over the days between
+    assert np.isclose(result.loc["2018-01-02", "street_a"], 10.0 + 20.0 / 3)
+    assert np.isclose(result.loc["2018-01-04", "street_b"], 2.0 + 2.0 * 2 / 3)
+    assert result.loc["2018-01-05", "other"] == 7.0
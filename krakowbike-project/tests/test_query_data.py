@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+import src.krakowbike.query_data
+from src.krakowbike.query_data import TrafficRangeQuery
+
+MOCK_STREET_NAMES = ["street_a", "street_b", "street_c"]
+
+
+@pytest.fixture
+def sample_dataframe(monkeypatch):
+    monkeypatch.setattr(src.krakowbike.query_data, "STREET_NAMES", MOCK_STREET_NAMES)
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2018-01-01", periods=50, freq="D", name="Data")
+    df = pd.DataFrame(
+        rng.integers(0, 1000, size=(50, 3)).astype("float64"),
+        columns=MOCK_STREET_NAMES,
+        index=index,
+    )
+    df["Suma dobowa opadów [mm]"] = rng.random(50)
+    df["total_daily_traffic"] = df[MOCK_STREET_NAMES].sum(axis=1)
+    return df
+
+
+def test_columns(sample_dataframe):
+    query = TrafficRangeQuery(sample_dataframe)
+
+    assert query.columns == MOCK_STREET_NAMES + ["total_daily_traffic"]
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        ("2018-01-01", "2018-02-19"),
+        ("2018-01-05", "2018-01-05"),
+        ("2018-01-10", "2018-01-27"),
+        ("2017-12-01", "2018-01-03"),
+    ],
+)
+def test_single_range_statistics(sample_dataframe, start, end):
+    query = TrafficRangeQuery(sample_dataframe)
+    expected = sample_dataframe.loc[start:end, query.columns]
+
+    assert np.allclose(query.sum(start, end), expected.sum())
+    assert np.allclose(query.mean(start, end), expected.mean())
+    assert np.allclose(query.std(start, end), expected.std(), equal_nan=True)
+    assert np.array_equal(query.min(start, end), expected.min())
+    assert np.array_equal(query.max(start, end), expected.max())
+
+
+def test_batch_of_ranges(sample_dataframe):
+    query = TrafficRangeQuery(sample_dataframe)
+    starts = np.array(["2018-01-01", "2018-01-07", "2018-02-01"], dtype="datetime64[D]")
+    ends = np.array(["2018-01-31", "2018-01-08", "2018-02-19"], dtype="datetime64[D]")
+    result = query.mean(starts, ends)
+
+    assert result.shape == (3, 4)
+    for row, (start, end) in zip(result, zip(starts, ends)):
+        expected = sample_dataframe.loc[start:end, query.columns].mean()
+        assert np.allclose(row, expected)
+
+
+def test_summary(sample_dataframe):
+    query = TrafficRangeQuery(sample_dataframe)
+    result = query.summary("2018-01-03", "2018-01-20")
+
+    assert list(result.index) == query.columns
+    assert list(result.columns) == ["mean", "std", "min", "max"]
+
+
+def test_invalid_range(sample_dataframe):
+    query = TrafficRangeQuery(sample_dataframe)
+    with pytest.raises(ValueError):
+        query.sum("2018-01-10", "2018-01-01")
+
+
+def test_empty_range(sample_dataframe):
+    query = TrafficRangeQuery(sample_dataframe)
+    with pytest.raises(ValueError):
+        query.max("2019-01-01", "2019-01-10")
+
+
+def test_std_of_constant_window(sample_dataframe):
+    sample_dataframe.loc["2018-01-10":"2018-01-30", MOCK_STREET_NAMES] = [
+        1234.1,
+        0.3,
+        987654.7,
+    ]
+    sample_dataframe["total_daily_traffic"] = sample_dataframe[MOCK_STREET_NAMES].sum(axis=1)
+    query = TrafficRangeQuery(sample_dataframe)
+    starts = np.array(["2018-01-10", "2018-01-12"], dtype="datetime64[D]")
+    ends = np.array(["2018-01-30", "2018-01-25"], dtype="datetime64[D]")
+
+    assert np.array_equal(query.std(starts, ends), np.zeros((2, 4)))
@@ -0,0 +1,116 @@
+import json
+import sys
+
+import pytest
+from src.krakowbike.report_build import ReportBuild, Section
+
+
+@pytest.fixture
+def graph(tmp_path):
+    calls = []
+    (tmp_path / "input.txt").write_text("1 2 3")
+
+    def read(path):
+        calls.append("numbers")
+        return [int(x) for x in open(path).read().split()]
+
+    def parity(numbers, modulo):
+        calls.append("parity")
+        return [x % modulo for x in numbers]
+
+    def total(values):
+        calls.append("total")
+        return sum(values)
+
+    def write(value, path):
+        calls.append("output")
+        open(path, "w").write(str(value))
+
+    module = sys.modules[__name__]
+    sections = {
+        "numbers": Section(
+            read, params={"path": str(tmp_path / "input.txt")}, files=[str(tmp_path / "input.txt")]
+        ),
+        "parity": Section(parity, ["numbers"], {"modulo": 2}, code=[module]),
+        "total": Section(total, ["parity"]),
+        "output": Section(
+            write,
+            ["total"],
+            {"path": str(tmp_path / "output.txt")},
+            outputs=[str(tmp_path / "output.txt")],
+        ),
+    }
+    return sections, calls
+
+
+def test_build_computes_everything_once(graph, tmp_path):
+    sections, calls = graph
+
+    ReportBuild(sections, tmp_path / "cache").build(["output"])
+    build = ReportBuild(sections, tmp_path / "cache")
+    build.build(["output"])
+
+    assert calls == ["numbers", "parity", "total", "output"]
+    assert (tmp_path / "output.txt").read_text() == "2"
+    assert build.rebuilt == []
+    assert build.explanations == [f"{name}: up to date" for name in sections]
+
+
+def test_build_rebuilds_only_stale_sections(graph, tmp_path):
+    sections, calls = graph
+    ReportBuild(sections, tmp_path / "cache").build(["output"])
+    calls.clear()
+
+    sections["parity"].params["modulo"] = 3
+    build = ReportBuild(sections, tmp_path / "cache")
+    build.build(["output"])
+
+    assert calls == ["parity", "total", "output"]
+    assert build.rebuilt == ["parity", "total", "output"]
+    assert "parity: rebuilt (changed parameter modulo)" in build.explanations
+    assert (tmp_path / "output.txt").read_text() == "3"
+
+
+def test_unchanged_value_does_not_invalidate_dependents(graph, tmp_path):
+    sections, calls = graph
+    ReportBuild(sections, tmp_path / "cache").build(["output"])
+    calls.clear()
+
+    # parity of the new numbers is the same, so total and output stay valid
+    (tmp_path / "input.txt").write_text("5 4 7")
+    build = ReportBuild(sections, tmp_path / "cache")
+    build.build(["output"])
+
+    assert calls == ["numbers", "parity"]
+    assert build.explanations[0] == f"numbers: rebuilt (changed file {tmp_path / 'input.txt'})"
+
+
+def test_missing_output_is_rebuilt(graph, tmp_path):
+    sections, calls = graph
+    ReportBuild(sections, tmp_path / "cache").build(["output"])
+    calls.clear()
+
+    (tmp_path / "output.txt").unlink()
+    build = ReportBuild(sections, tmp_path / "cache")
+    build.build(["output"])
+
+    assert calls == ["output"]
+    assert build.explanations[-1].startswith("output: rebuilt (output missing")
+    assert (tmp_path / "output.txt").read_text() == "2"
+
+
+def test_prune_deletes_unreferenced_artefacts(graph, tmp_path):
+    sections, calls = graph
+    ReportBuild(sections, tmp_path / "cache").build(["output"])
+
+    sections["parity"].params["modulo"] = 3
+    del sections["output"]
+    build = ReportBuild(sections, tmp_path / "cache")
+    build.build(["total"])
+    removed = build.prune()
+
+    manifest = json.loads((tmp_path / "cache" / "manifest.json").read_text())
+    artefacts = sorted(path.stem for path in (tmp_path / "cache").glob("*.pkl"))
+    assert len(removed) == 3
+    assert sorted(manifest["inputs"]) == ["numbers", "parity", "total"]
+    assert artefacts == sorted(manifest["digests"]) == sorted(build._fingerprints.values())
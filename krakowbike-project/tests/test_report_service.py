@@ -0,0 +1,151 @@
+import asyncio
+import os
+import time
+
+import pytest
+from src.krakowbike.__main__ import get_report_template
+from src.krakowbike.report_service import ReportService
+
+
+class CountingReportService(ReportService):
+    def __init__(self, *args, **kwargs):
+        super().__init__(None, None, *args, **kwargs)
+        self.calls = []
+
+    def render_report(self, start_date: str, end_date: str) -> str:
+        if start_date > end_date:
+            raise ValueError("Invalid start_date/end_date argument.")
+        self.calls.append((start_date, end_date))
+        time.sleep(0.05)
+        return f"report {start_date} {end_date}"
+
+
+def test_concurrent_requests_are_coalesced():
+    service = CountingReportService()
+
+    async def run():
+        return await asyncio.gather(
+            *[service.get_report("2018-01-01", "2018-12-31") for _ in range(5)]
+        )
+
+    reports = asyncio.run(run())
+
+    assert reports == ["report 2018-01-01 2018-12-31"] * 5
+    assert service.calls == [("2018-01-01", "2018-12-31")]
+
+
+def test_reports_are_cached():
+    service = CountingReportService()
+
+    async def run():
+        await service.get_report("2018-01-01", "2018-12-31")
+        await service.get_report("2018-01-01", "2018-12-31")
+        await service.get_report("2019-01-01", "2019-12-31")
+
+    asyncio.run(run())
+
+    assert service.calls == [("2018-01-01", "2018-12-31"), ("2019-01-01", "2019-12-31")]
+
+
+def test_expired_reports_are_rendered_again():
+    service = CountingReportService(ttl=0.0)
+
+    async def run():
+        await service.get_report("2018-01-01", "2018-12-31")
+        await service.get_report("2018-01-01", "2018-12-31")
+
+    asyncio.run(run())
+
+    assert len(service.calls) == 2
+
+
+def test_least_recently_used_report_is_evicted():
+    service = CountingReportService(max_reports=2)
+
+    async def run():
+        await service.get_report("2017-01-01", "2017-12-31")
+        await service.get_report("2018-01-01", "2018-12-31")
+        await service.get_report("2017-01-01", "2017-12-31")
+        await service.get_report("2019-01-01", "2019-12-31")
+        await service.get_report("2017-01-01", "2017-12-31")
+        await service.get_report("2018-01-01", "2018-12-31")
+
+    asyncio.run(run())
+
+    assert service.calls == [
+        ("2017-01-01", "2017-12-31"),
+        ("2018-01-01", "2018-12-31"),
+        ("2019-01-01", "2019-12-31"),
+        ("2018-01-01", "2018-12-31"),
+    ]
+
+
+def test_errors_are_not_cached():
+    service = CountingReportService()
+
+    async def run():
+        with pytest.raises(ValueError):
+            await service.get_report("2019-01-01", "2018-01-01")
+
+    asyncio.run(run())
+
+    assert service._cache == {}
+    assert service._pending == {}
+
+
+class FailingReportService(ReportService):
+    def __init__(self, error):
+        super().__init__(None, None)
+        self.error = error
+
+    def render_report(self, start_date: str, end_date: str) -> str:
+        raise self.error
+
+
+def request(service, path):
+    async def run():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.0\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response.decode("utf-8")
+
+    return asyncio.run(run())
+
+
+def test_invalid_dates_are_bad_requests():
+    service = CountingReportService()
+
+    response = request(service, "/report?start_date=2018-02-30&end_date=2018-12-31")
+
+    assert response.startswith("HTTP/1.0 400 Bad Request")
+    assert "Invalid start_date argument." in response
+    assert request(service, "/report?end_date=2018-1-5").startswith("HTTP/1.0 400")
+    assert request(service, "/report?start_date=2016-12-31").startswith("HTTP/1.0 400")
+    assert request(
+        service, "/report?start_date=2019-01-01&end_date=2018-01-01"
+    ).startswith("HTTP/1.0 400")
+    assert service.calls == []
+
+
+@pytest.mark.parametrize("error", [TypeError("unexpected"), ValueError("internal detail")])
+def test_unexpected_errors_are_server_errors(error):
+    response = request(FailingReportService(error), "/report?start_date=2018-01-01")
+
+    assert response.startswith("HTTP/1.0 500 Internal Server Error")
+    assert "internal detail" not in response
+
+
+def test_edited_template_is_reloaded(tmp_path):
+    path = tmp_path / "report.html"
+    path.write_text("old {{ x }}")
+    service = ReportService(None, get_report_template(str(tmp_path)))
+
+    path.write_text("new {{ x }}")
+    os.utime(path, (time.time() + 10, time.time() + 10))
+
+    assert service.current_template().render(x=1) == "new 1"
@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+import pytest
+import src.krakowbike.store_data
+from src.krakowbike.preprocess_data import preprocess_dataset
+from src.krakowbike.store_data import (
+    RebuildRequiredError,
+    append_daily_readings,
+    build_incremental_dataset,
+    load_preprocessed_dataset,
+    read_metadata,
+    save_preprocessed_dataset,
+)
+
+
+@pytest.fixture
+def sample_dataframe():
+    index = pd.to_datetime(["2018-01-01", "2018-01-02", "2018-01-03", "2018-01-04"])
+    index.name = "Data"
+    return pd.DataFrame(
+        {
+            "street_a": [10.0, 20.0, 30.0, 40.0],
+            "Suma dobowa opadów [mm]": [0.0, 0.5, 1.0, 3.0],
+            "total_daily_traffic": [10.0, 20.0, 30.0, 40.0],
+        },
+        index=index,
+    )
+
+
+def test_save_and_load_preprocessed_dataset(tmp_path, sample_dataframe):
+    save_preprocessed_dataset(sample_dataframe, tmp_path)
+    result = load_preprocessed_dataset(tmp_path)
+
+    assert list(result.columns) == list(sample_dataframe.columns)
+    assert result.index.name == "Data"
+    assert np.array_equal(result.index.values, sample_dataframe.index.values)
+    assert np.array_equal(result.to_numpy(), sample_dataframe.to_numpy())
+
+
+def test_loaded_dataset_is_memory_mapped(tmp_path, sample_dataframe):
+    save_preprocessed_dataset(sample_dataframe, tmp_path)
+    result = load_preprocessed_dataset(tmp_path)
+    base = result["street_a"].to_numpy()
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+
+    assert isinstance(base, np.memmap)
+
+
+def test_metadata(tmp_path, sample_dataframe):
+    save_preprocessed_dataset(sample_dataframe, tmp_path)
+    metadata = read_metadata(tmp_path)
+
+    assert metadata["columns"] == list(sample_dataframe.columns)
+    assert metadata["n_rows"] == 4
+    assert metadata["start_date"] == "2018-01-01"
+    assert metadata["end_date"] == "2018-01-04"
+
+
+def test_load_preprocessed_dataset_period(tmp_path, sample_dataframe):
+    save_preprocessed_dataset(sample_dataframe, tmp_path)
+    result = load_preprocessed_dataset(
+        tmp_path, start_date="2018-01-02", end_date="2018-01-03"
+    )
+
+    assert list(result["street_a"]) == [20.0, 30.0]
+
+
+def test_load_preprocessed_dataset_invalid_period(tmp_path, sample_dataframe):
+    save_preprocessed_dataset(sample_dataframe, tmp_path)
+    with pytest.raises(ValueError):
+        load_preprocessed_dataset(
+            tmp_path, start_date="2018-01-03", end_date="2018-01-01"
+        )
+
+
+def test_save_non_numeric_dataset(tmp_path):
+    df = pd.DataFrame({"A": ["a", "b"]}, index=pd.to_datetime(["2018-01-01", "2018-01-02"]))
+    with pytest.raises(ValueError):
+        save_preprocessed_dataset(df, tmp_path)
+
+
+MOCK_STREET_NAMES = ["street_a", "street_b"]
+
+
+@pytest.fixture
+def raw_dataframes():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2018-01-01", periods=40, freq="D").strftime("%Y-%m-%d")
+    bikes = pd.DataFrame(
+        {
+            "street_a": rng.integers(0, 500, 40).astype("float64"),
+            "street_b": rng.integers(0, 500, 40).astype("float64"),
+        },
+        index=pd.Index(dates, name="Data"),
+    )
+    bikes.iloc[[3, 7, 30], 0] = np.nan
+    weather = pd.DataFrame(
+        {
+            "Suma dobowa opadów [mm]": rng.random(40).round(1).astype(str),
+            # mostly missing, dropped by `remove_empty_columns`
+            "PM10": ["-"] * 18 + list((rng.random(22) * 50).round(1).astype(str)),
+        },
+        index=pd.Index(dates, name="Data"),
+    )
+    weather.iloc[5, 0] = "-"
+    return bikes, weather
+
+
+def split_rows(dataframes, start, end):
+    return tuple(df.iloc[start:end] for df in dataframes)
+
+
+@pytest.fixture
+def mock_street_names(monkeypatch):
+    monkeypatch.setattr(src.krakowbike.store_data, "STREET_NAMES", MOCK_STREET_NAMES)
+
+
+def test_build_incremental_dataset(tmp_path, raw_dataframes, mock_street_names):
+    df = build_incremental_dataset(tmp_path, *split_rows(raw_dataframes, 0, 30))
+    metadata = read_metadata(tmp_path)
+
+    assert "PM10" not in df.columns
+    assert metadata["ingest"]["n_raw_rows"] == 30
+    assert metadata["ingest"]["statistics"]["PM10"]["count"] == 12
+    assert metadata["ingest"]["street_names"] == MOCK_STREET_NAMES
+    assert np.allclose(load_preprocessed_dataset(tmp_path).to_numpy(), df.to_numpy())
+
+
+def test_append_daily_readings_matches_full_preprocessing(
+    tmp_path, raw_dataframes, mock_street_names
+):
+    build_incremental_dataset(tmp_path, *split_rows(raw_dataframes, 0, 20))
+    append_daily_readings(tmp_path, *split_rows(raw_dataframes, 20, 28))
+    appended = append_daily_readings(tmp_path, *split_rows(raw_dataframes, 28, 34))
+
+    expected = preprocess_dataset(
+        *split_rows(raw_dataframes, 0, 34), street_names=MOCK_STREET_NAMES
+    )
+    result = load_preprocessed_dataset(tmp_path)
+
+    assert read_metadata(tmp_path)["end_date"] == "2018-02-03"
+    assert list(result.columns) == list(expected.columns)
+    assert np.array_equal(result.index.values, expected.index.values)
+    # the last appended rows are filled with means of all readings so far
+    assert np.allclose(appended.to_numpy(), expected.iloc[28:].to_numpy())
+    assert np.allclose(
+        result["total_daily_traffic"], result[MOCK_STREET_NAMES].sum(axis=1)
+    )
+
+
+def test_append_daily_readings_status_flip(tmp_path, raw_dataframes, mock_street_names):
+    build_incremental_dataset(tmp_path, *split_rows(raw_dataframes, 0, 30))
+
+    # PM10 readings of the last 10 days make the column kept
+    with pytest.raises(RebuildRequiredError) as error:
+        append_daily_readings(tmp_path, *split_rows(raw_dataframes, 30, 40))
+
+    assert error.value.columns == ["PM10"]
+    assert read_metadata(tmp_path)["n_rows"] == 30
+    assert len(load_preprocessed_dataset(tmp_path)) == 30
+
+
+def test_append_daily_readings_requires_later_dates(
+    tmp_path, raw_dataframes, mock_street_names
+):
+    build_incremental_dataset(tmp_path, *split_rows(raw_dataframes, 0, 20))
+
+    with pytest.raises(ValueError):
+        append_daily_readings(tmp_path, *split_rows(raw_dataframes, 19, 22))
+
+
+def test_append_daily_readings_rejects_ingested_dates(
+    tmp_path, raw_dataframes, mock_street_names
+):
+    # raw history runs to 2018-01-30, the saved period ends on 2018-01-20
+    build_incremental_dataset(
+        tmp_path, *split_rows(raw_dataframes, 0, 30), end_date="2018-01-20"
+    )
+
+    with pytest.raises(ValueError):
+        append_daily_readings(tmp_path, *split_rows(raw_dataframes, 25, 28))
+
+    metadata = read_metadata(tmp_path)
+    assert metadata["ingest"]["last_raw_date"] == "2018-01-30"
+    assert metadata["ingest"]["n_raw_rows"] == 30
+    append_daily_readings(tmp_path, *split_rows(raw_dataframes, 30, 32))
+    assert read_metadata(tmp_path)["ingest"]["last_raw_date"] == "2018-02-01"
+
+
+def test_append_to_non_incremental_dataset(tmp_path, sample_dataframe, raw_dataframes):
+    save_preprocessed_dataset(sample_dataframe, tmp_path)
+
+    with pytest.raises(ValueError):
+        append_daily_readings(tmp_path, *split_rows(raw_dataframes, 20, 22))
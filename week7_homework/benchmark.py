@@ -0,0 +1,302 @@
+"""
+Benchmark suite of cipher functions.
+
+Synthetic plaintexts of the given sizes are encoded and decoded with Caesar
+cipher and Morse code by the library functions (`caesar_cipher`,
+`morse_code`), by `encode_decode_file` and by the `main.py` CLI.
+Throughput in MB/s (of plaintext) and peak memory of every case are printed
+and compared with a stored baseline; the original per-line implementations
+are measured on small inputs for reference.
+
+Peak memory of library cases is measured with `tracemalloc` (Python and
+NumPy allocations), of CLI cases as the peak resident set size of the
+process (Unix only).
+
+Usage example:
+
+python3 benchmark.py --sizes 1KB 1MB 64MB
+python3 benchmark.py --sizes 1KB 1MB 1GB --save_baseline
+"""
+import argparse
+import json
+import os
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import encryption_decryption_functions
+import numpy as np
+from encryption_decryption_functions import (
+    CAESAR_LETTERS,
+    MORSE_CODE_DECODE,
+    MORSE_CODE_ENCODE,
+)
+
+HOMEWORK_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN_FILE = os.path.join(HOMEWORK_DIR, "main.py")
+BASELINE_FILE = os.path.join(HOMEWORK_DIR, "benchmark_baseline.json")
+SIZE_UNITS = {"KB": 2**10, "MB": 2**20, "GB": 2**30}
+DEFAULT_SIZES = ["1KB", "1MB", "16MB"]
+# in-memory library cases keep the whole text and its Morse code (about four
+# times larger) in memory, so they are skipped for larger inputs
+LIBRARY_MAX_SIZE = 1 << 28
+# the original implementations are slow, so they are measured on small inputs
+REFERENCE_MAX_SIZE = 1 << 24
+# relative throughput drop with respect to the baseline reported as regression
+REGRESSION_TOLERANCE = 0.2
+LINE_LENGTH = 80
+SHIFT = 3
+ALPHABET = np.frombuffer(
+    (string.ascii_letters + " " * 12 + ".,?-").encode("ascii"), dtype=np.uint8
+)
+
+
+def reference_caesar_cipher(s: str, n: int, decode: bool = True) -> str:
+    """
+    Original implementation of `caesar_cipher`, building the shift table
+    on every call and mapping characters one by one.
+    """
+    msg_chars = list(s.upper())
+    n_letters = len(CAESAR_LETTERS)
+    shift = n_letters - n if decode else n
+    indexes = [(i + shift) % n_letters for i in range(n_letters)]
+    shift_dict = {k: CAESAR_LETTERS[idx] for k, idx in zip(CAESAR_LETTERS, indexes)}
+    msg = [shift_dict.get(c, " ") for c in msg_chars]
+    return "".join(msg)
+
+
+def reference_morse_code(s: str, decode: bool = True) -> str:
+    """
+    Original implementation of `morse_code`, looking up tokens one by one.
+    """
+    if decode:
+        msg_chars = s.split(" ")
+        msg = "".join([MORSE_CODE_DECODE.get(c, "") for c in msg_chars])
+    else:
+        msg_chars = list(s.upper())
+        msg = " ".join([MORSE_CODE_ENCODE.get(c, "") for c in msg_chars])
+    return msg
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse size given in bytes or with a KB/MB/GB suffix, e.g. `64MB`.
+    """
+    unit = text[-2:].upper()
+    if unit in SIZE_UNITS:
+        return int(float(text[:-2]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    for unit, factor in reversed(SIZE_UNITS.items()):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+def generate_text(size: int, seed: int = 0) -> str:
+    """
+    Generate random plaintext of exactly `size` characters in lines
+    of `LINE_LENGTH` characters.
+    """
+    rng = np.random.default_rng(seed)
+    chars = ALPHABET[rng.integers(0, ALPHABET.size, size)]
+    chars[LINE_LENGTH :: LINE_LENGTH + 1] = ord("\n")
+    return chars.tobytes().decode("ascii")
+
+
+def write_text_file(path: str, size: int, seed: int = 0) -> None:
+    """
+    Write random plaintext of `size` bytes to a file in chunks of whole lines,
+    so that files larger than memory can be generated.
+    """
+    chunk_size = (LINE_LENGTH + 1) << 18
+    with open(path, "w") as f:
+        for i, start in enumerate(range(0, size, chunk_size)):
+            f.write(generate_text(min(chunk_size, size - start), seed + i))
+
+
+def measure(function, *args, track_memory: bool = True) -> tuple[float, int | None]:
+    """
+    Measure execution time and peak traced memory of a function call.
+    :return: Elapsed seconds and peak memory in bytes (None if not tracked)
+    """
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        function(*args)
+        seconds = time.perf_counter() - start
+        return seconds, tracemalloc.get_traced_memory()[1] if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+
+
+# runs main.py and prints its peak resident memory (in KB) to stderr; the
+# high-water mark of /proc/self/status is used because `ru_maxrss` includes
+# the memory of the forking parent process
+CLI_WRAPPER = """
+import resource, runpy, sys
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+finally:
+    try:
+        with open("/proc/self/status") as f:
+            peak = next(line.split()[1] for line in f if line.startswith("VmHWM"))
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(peak, file=sys.stderr)
+"""
+
+
+def measure_cli(*args: str) -> tuple[float, int]:
+    """
+    Measure execution time and peak resident memory of a `main.py` run.
+    :return: Elapsed seconds and peak resident set size in bytes
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-c", CLI_WRAPPER, MAIN_FILE, *args],
+        cwd=HOMEWORK_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    seconds = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"main.py {' '.join(args)} failed:\n{process.stderr}")
+    return seconds, int(process.stderr.split()[-1]) * 1024
+
+
+def benchmark_library(size: int) -> dict[str, tuple[float, int | None]]:
+    text = generate_text(size)
+    caesar_encoded = encryption_decryption_functions.caesar_cipher(text, SHIFT, decode=False)
+    morse_encoded = encryption_decryption_functions.morse_code(text, decode=False)
+    results = {
+        "caesar_cipher encode": measure(
+            encryption_decryption_functions.caesar_cipher, text, SHIFT, False
+        ),
+        "caesar_cipher decode": measure(
+            encryption_decryption_functions.caesar_cipher, caesar_encoded, SHIFT
+        ),
+        "morse_code encode": measure(encryption_decryption_functions.morse_code, text, False),
+        "morse_code decode": measure(encryption_decryption_functions.morse_code, morse_encoded),
+    }
+    if size <= REFERENCE_MAX_SIZE:
+        lines = text.splitlines()
+        encoded_lines = morse_encoded.splitlines()
+        results["reference caesar encode (per line)"] = measure(
+            lambda: [reference_caesar_cipher(line, SHIFT, False) for line in lines],
+            track_memory=False,
+        )
+        results["reference morse encode (per line)"] = measure(
+            lambda: [reference_morse_code(line, False) for line in lines],
+            track_memory=False,
+        )
+        results["reference morse decode (per line)"] = measure(
+            lambda: [reference_morse_code(line) for line in encoded_lines],
+            track_memory=False,
+        )
+    return results
+
+
+def benchmark_files(size: int, directory: str) -> dict[str, tuple[float, int | None]]:
+    plain = os.path.join(directory, "plain.txt")
+    write_text_file(plain, size)
+    output = os.path.join(directory, "output.txt")
+    results = {}
+    for cipher, name in (("c", "caesar"), ("m", "morse")):
+        encoded = os.path.join(directory, f"{name}.txt")
+        results[f"encode_decode_file {name} encode"] = measure(
+            encryption_decryption_functions.encode_decode_file, plain, encoded, cipher, False, SHIFT
+        )
+        results[f"encode_decode_file {name} decode"] = measure(
+            encryption_decryption_functions.encode_decode_file, encoded, output, cipher, True, SHIFT
+        )
+        common = ["--code_choice", cipher, "--shift", str(SHIFT), "--output_file", output]
+        results[f"main.py {name} encode"] = measure_cli(
+            "--choice", "e", "--input_file", plain, *common
+        )
+        results[f"main.py {name} decode"] = measure_cli(
+            "--choice", "d", "--input_file", encoded, *common
+        )
+    encoded = os.path.join(directory, "caesar.txt")
+    results["encode_decode_file caesar encode (bytes mode)"] = measure(
+        lambda: encryption_decryption_functions.encode_decode_file(
+            plain, encoded, "c", False, SHIFT, bytes_mode=True
+        )
+    )
+    results["main.py caesar decode (bytes mode)"] = measure_cli(
+        "--choice", "d", "--code_choice", "c", "--shift", str(SHIFT),
+        "--input_file", encoded, "--output_file", output, "--bytes_mode",
+    )
+    return results
+
+
+def run_suite(sizes: list[int]) -> dict[str, dict]:
+    """
+    Run all benchmark cases for the given plaintext sizes.
+    :return: Dictionary mapping `case@size` to its throughput (MB/s)
+             and peak memory (MB)
+    """
+    results = {}
+    for size in sizes:
+        cases = benchmark_library(size) if size <= LIBRARY_MAX_SIZE else {}
+        with tempfile.TemporaryDirectory() as directory:
+            cases.update(benchmark_files(size, directory))
+        for case, (seconds, peak) in cases.items():
+            results[f"{case}@{format_size(size)}"] = {
+                "mb_per_s": size / 2**20 / max(seconds, 1e-9),
+                "peak_mb": None if peak is None else peak / 2**20,
+            }
+    return results
+
+
+def report(results: dict[str, dict], baseline: dict[str, dict]) -> list[str]:
+    """
+    Print results next to the baseline.
+    :return: List of cases slower than the baseline by more than the tolerance
+    """
+    regressions = []
+    print(f"{'case':<52}{'throughput':>16}{'peak memory':>14}{'vs baseline':>14}")
+    for key, result in results.items():
+        peak = "" if result["peak_mb"] is None else f"{result['peak_mb']:.1f} MB"
+        line = f"{key:<52}{result['mb_per_s']:>11.1f} MB/s{peak:>14}"
+        if key in baseline:
+            ratio = result["mb_per_s"] / baseline[key]["mb_per_s"]
+            line += f"{ratio:>13.2f}x"
+            if ratio < 1 - REGRESSION_TOLERANCE:
+                line += "  REGRESSION"
+                regressions.append(key)
+        print(line)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("Benchmark suite of cipher functions")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES,
+        help="plaintext sizes, e.g. 1KB 1MB 1GB")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline results file")
+    parser.add_argument("--save_baseline", action="store_true",
+        help="store results as the new baseline")
+    parser.add_argument("--fail_on_regression", action="store_true",
+        help="exit with code 1 if any case is slower than the baseline")
+    args = parser.parse_args()
+
+    results = run_suite([parse_size(size) for size in args.sizes])
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = report(results, baseline)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2)
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
@@ -0,0 +1 @@
+# makes the homework scripts importable in tests (`python -m pytest tests`)
@@ -1,4 +1,10 @@
+import io
+import mmap
+import os
 import string
+from functools import lru_cache
+
+import numpy as np
 
 MORSE_CODE_ENCODE = {
     "A": ".-",
@@ -37,7 +43,7 @@ MORSE_CODE_ENCODE = {
     "8": "---..",
     "9": "----.",
     "0": "-----",
-    ", ": "--..--",
+    ",": "--..--",
     ".": ".-.-.-",
     "?": "..--..",
     "/": "-..-.",
@@ -47,6 +53,467 @@ MORSE_CODE_ENCODE = {
 }
 MORSE_CODE_DECODE = {v: k for k, v in MORSE_CODE_ENCODE.items()}
 CAESAR_LETTERS = list(string.ascii_uppercase)
+# relative frequencies (in %) of letters A-Z in English and in Polish texts;
+# Polish letters with diacritics are not shifted by the cipher and are omitted
+LETTER_FREQUENCIES = {
+    "en": [
+        8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966,
+        0.153, 0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987,
+        6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+    ],
+    "pl": [
+        8.91, 1.47, 3.96, 3.25, 7.66, 0.30, 1.42, 1.08, 8.21,
+        2.28, 3.51, 2.10, 2.80, 5.52, 7.75, 3.13, 0.14, 4.69,
+        4.32, 3.98, 2.50, 0.04, 4.65, 0.02, 3.76, 5.64,
+    ],
+}
+# number of bytes read from large files to detect the Caesar shift
+CRACK_SAMPLE_SIZE = 1 << 20
+# Morse tokens longer than this are never valid codes
+MORSE_MAX_TOKEN_LENGTH = 6
+# number of characters encoded/decoded with Morse code at once; bounds
+# the size of NumPy temporaries (several times the size of the block)
+MORSE_BLOCK_SIZE = 1 << 20
+# number of characters read from the input file at once
+BLOCK_SIZE = 1 << 22
+# ASCII whitespace stripped from the ends of lines by `str.strip`, except for
+# line separators
+LINE_WHITESPACE = b" \t\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+class _TranslationTable(dict):
+    """
+    Translation table for `str.translate` mapping every character
+    without an explicit entry to a space.
+    """
+
+    def __missing__(self, key: int) -> str:
+        return " "
+
+
+@lru_cache(maxsize=None)
+def caesar_translation_table(
+    n: int, decode: bool = True, keep_newlines: bool = False
+) -> _TranslationTable:
+    """
+    Build (once per shift and direction) `str.translate` table for Caesar cipher
+    :param n: Value of right shift for encoding message
+    :param decode: True if the table should decode messages,
+                   False if the table should encode messages
+    :param keep_newlines: True if new line characters should be kept,
+                          so that many lines can be translated at once
+    :return: Table mapping upper-case letters to shifted letters
+             and all other characters to spaces
+    """
+    n_letters = len(CAESAR_LETTERS)
+    shift = n_letters - n if decode else n
+    table = _TranslationTable({i: " " for i in range(256)})
+    if keep_newlines:
+        table[ord("\n")] = "\n"
+    for i, letter in enumerate(CAESAR_LETTERS):
+        table[ord(letter)] = CAESAR_LETTERS[(i + shift) % n_letters]
+    return table
+
+
+@lru_cache(maxsize=None)
+def caesar_bytes_table(n: int, decode: bool = True, keep_newlines: bool = False) -> bytes:
+    """
+    Build (once per shift and direction) `bytes.translate` table for Caesar cipher
+    :param n: Value of right shift for encoding message
+    :param decode: True if the table should decode messages,
+                   False if the table should encode messages
+    :param keep_newlines: True if new line bytes should be kept
+    :return: 256-byte table mapping lower- and upper-case ASCII letters
+             to shifted upper-case letters and all other bytes to spaces
+    """
+    str_table = caesar_translation_table(n, decode)
+    table = bytearray(b" " * 256)
+    if keep_newlines:
+        table[ord("\n")] = ord("\n")
+    for letter in CAESAR_LETTERS:
+        table[ord(letter)] = table[ord(letter.lower())] = ord(str_table[ord(letter)])
+    return bytes(table)
+
+
+def letter_histogram(s: str | bytes) -> np.ndarray:
+    """
+    Count occurrences of letters A-Z (case-insensitive) in the message
+    :param s: Message, str or ASCII-compatible bytes
+    :return: Array of 26 letter counts
+    """
+    if isinstance(s, str):
+        s = s.encode("utf-8")
+    counts = np.bincount(np.frombuffer(s, dtype=np.uint8), minlength=256)
+    return counts[ord("A") : ord("Z") + 1] + counts[ord("a") : ord("z") + 1]
+
+
+@lru_cache(maxsize=None)
+def caesar_score_matrix(languages: tuple[str, ...] = ("en",)) -> np.ndarray:
+    """
+    Build (once per set of languages) matrix of letter log-probabilities used
+    to score Caesar shifts; row `k + 26 * l` holds, for every ciphertext
+    letter, the log-probability in language `l` of the letter it decodes to
+    with shift `k`.
+    :param languages: Keys of `LETTER_FREQUENCIES`
+    :return: Array of shape (26 * len(languages), 26)
+    """
+    n_letters = len(CAESAR_LETTERS)
+    letters = np.arange(n_letters)
+    decoded = (letters[np.newaxis, :] - letters[:, np.newaxis]) % n_letters
+    matrices = []
+    for language in languages:
+        if language not in LETTER_FREQUENCIES:
+            raise ValueError(
+                f"Unknown language {language!r}, expected one of {list(LETTER_FREQUENCIES)}."
+            )
+        frequencies = np.asarray(LETTER_FREQUENCIES[language])
+        matrices.append(np.log(frequencies / frequencies.sum())[decoded])
+    return np.concatenate(matrices)
+
+
+def crack_caesar(s: str | bytes, languages: tuple[str, ...] = ("en",)) -> int:
+    """
+    Find the shift of a message encoded with Caesar cipher by frequency
+    analysis: the letter histogram is computed once and the log-likelihoods
+    of all 26 shifts (in all languages) are scored with a single matrix
+    product.
+    :param s: Encoded message, str or ASCII-compatible bytes
+    :param languages: Keys of `LETTER_FREQUENCIES` the message may be written in
+    :return: Shift value `n` for which `caesar_cipher(s, n)` decodes the message
+    """
+    scores = caesar_score_matrix(tuple(languages)) @ letter_histogram(s)
+    return int(np.argmax(scores)) % len(CAESAR_LETTERS)
+
+
+def read_sample(path: str, sample_size: int = CRACK_SAMPLE_SIZE, n_chunks: int = 16) -> bytes:
+    """
+    Read about `sample_size` bytes of a file as `n_chunks` chunks spread
+    evenly over the file; small files are read whole.
+    :param path: Path to the file
+    :param sample_size: Number of bytes to read
+    :param n_chunks: Number of chunks the sample consists of
+    :return: Sampled bytes
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if size <= sample_size:
+            return f.read()
+        chunk_size = sample_size // n_chunks
+        chunks = []
+        for offset in np.linspace(0, size - chunk_size, n_chunks).astype(np.int64):
+            f.seek(int(offset))
+            chunks.append(f.read(chunk_size))
+    return b"".join(chunks)
+
+
+def detect_caesar_shift(
+    input_file_path: str,
+    languages: tuple[str, ...] = ("en",),
+    sample_size: int = CRACK_SAMPLE_SIZE,
+) -> int:
+    """
+    Find the shift of a file encoded with Caesar cipher, reading only
+    a sample of large files.
+    :param input_file_path: Path to the encoded file
+    :param languages: Keys of `LETTER_FREQUENCIES` the message may be written in
+    :param sample_size: Number of bytes read from large files
+    :return: Shift value for decoding the file
+    """
+    return crack_caesar(read_sample(input_file_path, sample_size), languages)
+
+
+def _morse_key(code: str) -> int:
+    """
+    Unique integer key of a Morse token: a leading 1 bit marking the token
+    length followed by one bit per symbol (dash = 1, dot = 0).
+    """
+    key = 1 << len(code)
+    for i, symbol in enumerate(code):
+        if symbol == "-":
+            key |= 1 << i
+    return key
+
+
+# `str.translate` table encoding every character followed by a space;
+# unknown characters become empty codes, as in the original encoder
+MORSE_ENCODE_TABLE = _TranslationTable(
+    {ord(k): v + " " for k, v in MORSE_CODE_ENCODE.items()}
+)
+MORSE_ENCODE_TABLE[ord("\n")] = "\n"
+# the same table for ASCII bytes, with codes padded with zero bytes
+MORSE_ENCODE_LUT = np.zeros((128, MORSE_MAX_TOKEN_LENGTH + 1), dtype=np.uint8)
+for _i in range(128):
+    _code = MORSE_ENCODE_TABLE[ord(chr(_i).upper())].encode("ascii")
+    MORSE_ENCODE_LUT[_i, : len(_code)] = np.frombuffer(_code, dtype=np.uint8)
+# lookup table from Morse token key to decoded ASCII byte, 0 for unknown tokens
+MORSE_DECODE_LUT = np.zeros(1 << (MORSE_MAX_TOKEN_LENGTH + 1), dtype=np.uint8)
+for _code, _char in MORSE_CODE_DECODE.items():
+    MORSE_DECODE_LUT[_morse_key(_code)] = ord(_char)
+
+
+def _split_line_blocks(s, block_size: int | None = None):
+    """
+    Split str or bytes into consecutive parts of about `block_size`
+    (by default `MORSE_BLOCK_SIZE`) characters, each (except the last one)
+    ending with a new line character.
+    """
+    block_size = block_size or MORSE_BLOCK_SIZE
+    newline = "\n" if isinstance(s, str) else b"\n"
+    start = 0
+    while len(s) - start > block_size:
+        cut = s.rfind(newline, start, start + block_size) + 1
+        if cut <= start:
+            cut = s.find(newline, start + block_size) + 1
+            if cut <= 0:
+                break
+        yield s[start:cut]
+        start = cut
+    yield s[start:]
+
+
+def morse_encode_buffer(s: str) -> str:
+    """
+    Encode a buffer of lines with Morse code; equivalent to encoding every
+    line separately. ASCII text is encoded with lookup table gathers
+    in NumPy (in blocks of lines), other text with `str.translate`.
+    :param s: Lines of the message separated by new line characters
+    :return: Encoded lines separated by new line characters
+    """
+    return "".join(map(_morse_encode_block, _split_line_blocks(s)))
+
+
+def _morse_encode_block(s: str) -> str:
+    if s.isascii():
+        codes = MORSE_ENCODE_LUT[np.frombuffer(s.encode("ascii"), dtype=np.uint8)]
+        msg = codes[codes != 0].tobytes().replace(b" \n", b"\n").decode("ascii")
+    else:
+        msg = s.upper().translate(MORSE_ENCODE_TABLE).replace(" \n", "\n")
+    # the last line has a trailing separator unless it is terminated
+    return msg if s.endswith("\n") else msg[:-1]
+
+
+def morse_decode_buffer(s: bytes) -> bytes:
+    """
+    Decode a buffer of lines encoded with Morse code using vectorised
+    tokenisation: token boundaries are found with NumPy masks, the (at most
+    six) symbols of all tokens are packed into integer keys column by column
+    and decoded with a single lookup table gather.
+    Tokens are separated by a space and words by two or more spaces,
+    unknown tokens are dropped. Large buffers are decoded in blocks of lines.
+    :param s: ASCII lines of the message separated by new line characters
+    :return: Decoded lines separated by new line characters
+    """
+    return b"".join(map(_morse_decode_block, _split_line_blocks(s)))
+
+
+def _morse_decode_block(s: bytes) -> bytes:
+    chars = np.frombuffer(s, dtype=np.uint8)
+    n = chars.size
+    if n == 0:
+        return b""
+    is_newline = chars == ord("\n")
+    is_token = (chars != ord(" ")) & ~is_newline
+    edges = np.diff(is_token.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    lengths = ends - starts
+
+    keys = np.zeros(starts.size, dtype=np.int64)
+    valid = lengths <= MORSE_MAX_TOKEN_LENGTH
+    for offset in range(MORSE_MAX_TOKEN_LENGTH):
+        inside = offset < lengths
+        symbols = chars[np.minimum(starts + offset, n - 1)]
+        is_dash = symbols == ord("-")
+        valid &= ~inside | is_dash | (symbols == ord("."))
+        keys |= (inside & is_dash).astype(np.int64) << offset
+    keys = np.where(valid, keys | (1 << np.minimum(lengths, MORSE_MAX_TOKEN_LENGTH)), 0)
+
+    msg = is_newline.view(np.uint8) * np.uint8(ord("\n"))
+    msg[starts] = MORSE_DECODE_LUT[keys]
+    # a word gap is a run of 2+ spaces between two tokens of the same line
+    newline_counts = np.cumsum(is_newline)
+    is_gap = (starts[1:] - ends[:-1] >= 2) & (
+        newline_counts[starts[1:]] == newline_counts[ends[:-1] - 1]
+    )
+    msg[ends[:-1][is_gap]] = ord(" ")
+    return msg[msg != 0].tobytes()
+
+
+class _FileRange(io.RawIOBase):
+    """
+    Read-only raw stream over bytes [start, end) of a file.
+    """
+
+    def __init__(self, path: str, start: int, end: int):
+        self._file = open(path, "rb", buffering=0)
+        self._file.seek(start)
+        self._remaining = max(end - start, 0)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size == 0:
+            return 0
+        size = self._file.readinto(memoryview(buffer)[:size])
+        self._remaining -= size
+        return size
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def open_text_range(path: str, start: int = 0, end: int | None = None):
+    """
+    Open text file for reading, optionally only its part between byte offsets
+    `start` and `end`; offsets should lie at line boundaries.
+    :param path: Path to the file
+    :param start: Offset of the first byte to read
+    :param end: Offset one past the last byte to read, None for end of file
+    :return: Text file object
+    """
+    if start == 0 and end is None:
+        return open(path, "r")
+    if end is None:
+        end = os.path.getsize(path)
+    return io.TextIOWrapper(io.BufferedReader(_FileRange(path, start, end)))
+
+
+def _strip_lines(s: str) -> str:
+    """
+    Strip whitespace from both ends of every line of a block ending with
+    a new line character.
+    """
+    return "\n".join(map(str.strip, s[:-1].split("\n"))) + "\n"
+
+
+def read_line_blocks(in_file, block_size: int = BLOCK_SIZE):
+    """
+    Read text file in blocks of about `block_size` characters cut at line
+    boundaries, so that no line (and no Morse token) is split between blocks.
+    Whitespace at the ends of every line is stripped and every yielded block
+    ends with a new line character. Memory usage is bounded by `block_size`
+    and the length of the longest line, not by the size of the file.
+    :param in_file: Text file object opened for reading
+    :param block_size: Number of characters read at once
+    :return: Generator of blocks of complete lines
+    """
+    tail = ""
+    while block := in_file.read(block_size):
+        block = tail + block
+        cut = block.rfind("\n") + 1
+        tail = block[cut:]
+        if cut:
+            yield _strip_lines(block[:cut])
+    if tail:
+        yield _strip_lines(tail + "\n")
+
+
+def encode_decode_block(s: str, cipher: str, decode: bool = True, n: int = 0) -> str:
+    """
+    Encode/decode block of complete lines using Morse code or Caesar cipher,
+    keeping the line structure.
+    :param s: Lines of the message, each ending with a new line character
+    :param cipher: First letter of cipher that should be used,
+                   i.e. `m` for Morse code and `c` for Caesar cipher
+    :param decode: True if the message should be decoded,
+                   False if the message should be encoded
+    :param n: shift parameter; for Ceaser encryption/decryption
+    :return: Encoded/decoded lines
+    """
+    if cipher == "m":
+        return morse_code(s, decode=decode)
+    if cipher == "c":
+        return s.upper().translate(caesar_translation_table(n, decode, keep_newlines=True))
+    raise ValueError("The `cipher` argument should be equal to `m` or `c`.")
+
+
+# lookup table of whitespace stripped from the ends of lines
+_IS_LINE_WHITESPACE = np.zeros(256, dtype=bool)
+_IS_LINE_WHITESPACE[list(LINE_WHITESPACE)] = True
+
+
+def _normalise_lines(s: bytes) -> bytes:
+    """
+    Translate `\r\n` and `\r` line separators to `\n` and strip whitespace
+    from both ends of every line, as the text path does.
+    """
+    s = s.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return b"\n".join([line.strip(LINE_WHITESPACE) for line in s.split(b"\n")])
+
+
+def _needs_normalisation(s: bytes) -> bool:
+    """
+    Check whether a block of lines contains `\r` or whitespace at the ends
+    of lines; the block has to start at a line boundary.
+    """
+    if b"\r" in s or s[:1] in LINE_WHITESPACE or s[-1:] in LINE_WHITESPACE:
+        return True
+    chars = np.frombuffer(s, dtype=np.uint8)
+    newlines = np.flatnonzero(chars == ord("\n"))
+    neighbours = np.concatenate(
+        (newlines[newlines > 0] - 1, newlines[newlines < len(s) - 1] + 1)
+    )
+    return bool(_IS_LINE_WHITESPACE[chars[neighbours]].any())
+
+
+def caesar_file_bytes(
+    input_file_path: str,
+    output_file_path: str,
+    decode: bool = True,
+    n: int = 0,
+    block_size: int = BLOCK_SIZE,
+    start: int = 0,
+    end: int | None = None,
+) -> bool:
+    """
+    Encode/decode ASCII file with Caesar cipher without decoding it to str.
+    The input is memory-mapped, translated block by block with
+    a precomputed 256-byte table and written into the memory-mapped output
+    file; only blocks with `\r` or whitespace at the ends of lines are
+    normalised with bytes operations first. The result is byte-for-byte
+    identical to the text path.
+    :param input_file_path: Path to the input file
+    :param output_file_path: Path to the output file
+    :param decode: True if the message should be decoded,
+                   False if the message should be encoded
+    :param n: shift parameter; for Ceaser encryption/decryption
+    :param block_size: Number of bytes processed at once
+    :param start: Byte offset in the input file at which processing starts
+    :param end: Byte offset in the input file at which processing stops
+    :return: True on success, False if the input is not ASCII
+             (the output file is then incomplete)
+    """
+    table = caesar_bytes_table(n, decode, keep_newlines=True)
+    with open(input_file_path, "rb") as in_file, open(output_file_path, "w+b") as out_file:
+        end = os.fstat(in_file.fileno()).st_size if end is None else end
+        if end <= start:
+            return True
+        # normalisation only shrinks the data; at most one new line is added
+        out_file.truncate(end - start + 1)
+        with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as in_map, mmap.mmap(
+            out_file.fileno(), 0
+        ) as out_map:
+            position, out_position = start, 0
+            while position < end:
+                cut = in_map.rfind(b"\n", position, min(position + block_size, end)) + 1
+                if cut <= position:
+                    cut = in_map.find(b"\n", position + block_size, end) + 1 or end
+                block = in_map[position:cut]
+                if not block.isascii():
+                    return False
+                if _needs_normalisation(block):
+                    block = _normalise_lines(block)
+                out_map[out_position : out_position + len(block)] = block.translate(table)
+                out_position += len(block)
+                position = cut
+            if in_map[end - 1] not in b"\r\n":
+                out_map[out_position] = ord("\n")
+                out_position += 1
+        out_file.truncate(out_position)
+    return True
 
 
 def encode_decode_file(
@@ -55,10 +522,16 @@ def encode_decode_file(
     cipher: str,
     decode: bool = True,
     n: int = 0,
+    block_size: int = BLOCK_SIZE,
+    start: int = 0,
+    end: int | None = None,
+    bytes_mode: bool = False,
 ) -> None:
     """
     Function for encoding/decoding message from the input file to the output file
     using Morse code or Caesar cipher.
+    The input is streamed in blocks of lines, so peak memory usage does not
+    depend on the size of the file.
     :param input_file_path: Path to the input file
     :param output_file_path: Path to the output file
     :param cipher: First letter of cipher that should be used,
@@ -66,21 +539,33 @@ def encode_decode_file(
     :param decode: True if the message should be decoded,
                    False if the message should be encoded
     :param n: shift parameter; for Ceaser encryption/decryption
+    :param block_size: Number of characters read from the input file at once
+    :param start: Byte offset in the input file at which processing starts,
+                  should lie at a line boundary
+    :param end: Byte offset in the input file at which processing stops
+                (None for end of file), should lie at a line boundary
+    :param bytes_mode: True if ASCII files should be processed as memory-mapped
+                       bytes with `caesar_file_bytes` (Caesar cipher only);
+                       other files are processed as text
     :return:
     The result of this function should be encoded/decoded message written in the output file
     """
-    with open(input_file_path, "r") as in_file, open(output_file_path, "w") as out_file:
-        lines = in_file.readlines()
-        if cipher == "m":
-            for line in lines:
-                line = line.strip()
-                out_file.write(morse_code(line, decode=decode) + "\n")
-        elif cipher == "c":
-            for line in lines:
-                line = line.strip()
-                out_file.write(caesar_cipher(line, n=n, decode=decode) + "\n")
-        else:
-            raise ValueError("The `cipher` argument should be equal to `m` or `c`.")
+    if cipher not in ("m", "c"):
+        raise ValueError("The `cipher` argument should be equal to `m` or `c`.")
+    if block_size <= 0:
+        raise ValueError("The `block_size` argument should be positive.")
+    if bytes_mode:
+        if cipher != "c":
+            raise ValueError("Bytes mode is supported only for Caesar cipher.")
+        if caesar_file_bytes(
+            input_file_path, output_file_path, decode, n, block_size, start, end
+        ):
+            return
+    with open_text_range(input_file_path, start, end) as in_file, open(
+        output_file_path, "w"
+    ) as out_file:
+        for block in read_line_blocks(in_file, block_size):
+            out_file.write(encode_decode_block(block, cipher, decode=decode, n=n))
 
 
 def caesar_cipher(s: str, n: int, decode: bool = True) -> str:
@@ -92,30 +577,33 @@ def caesar_cipher(s: str, n: int, decode: bool = True) -> str:
                    False if the message should be encoded
     :return: Encoded/decoded message
     """
-    msg_chars = list(s.upper())
-    n_letters = len(CAESAR_LETTERS)
-    shift = n_letters - n if decode else n
-    indexes = [(i + shift) % n_letters for i in range(n_letters)]
-    shift_dict = {k: CAESAR_LETTERS[idx] for k, idx in zip(CAESAR_LETTERS, indexes)}
-    msg = [shift_dict.get(c, " ") for c in msg_chars]
-    return "".join(msg)
+    return s.upper().translate(caesar_translation_table(n, decode))
+
+
+def caesar_cipher_bytes(s: bytes, n: int, decode: bool = True) -> bytes:
+    """
+    Caesar cipher decoder/encoder for ASCII bytes, equivalent to `caesar_cipher`
+    :param s: Message that should be decoded/encoded
+    :param n: Value of right shift for encoding message
+    :param decode: True if the message should be decoded,
+                   False if the message should be encoded
+    :return: Encoded/decoded message
+    """
+    return s.translate(caesar_bytes_table(n, decode))
 
 
 def morse_code(s: str, decode: bool = True) -> str:
     """
-    Morse code decoder/encoder
+    Morse code decoder/encoder; characters are separated by a space
+    and words by two or more spaces
     :param s: Message that should be decoded/encoded
     :param decode: True if the message should be decoded,
                    False if the message should be encoded
     :return: Encoded/decoded message
     """
     if decode:
-        msg_chars = s.split(" ")
-        msg = "".join([MORSE_CODE_DECODE.get(c, "") for c in msg_chars])
-    else:
-        msg_chars = list(s.upper())
-        msg = " ".join([MORSE_CODE_ENCODE.get(c, "") for c in msg_chars])
-    return msg
+        return morse_decode_buffer(s.encode()).decode("ascii")
+    return morse_encode_buffer(s)
 
 
 if __name__ == "__main__":
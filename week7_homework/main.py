@@ -1,13 +1,27 @@
 import argparse
 import encryption_decryption_functions
+import parallel_processing
 
 def main(args):
+    if args.crack:
+        args.shift = encryption_decryption_functions.detect_caesar_shift(args.input_file, languages=tuple(args.language))
+        args.code_choice, args.choice = 'c', 'd'
+        print(f"Detected shift: {args.shift}")
     if args.choice=='d':
         decode=True
     else:
         decode=False
 
-    encryption_decryption_functions.encode_decode_file(args.input_file, args.output_file, args.code_choice, decode=decode, n=args.shift)
+    if args.inputs or args.workers != 1:
+        if args.inputs:
+            jobs = parallel_processing.collect_jobs(args.inputs, args.output_dir)
+        else:
+            jobs = [(args.input_file, args.output_file)]
+        n_bytes, seconds = parallel_processing.process_files(jobs, args.code_choice, decode=decode, n=args.shift,
+            workers=args.workers, shard_size=args.shard_size, block_size=args.block_size, bytes_mode=args.bytes_mode)
+        print(parallel_processing.format_throughput(n_bytes, seconds))
+    else:
+        encryption_decryption_functions.encode_decode_file(args.input_file, args.output_file, args.code_choice, decode=decode, n=args.shift, block_size=args.block_size, bytes_mode=args.bytes_mode)
 
 if __name__=='__main__':
     parser = argparse.ArgumentParser("Parser for message encryption")
@@ -17,5 +31,23 @@ if __name__=='__main__':
         help="Shift value for Caesar cipher (required if using Caesar)")
     parser.add_argument("--input_file", nargs="?", default="test_caeser_decode.txt", help="input file for encryption/decryption", type=str)
     parser.add_argument("--output_file", nargs="?", default="test_caeser_encode.txt", help="output file for encryption/decryption", type=str)
+    parser.add_argument("--block_size", "--block-size", type=int, default=encryption_decryption_functions.BLOCK_SIZE,
+        help="number of characters read from the input file at once; bounds memory usage")
+    parser.add_argument("--inputs", nargs="+", help="input files or directories processed in parallel, results are written to --output_dir")
+    parser.add_argument("--output_dir", default="output", help="output directory for files given with --inputs", type=str)
+    parser.add_argument("--workers", type=int, default=1,
+        help="number of worker processes (0 for the number of CPUs); large files are split into line-aligned shards")
+    parser.add_argument("--shard_size", type=int, default=None,
+        help="approximate size of a shard in bytes (default: file size divided by the number of workers)")
+    parser.add_argument("--crack", action="store_true",
+        help="decode Caesar cipher with unknown shift, detected by letter frequency analysis")
+    parser.add_argument("--language", nargs="+", choices=sorted(encryption_decryption_functions.LETTER_FREQUENCIES), default=["en"],
+        help="languages the message may be written in, used with --crack")
+    parser.add_argument("--bytes_mode", action="store_true",
+        help="process ASCII files as memory-mapped bytes without decoding them (Caesar cipher only)")
     args = parser.parse_args()
+    if args.crack and args.inputs:
+        parser.error("--crack works with a single --input_file")
+    if args.bytes_mode and args.code_choice != 'c' and not args.crack:
+        parser.error("--bytes_mode works only with Caesar cipher")
     main(args)
\ No newline at end of file
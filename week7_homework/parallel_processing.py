@@ -0,0 +1,167 @@
+"""
+Parallel encoding/decoding of many files and of single large files.
+
+Every input file is split into line-aligned shards (byte ranges), each shard
+is processed by `encode_decode_file` in a pool of worker processes and
+the results are concatenated in order into the output file.
+"""
+import math
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from encryption_decryption_functions import BLOCK_SIZE, encode_decode_file
+
+# files are not split into shards smaller than this (in bytes)
+MIN_SHARD_SIZE = 1 << 20
+
+
+def split_file(path: str, shard_size: int) -> list[tuple[int, int]]:
+    """
+    Split file into byte ranges of about `shard_size` bytes, each ending
+    right after a new line character (or at the end of the file).
+    :param path: Path to the file
+    :param shard_size: Approximate size of a shard in bytes
+    :return: List of [start, end) byte ranges covering the whole file
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return [(0, 0)]
+    offsets = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while offsets[-1] + shard_size < size:
+            newline = mm.find(b"\n", offsets[-1] + shard_size - 1)
+            if newline < 0 or newline + 1 == size:
+                break
+            offsets.append(newline + 1)
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def collect_jobs(inputs: list[str], output_dir: str) -> list[tuple[str, str]]:
+    """
+    Pair input files with output files of the same name in `output_dir`.
+    :param inputs: Paths to input files or directories (all files directly
+                   inside a directory are processed, in name order)
+    :param output_dir: Directory to which output files are written
+    :return: List of (input path, output path) pairs
+    """
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            paths.extend(
+                entry.path
+                for entry in sorted(os.scandir(path), key=lambda entry: entry.name)
+                if entry.is_file()
+            )
+        else:
+            paths.append(path)
+    names = [os.path.basename(path) for path in paths]
+    if len(set(names)) != len(names):
+        raise ValueError("Input files should have distinct names.")
+    return [(path, os.path.join(output_dir, name)) for path, name in zip(paths, names)]
+
+
+def _concatenate(shard_paths: list[str], output_file_path: str) -> None:
+    """
+    Concatenate shard outputs into the output file and remove them.
+    """
+    with open(output_file_path, "wb") as out_file:
+        for path in shard_paths:
+            with open(path, "rb") as shard_file:
+                shutil.copyfileobj(shard_file, out_file, BLOCK_SIZE)
+            os.remove(path)
+
+
+def process_files(
+    jobs: list[tuple[str, str]],
+    cipher: str,
+    decode: bool = True,
+    n: int = 0,
+    workers: int | None = None,
+    shard_size: int | None = None,
+    block_size: int = BLOCK_SIZE,
+    bytes_mode: bool = False,
+) -> tuple[int, float]:
+    """
+    Encode/decode files in parallel, splitting large files into line-aligned
+    shards. Results are identical to calling `encode_decode_file` on every
+    input file.
+    :param jobs: List of (input path, output path) pairs
+    :param cipher: First letter of cipher that should be used,
+                   i.e. `m` for Morse code and `c` for Caesar cipher
+    :param decode: True if the messages should be decoded,
+                   False if the messages should be encoded
+    :param n: shift parameter; for Ceaser encryption/decryption
+    :param workers: Number of worker processes, None for the number of CPUs
+    :param shard_size: Approximate size of a shard in bytes, None to split
+                       every file into about `workers` shards
+    :param block_size: Number of characters read from the input at once
+    :param bytes_mode: True if ASCII files should be processed as bytes
+                       (Caesar cipher only), see `encode_decode_file`
+    :return: Number of processed input bytes and elapsed time in seconds
+    """
+    if cipher not in ("m", "c"):
+        raise ValueError("The `cipher` argument should be equal to `m` or `c`.")
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    n_bytes = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        files = []
+        for input_path, output_path in jobs:
+            size = os.path.getsize(input_path)
+            n_bytes += size
+            size_per_shard = shard_size or max(math.ceil(size / workers), MIN_SHARD_SIZE)
+            shards = split_file(input_path, size_per_shard)
+            output_dir = os.path.dirname(os.path.abspath(output_path))
+            os.makedirs(output_dir, exist_ok=True)
+            if len(shards) == 1:
+                shard_paths = [output_path]
+            else:
+                shard_paths = []
+                for _ in shards:
+                    fd, path = tempfile.mkstemp(prefix=".shard-", dir=output_dir)
+                    os.close(fd)
+                    shard_paths.append(path)
+            futures = [
+                executor.submit(
+                    encode_decode_file,
+                    input_path,
+                    shard_path,
+                    cipher,
+                    decode,
+                    n,
+                    block_size,
+                    start,
+                    end,
+                    bytes_mode,
+                )
+                for shard_path, (start, end) in zip(shard_paths, shards)
+            ]
+            files.append((output_path, shard_paths, futures))
+
+        try:
+            for output_path, shard_paths, futures in files:
+                for future in futures:
+                    future.result()
+                if shard_paths != [output_path]:
+                    _concatenate(shard_paths, output_path)
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for output_path, shard_paths, _ in files:
+                for path in shard_paths:
+                    if path != output_path and os.path.exists(path):
+                        os.remove(path)
+            raise
+    return n_bytes, time.perf_counter() - start_time
+
+
+def format_throughput(n_bytes: int, seconds: float) -> str:
+    """
+    Describe processing throughput in MB/s.
+    """
+    mb = n_bytes / 2**20
+    return f"Processed {mb:.1f} MB in {seconds:.2f} s ({mb / max(seconds, 1e-9):.1f} MB/s)"
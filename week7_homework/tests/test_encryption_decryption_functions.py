@@ -0,0 +1,247 @@
+import os
+import random
+import string
+
+import pytest
+from encryption_decryption_functions import (
+    MORSE_CODE_DECODE,
+    MORSE_CODE_ENCODE,
+    caesar_cipher,
+    caesar_cipher_bytes,
+    caesar_file_bytes,
+    crack_caesar,
+    detect_caesar_shift,
+    encode_decode_file,
+    letter_histogram,
+    morse_code,
+)
+
+HOMEWORK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGLISH_TEXT = (
+    "It was the best of times, it was the worst of times, it was the age of "
+    "wisdom, it was the age of foolishness, it was the epoch of belief, it was "
+    "the epoch of incredulity, it was the season of Light, it was the season "
+    "of Darkness, it was the spring of hope, it was the winter of despair."
+)
+POLISH_TEXT = (
+    "Litwo ojczyzno moja ty jestes jak zdrowie ile cie trzeba cenic ten tylko "
+    "sie dowie kto cie stracil dzis pieknosc twa w calej ozdobie widze "
+    "i opisuje bo tesknie po tobie"
+)
+
+
+def reference_caesar_cipher(s: str, n: int, decode: bool = True) -> str:
+    letters = string.ascii_uppercase
+    shift = -n if decode else n
+    return "".join(
+        letters[(letters.index(c) + shift) % 26] if c in letters else " "
+        for c in s.upper()
+    )
+
+
+def reference_morse_code(s: str, decode: bool = True) -> str:
+    if decode:
+        return "".join(MORSE_CODE_DECODE.get(c, "") for c in s.split(" "))
+    return " ".join(MORSE_CODE_ENCODE.get(c, "") for c in s.upper())
+
+
+def random_text(rng: random.Random, size: int, alphabet: str) -> str:
+    return "".join(rng.choices(alphabet, k=size))
+
+
+@pytest.mark.parametrize("n", range(27))
+def test_caesar_round_trip(n):
+    text = ENGLISH_TEXT.upper()
+    expected = "".join(c if c in string.ascii_uppercase else " " for c in text)
+
+    encoded = caesar_cipher(text, n, decode=False)
+
+    assert encoded == reference_caesar_cipher(text, n, decode=False)
+    assert caesar_cipher(encoded, n) == expected
+
+
+def test_caesar_cipher_bytes_matches_str():
+    text = ENGLISH_TEXT + "\t\n ~ 123 xyz"
+
+    for n in (0, 5, 25):
+        for decode in (True, False):
+            assert caesar_cipher_bytes(text.encode(), n, decode) == (
+                caesar_cipher(text, n, decode).encode()
+            )
+
+
+def test_morse_code_matches_reference():
+    rng = random.Random(0)
+    alphabet = "".join(MORSE_CODE_ENCODE) + "abcxyz #@"
+
+    for _ in range(200):
+        text = random_text(rng, rng.randint(0, 30), alphabet)
+        encoded = morse_code(text, decode=False)
+
+        assert encoded == reference_morse_code(text, decode=False)
+        # without word gaps decoding matches the original implementation
+        single_spaced = " ".join(encoded.split())
+        assert morse_code(single_spaced) == reference_morse_code(single_spaced)
+
+
+def test_morse_round_trip():
+    words = ENGLISH_TEXT.upper().replace(";", "").split()
+
+    encoded = morse_code(" ".join(words), decode=False)
+
+    assert morse_code(encoded) == " ".join(words)
+
+
+def test_morse_decode_drops_unknown_tokens():
+    assert morse_code(".- ....... -... x -.-.") == "ABC"
+    assert morse_code("  .-   -...  ") == "A B"
+
+
+def test_morse_keeps_lines():
+    text = "SOS\n\nHELP ME\n"
+
+    encoded = morse_code(text, decode=False)
+
+    assert encoded == "... --- ...\n\n.... . .-.. .--.  -- .\n"
+    assert morse_code(encoded) == text
+
+
+@pytest.mark.parametrize("cipher", ["c", "m"])
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 22])
+def test_encode_decode_file_round_trip(tmp_path, cipher, block_size):
+    lines = [
+        " ".join(word.strip(",.;") for word in ENGLISH_TEXT.upper().split()[i : i + 6])
+        for i in range(0, 60, 6)
+    ]
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("\n".join(lines) + "\n")
+
+    encode_decode_file(
+        input_path, tmp_path / "encoded.txt", cipher, decode=False, n=3, block_size=block_size
+    )
+    encode_decode_file(
+        tmp_path / "encoded.txt", tmp_path / "decoded.txt", cipher, n=3, block_size=block_size
+    )
+
+    assert (tmp_path / "decoded.txt").read_text() == input_path.read_text()
+
+
+@pytest.mark.parametrize(
+    "cipher, decode, transform",
+    [
+        ("c", True, lambda line: reference_caesar_cipher(line, 2)),
+        ("c", False, lambda line: reference_caesar_cipher(line, 2, decode=False)),
+        ("m", False, lambda line: reference_morse_code(line, decode=False)),
+    ],
+)
+def test_encode_decode_file_matches_line_by_line(tmp_path, cipher, decode, transform):
+    # the original implementation stripped and transformed every line separately
+    rng = random.Random(1)
+    pieces = ["a", "B", "z", " ", "  ", "\t", "\n", "\r\n", "-", ".", ",", " \n"]
+    input_path = tmp_path / "input.txt"
+
+    for _ in range(100):
+        input_path.write_bytes("".join(rng.choices(pieces, k=rng.randint(0, 40))).encode())
+        with open(input_path) as f:
+            expected = "".join(transform(line.strip()) + "\n" for line in f.readlines())
+
+        encode_decode_file(input_path, tmp_path / "output.txt", cipher, decode, 2, block_size=5)
+
+        assert (tmp_path / "output.txt").read_text() == expected
+
+
+def test_encode_decode_file_sample_files(tmp_path):
+    encode_decode_file(
+        os.path.join(HOMEWORK_DIR, "test_morse_decode.txt"), tmp_path / "decoded.txt", "m"
+    )
+
+    with open(os.path.join(HOMEWORK_DIR, "test_morse_encode.txt")) as f:
+        assert (tmp_path / "decoded.txt").read_text() == f.read()
+
+
+def test_encode_decode_file_invalid_cipher(tmp_path):
+    (tmp_path / "input.txt").write_text("abc\n")
+
+    with pytest.raises(ValueError):
+        encode_decode_file(tmp_path / "input.txt", tmp_path / "output.txt", "x")
+
+
+def test_encode_decode_file_byte_range(tmp_path):
+    data = b"abc\ndef\nghi\n"
+    (tmp_path / "input.txt").write_bytes(data)
+
+    encode_decode_file(
+        tmp_path / "input.txt", tmp_path / "output.txt", "c", decode=False, n=1, start=4, end=8
+    )
+
+    assert (tmp_path / "output.txt").read_text() == "EFG\n"
+
+
+def test_bytes_mode_matches_text_mode(tmp_path):
+    rng = random.Random(2)
+    pieces = ["a", "Z", " ", "\t", "\x0b", "\x1c", "\n", "\r\n", "\r", "\n\n", ",", "~"]
+    input_path = tmp_path / "input.txt"
+
+    for _ in range(200):
+        input_path.write_bytes("".join(rng.choices(pieces, k=rng.randint(0, 50))).encode())
+        n, block_size = rng.randint(0, 30), rng.randint(1, 16)
+        for decode in (True, False):
+            encode_decode_file(input_path, tmp_path / "text.txt", "c", decode, n)
+            encode_decode_file(
+                input_path,
+                tmp_path / "bytes.txt",
+                "c",
+                decode,
+                n,
+                block_size=block_size,
+                bytes_mode=True,
+            )
+
+            assert (tmp_path / "bytes.txt").read_bytes() == (tmp_path / "text.txt").read_bytes()
+
+
+def test_bytes_mode_non_ascii_falls_back_to_text(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("zażółć gęślą jaźń\n", encoding="utf-8")
+
+    assert not caesar_file_bytes(input_path, tmp_path / "output.txt", n=3)
+    encode_decode_file(input_path, tmp_path / "text.txt", "c", n=3)
+    encode_decode_file(input_path, tmp_path / "bytes.txt", "c", n=3, bytes_mode=True)
+
+    assert (tmp_path / "bytes.txt").read_bytes() == (tmp_path / "text.txt").read_bytes()
+
+
+def test_bytes_mode_requires_caesar(tmp_path):
+    (tmp_path / "input.txt").write_text("abc\n")
+
+    with pytest.raises(ValueError):
+        encode_decode_file(
+            tmp_path / "input.txt", tmp_path / "output.txt", "m", bytes_mode=True
+        )
+
+
+def test_letter_histogram():
+    histogram = letter_histogram("aAb z!")
+
+    assert histogram.shape == (26,)
+    assert histogram[0] == 2 and histogram[1] == 1 and histogram[25] == 1
+    assert histogram.sum() == 4
+
+
+@pytest.mark.parametrize("n", range(26))
+def test_crack_caesar(n):
+    assert crack_caesar(caesar_cipher(ENGLISH_TEXT, n, decode=False)) == n
+    assert crack_caesar(caesar_cipher(POLISH_TEXT, n, decode=False), ("pl",)) == n
+    assert crack_caesar(caesar_cipher(ENGLISH_TEXT, n, decode=False).encode(), ("en", "pl")) == n
+
+
+def test_crack_caesar_unknown_language():
+    with pytest.raises(ValueError):
+        crack_caesar("abc", ("xx",))
+
+
+def test_detect_caesar_shift_samples_large_files(tmp_path):
+    input_path = tmp_path / "encoded.txt"
+    input_path.write_text((caesar_cipher(ENGLISH_TEXT, 11, decode=False) + "\n") * 200)
+
+    assert detect_caesar_shift(input_path, sample_size=4096) == 11
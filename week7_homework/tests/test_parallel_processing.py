@@ -0,0 +1,72 @@
+import random
+
+import pytest
+from encryption_decryption_functions import encode_decode_file
+from parallel_processing import collect_jobs, format_throughput, process_files, split_file
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    rng = random.Random(0)
+    pieces = ["a", "B", "z", " ", "  ", "\t", "\n", "\r\n", "-", ".", ".-", "\n\n"]
+    directory = tmp_path / "input"
+    directory.mkdir()
+    for i in range(5):
+        text = "".join(rng.choices(pieces, k=rng.randint(0, 400)))
+        (directory / f"file_{i}.txt").write_bytes(text.encode())
+    return directory
+
+
+def test_split_file(input_dir):
+    for path in input_dir.iterdir():
+        data = path.read_bytes()
+
+        shards = split_file(path, 17)
+
+        assert shards[0][0] == 0 and shards[-1][1] == len(data)
+        assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+        assert all(data[end - 1 : end] == b"\n" for _, end in shards[:-1])
+
+
+def test_split_empty_file(tmp_path):
+    (tmp_path / "empty.txt").write_bytes(b"")
+
+    assert split_file(tmp_path / "empty.txt", 10) == [(0, 0)]
+
+
+def test_collect_jobs(input_dir, tmp_path):
+    jobs = collect_jobs([str(input_dir)], str(tmp_path / "output"))
+
+    assert [input_path for input_path, _ in jobs] == sorted(
+        str(path) for path in input_dir.iterdir()
+    )
+    assert all(output_path.startswith(str(tmp_path / "output")) for _, output_path in jobs)
+
+
+def test_collect_jobs_duplicate_names(input_dir, tmp_path):
+    with pytest.raises(ValueError):
+        collect_jobs([str(input_dir / "file_0.txt")] * 2, str(tmp_path / "output"))
+
+
+@pytest.mark.parametrize("cipher", ["c", "m"])
+@pytest.mark.parametrize("decode", [True, False])
+def test_process_files_matches_encode_decode_file(input_dir, tmp_path, cipher, decode):
+    jobs = collect_jobs([str(input_dir)], str(tmp_path / "output"))
+
+    n_bytes, seconds = process_files(
+        jobs, cipher, decode=decode, n=4, workers=2, shard_size=20, block_size=8
+    )
+
+    assert n_bytes == sum(path.stat().st_size for path in input_dir.iterdir())
+    assert seconds > 0
+    for input_path, output_path in jobs:
+        encode_decode_file(input_path, tmp_path / "expected.txt", cipher, decode, 4)
+        with open(output_path, "rb") as f:
+            assert f.read() == (tmp_path / "expected.txt").read_bytes()
+    assert sorted(p.name for p in (tmp_path / "output").iterdir()) == sorted(
+        p.name for p in input_dir.iterdir()
+    )
+
+
+def test_format_throughput():
+    assert format_throughput(2 * 2**20, 0.5) == "Processed 2.0 MB in 0.50 s (4.0 MB/s)"